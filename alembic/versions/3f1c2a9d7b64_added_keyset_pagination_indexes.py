@@ -0,0 +1,28 @@
+"""added keyset pagination indexes
+
+Revision ID: 3f1c2a9d7b64
+Revises: 72842c63f1d8
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7b64'
+down_revision: Union[str, None] = '72842c63f1d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_campaigns_created_at_id', 'campaigns', ['created_at', 'id'], unique=False)
+    op.create_index('ix_contributions_campaign_id_created_at', 'contributions', ['campaign_id', 'created_at', 'contribution_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contributions_campaign_id_created_at', table_name='contributions')
+    op.drop_index('ix_campaigns_created_at_id', table_name='campaigns')
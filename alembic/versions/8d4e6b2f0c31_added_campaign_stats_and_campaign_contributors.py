@@ -0,0 +1,81 @@
+"""added campaign stats and campaign contributors
+
+Revision ID: 8d4e6b2f0c31
+Revises: 3f1c2a9d7b64
+Create Date: 2026-10-17 10:02:15.447391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4e6b2f0c31'
+down_revision: Union[str, None] = '3f1c2a9d7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('campaign_stats',
+    sa.Column('campaign_id', sa.String(), nullable=False),
+    sa.Column('contributions_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('unique_contributors', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('quality_score_sum', sa.Float(), server_default='0', nullable=False),
+    sa.Column('quality_score_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('ai_verification_score_sum', sa.Float(), server_default='0', nullable=False),
+    sa.Column('ai_verification_score_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('reputation_score_sum', sa.Float(), server_default='0', nullable=False),
+    sa.Column('reputation_score_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rewards_claimed_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ),
+    sa.PrimaryKeyConstraint('campaign_id')
+    )
+    op.create_table('campaign_contributors',
+    sa.Column('campaign_id', sa.String(), nullable=False),
+    sa.Column('contributor', sa.String(), nullable=False),
+    sa.Column('first_contributed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ),
+    sa.PrimaryKeyConstraint('campaign_id', 'contributor')
+    )
+
+    # Backfill from the existing contributions
+    op.execute("""
+        INSERT INTO campaign_contributors (campaign_id, contributor, first_contributed_at)
+        SELECT campaign_id, contributor, MIN(created_at)
+        FROM contributions
+        WHERE contributor IS NOT NULL
+        GROUP BY campaign_id, contributor
+    """)
+    op.execute("""
+        INSERT INTO campaign_stats (
+            campaign_id, contributions_count, unique_contributors,
+            quality_score_sum, quality_score_count,
+            ai_verification_score_sum, ai_verification_score_count,
+            reputation_score_sum, reputation_score_count,
+            rewards_claimed_count, updated_at
+        )
+        SELECT
+            c.id,
+            COUNT(ct.contribution_id),
+            COUNT(DISTINCT ct.contributor),
+            COALESCE(SUM(ct.quality_score), 0),
+            COUNT(ct.quality_score),
+            COALESCE(SUM(ct.ai_verification_score), 0),
+            COUNT(ct.ai_verification_score),
+            COALESCE(SUM(ct.reputation_score), 0),
+            COUNT(ct.reputation_score),
+            COUNT(ct.contribution_id) FILTER (WHERE ct.reward_claimed),
+            NOW()
+        FROM campaigns c
+        LEFT JOIN contributions ct ON ct.campaign_id = c.id
+        GROUP BY c.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('campaign_contributors')
+    op.drop_table('campaign_stats')
@@ -0,0 +1,49 @@
+"""added campaign trending score
+
+Adds campaign_stats.trending_score, the exponentially time-decayed submission count behind the
+trending campaign feed, with indexes on it and on contributions_count for the popular feed, and
+computes the initial scores from activity_hourly.
+
+Revision ID: a6d3f8c21e57
+Revises: f4c9e1a7b352
+Create Date: 2026-10-17 17:20:37.641092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d3f8c21e57'
+down_revision: Union[str, None] = 'f4c9e1a7b352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('campaign_stats', sa.Column('trending_score', sa.Float(), server_default='0', nullable=False))
+    op.create_index('ix_campaign_stats_contributions_count', 'campaign_stats', ['contributions_count', 'campaign_id'], unique=False)
+    op.create_index('ix_campaign_stats_trending_score', 'campaign_stats', ['trending_score', 'campaign_id'], unique=False)
+
+    # Initial scores, as refresh_trending_scores computes them (24-hour half-life, 14-day window)
+    op.execute("""
+        UPDATE campaign_stats cs
+        SET trending_score = s.score
+        FROM (
+            SELECT
+                campaign_id,
+                SUM(count * exp(-ln(2) * EXTRACT(EPOCH FROM (NOW() AT TIME ZONE 'utc') - hour_bucket)::float8 / 86400)) AS score
+            FROM activity_hourly
+            WHERE hour_bucket >= date_trunc('hour', NOW() AT TIME ZONE 'utc') - INTERVAL '14 days'
+            GROUP BY campaign_id
+        ) s
+        WHERE cs.campaign_id = s.campaign_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_campaign_stats_trending_score', table_name='campaign_stats')
+    op.drop_index('ix_campaign_stats_contributions_count', table_name='campaign_stats')
+    op.drop_column('campaign_stats', 'trending_score')
@@ -0,0 +1,39 @@
+"""added campaign tags and bitmap offset
+
+Adds campaign_tags, one row per tag of a campaign, and campaigns.bitmap_offset, an identity
+column giving every campaign (existing ones included) a dense position in the Redis browse
+bitmaps. Run the rebuild_campaign_browse_index task after upgrading to build the bitmaps.
+
+Revision ID: b3e7d5a9c418
+Revises: a6d3f8c21e57
+Create Date: 2026-10-17 18:05:37.614290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e7d5a9c418'
+down_revision: Union[str, None] = 'a6d3f8c21e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('campaign_tags',
+    sa.Column('campaign_id', sa.String(), nullable=False),
+    sa.Column('tag', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ),
+    sa.PrimaryKeyConstraint('campaign_id', 'tag')
+    )
+    op.add_column('campaigns', sa.Column('bitmap_offset', sa.Integer(), sa.Identity(), nullable=False))
+    op.create_unique_constraint('uq_campaigns_bitmap_offset', 'campaigns', ['bitmap_offset'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_campaigns_bitmap_offset', 'campaigns', type_='unique')
+    op.drop_column('campaigns', 'bitmap_offset')
+    op.drop_table('campaign_tags')
@@ -0,0 +1,38 @@
+"""added quality tier to contributions
+
+Revision ID: b7a91e3c5d20
+Revises: 8d4e6b2f0c31
+Create Date: 2026-10-17 11:20:04.903126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7a91e3c5d20'
+down_revision: Union[str, None] = '8d4e6b2f0c31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('contributions', sa.Column(
+        'quality_tier',
+        sa.String(),
+        sa.Computed(
+            "CASE WHEN quality_score > 95 THEN 'High Quality' "
+            "WHEN quality_score >= 80 THEN 'Medium Quality' "
+            "ELSE 'Low Quality' END",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_contributions_campaign_id_quality_tier', 'contributions', ['campaign_id', 'quality_tier', 'created_at', 'contribution_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contributions_campaign_id_quality_tier', table_name='contributions')
+    op.drop_column('contributions', 'quality_tier')
@@ -0,0 +1,65 @@
+"""added activity hourly rollup
+
+Adds activity_hourly, the per-campaign count of contributions and sum of their activity levels
+per hour, and backfills it from the existing contributions. A contribution's level is taken from
+its activity row, or recomputed as in calculate_activity_level when it has none.
+
+Revision ID: b7e1c93d5a20
+Revises: 4a6d9e2b7c15
+Create Date: 2026-10-17 14:05:37.216840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e1c93d5a20'
+down_revision: Union[str, None] = '4a6d9e2b7c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('activity_hourly',
+    sa.Column('campaign_id', sa.String(), nullable=False),
+    sa.Column('hour_bucket', sa.DateTime(), nullable=False),
+    sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('sum_level', sa.Float(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ),
+    sa.PrimaryKeyConstraint('campaign_id', 'hour_bucket')
+    )
+
+    # Backfill from the existing contributions
+    op.execute("""
+        INSERT INTO activity_hourly (campaign_id, hour_bucket, count, sum_level)
+        SELECT
+            ct.campaign_id,
+            DATE_TRUNC('hour', ct.created_at),
+            COUNT(*),
+            SUM(COALESCE(
+                a.activity_level,
+                LEAST(
+                    30
+                    + CASE WHEN ct.is_verified THEN 30 ELSE 0 END
+                    + COALESCE(ct.ai_verification_score, 0) / 2.0
+                    + COALESCE(ct.quality_score, 0) / 10.0,
+                    100
+                )
+            ))
+        FROM contributions ct
+        LEFT JOIN (
+            SELECT contribution_id, MAX(activity_level) AS activity_level
+            FROM activity
+            WHERE contribution_id IS NOT NULL
+            GROUP BY contribution_id
+        ) a ON a.contribution_id = ct.contribution_id
+        WHERE ct.created_at IS NOT NULL
+        GROUP BY ct.campaign_id, DATE_TRUNC('hour', ct.created_at)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('activity_hourly')
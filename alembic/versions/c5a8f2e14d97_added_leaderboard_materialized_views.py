@@ -0,0 +1,74 @@
+"""added leaderboard materialized views
+
+Adds the contributor_leaderboard and creator_leaderboard materialized views, each with a unique
+index so they can be refreshed CONCURRENTLY and an index on position for paging, and the
+materialized_view_refreshes table recording when each was last refreshed.
+
+Revision ID: c5a8f2e14d97
+Revises: b7e1c93d5a20
+Create Date: 2026-10-17 14:48:12.530918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a8f2e14d97'
+down_revision: Union[str, None] = 'b7e1c93d5a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('materialized_view_refreshes',
+    sa.Column('view_name', sa.String(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('view_name')
+    )
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW contributor_leaderboard AS
+        SELECT
+            ROW_NUMBER() OVER (ORDER BY COUNT(ct.contribution_id) DESC, ct.contributor) AS position,
+            ct.contributor,
+            COUNT(ct.contribution_id) AS total_contributions,
+            AVG(ct.ai_verification_score) AS success_rate,
+            SUM(c.unit_price) AS total_amount_earned
+        FROM contributions ct
+        JOIN campaigns c ON c.id = ct.campaign_id
+        WHERE ct.contributor IS NOT NULL
+        GROUP BY ct.contributor
+    """)
+    op.execute("CREATE UNIQUE INDEX ux_contributor_leaderboard_contributor ON contributor_leaderboard (contributor)")
+    op.execute("CREATE INDEX ix_contributor_leaderboard_position ON contributor_leaderboard (position)")
+
+    op.execute("""
+        CREATE MATERIALIZED VIEW creator_leaderboard AS
+        SELECT
+            ROW_NUMBER() OVER (ORDER BY COUNT(c.id) DESC, c.creator_wallet_address) AS position,
+            c.creator_wallet_address AS creator,
+            COUNT(c.id) AS total_campaigns,
+            SUM(c.total_budget) AS total_amount_spent,
+            SUM(s.reputation_score_sum) / NULLIF(SUM(s.reputation_score_count), 0) AS reputation_score
+        FROM campaigns c
+        LEFT JOIN campaign_stats s ON s.campaign_id = c.id
+        WHERE c.creator_wallet_address IS NOT NULL
+        GROUP BY c.creator_wallet_address
+    """)
+    op.execute("CREATE UNIQUE INDEX ux_creator_leaderboard_creator ON creator_leaderboard (creator)")
+    op.execute("CREATE INDEX ix_creator_leaderboard_position ON creator_leaderboard (position)")
+
+    op.execute("""
+        INSERT INTO materialized_view_refreshes (view_name, refreshed_at)
+        VALUES ('contributor_leaderboard', NOW() AT TIME ZONE 'utc'),
+               ('creator_leaderboard', NOW() AT TIME ZONE 'utc')
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW creator_leaderboard")
+    op.execute("DROP MATERIALIZED VIEW contributor_leaderboard")
+    op.drop_table('materialized_view_refreshes')
@@ -0,0 +1,75 @@
+"""added campaign daily stats
+
+Adds campaign_daily_stats, per-campaign per-day (UTC) contribution aggregates, and
+campaign_daily_contributors, the distinct contributors of each campaign day, and backfills
+both from the existing contributions.
+
+Revision ID: d3f6a7b82e41
+Revises: c5a8f2e14d97
+Create Date: 2026-10-17 15:31:06.884127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f6a7b82e41'
+down_revision: Union[str, None] = 'c5a8f2e14d97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('campaign_daily_stats',
+    sa.Column('campaign_id', sa.String(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('submissions', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('quality_sum', sa.Float(), server_default='0', nullable=False),
+    sa.Column('quality_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('ai_sum', sa.Float(), server_default='0', nullable=False),
+    sa.Column('ai_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('unique_contributors', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ),
+    sa.PrimaryKeyConstraint('campaign_id', 'day')
+    )
+    op.create_table('campaign_daily_contributors',
+    sa.Column('campaign_id', sa.String(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('contributor', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['campaign_id'], ['campaigns.id'], ),
+    sa.PrimaryKeyConstraint('campaign_id', 'day', 'contributor')
+    )
+
+    # Backfill from the existing contributions
+    op.execute("""
+        INSERT INTO campaign_daily_contributors (campaign_id, day, contributor)
+        SELECT DISTINCT campaign_id, created_at::date, contributor
+        FROM contributions
+        WHERE contributor IS NOT NULL AND created_at IS NOT NULL
+    """)
+    op.execute("""
+        INSERT INTO campaign_daily_stats (
+            campaign_id, day, submissions,
+            quality_sum, quality_count, ai_sum, ai_count, unique_contributors
+        )
+        SELECT
+            campaign_id,
+            created_at::date,
+            COUNT(*),
+            COALESCE(SUM(quality_score), 0),
+            COUNT(quality_score),
+            COALESCE(SUM(ai_verification_score), 0),
+            COUNT(ai_verification_score),
+            COUNT(DISTINCT contributor)
+        FROM contributions
+        WHERE created_at IS NOT NULL
+        GROUP BY campaign_id, created_at::date
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('campaign_daily_contributors')
+    op.drop_table('campaign_daily_stats')
@@ -0,0 +1,83 @@
+"""index pack for hot predicates
+
+Adds the indexes the campaign, contribution and activity routes filter on, makes
+onchain_campaign_id unique and drops the redundant indexes that index=True created on
+primary keys (and the single-column contributor index now covered by a composite).
+
+The upgrade refuses to run while onchain_campaign_id has duplicates and lists them; they
+carry contributions, so they are resolved by hand rather than by the migration.
+
+Revision ID: e2c4f7a81b69
+Revises: b7a91e3c5d20
+Create Date: 2026-10-17 12:05:37.260819
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c4f7a81b69'
+down_revision: Union[str, None] = 'b7a91e3c5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Duplicate ids listed in the error message, at most
+MAX_REPORTED_DUPLICATES = 50
+
+
+def check_onchain_campaign_id_unique() -> None:
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT onchain_campaign_id, count(*) AS copies FROM campaigns "
+        "WHERE onchain_campaign_id IS NOT NULL "
+        "GROUP BY onchain_campaign_id HAVING count(*) > 1 "
+        "ORDER BY onchain_campaign_id"
+    )).all()
+    if duplicates:
+        listed = ", ".join(f"{row.onchain_campaign_id} ({row.copies} rows)" for row in duplicates[:MAX_REPORTED_DUPLICATES])
+        more = f" and {len(duplicates) - MAX_REPORTED_DUPLICATES} more" if len(duplicates) > MAX_REPORTED_DUPLICATES else ""
+        raise RuntimeError(
+            f"Cannot make campaigns.onchain_campaign_id unique; duplicated values ({len(duplicates)}): "
+            f"{listed}{more}. Merge or delete the duplicate campaigns, then rerun the upgrade."
+        )
+
+
+def upgrade() -> None:
+    # Fail before touching any index rather than partway through
+    check_onchain_campaign_id_unique()
+
+    # Redundant with the primary key indexes
+    op.drop_index('ix_campaigns_id', table_name='campaigns')
+    op.drop_index('ix_contributions_contribution_id', table_name='contributions')
+    op.drop_index('ix_activity_id', table_name='activity')
+
+    op.drop_index('ix_campaigns_onchain_campaign_id', table_name='campaigns')
+    op.create_index(op.f('ix_campaigns_onchain_campaign_id'), 'campaigns', ['onchain_campaign_id'], unique=True)
+    op.create_index('ix_campaigns_active_expiration', 'campaigns', ['expiration'], unique=False, postgresql_where=sa.text('is_active'))
+
+    # Covered by the (contributor, campaign_id) composite
+    op.drop_index('ix_contributions_contributor', table_name='contributions')
+    op.create_index('ix_contributions_campaign_id_contributor', 'contributions', ['campaign_id', 'contributor'], unique=False)
+    op.create_index('ix_contributions_contributor_campaign_id', 'contributions', ['contributor', 'campaign_id'], unique=False)
+
+    op.create_index(op.f('ix_activity_contribution_id'), 'activity', ['contribution_id'], unique=False)
+    op.create_index('ix_activity_campaign_id_timestamp', 'activity', ['campaign_id', 'timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_activity_campaign_id_timestamp', table_name='activity')
+    op.drop_index(op.f('ix_activity_contribution_id'), table_name='activity')
+
+    op.drop_index('ix_contributions_contributor_campaign_id', table_name='contributions')
+    op.drop_index('ix_contributions_campaign_id_contributor', table_name='contributions')
+    op.create_index(op.f('ix_contributions_contributor'), 'contributions', ['contributor'], unique=False)
+
+    op.drop_index('ix_campaigns_active_expiration', table_name='campaigns')
+    op.drop_index(op.f('ix_campaigns_onchain_campaign_id'), table_name='campaigns')
+    op.create_index(op.f('ix_campaigns_onchain_campaign_id'), 'campaigns', ['onchain_campaign_id'], unique=False)
+
+    op.create_index(op.f('ix_activity_id'), 'activity', ['id'], unique=False)
+    op.create_index(op.f('ix_contributions_contribution_id'), 'contributions', ['contribution_id'], unique=False)
+    op.create_index(op.f('ix_campaigns_id'), 'campaigns', ['id'], unique=False)
@@ -0,0 +1,84 @@
+"""added wallet stats
+
+Adds wallet_stats, per-wallet submission and campaign counters, and an index on
+campaign_contributors by contributor for the campaigns a wallet has contributed to,
+and backfills wallet_stats from the existing contributions and campaigns.
+
+Revision ID: e8b2d4c6f103
+Revises: d3f6a7b82e41
+Create Date: 2026-10-17 16:12:48.215903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b2d4c6f103'
+down_revision: Union[str, None] = 'd3f6a7b82e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('wallet_stats',
+    sa.Column('wallet_address', sa.String(), nullable=False),
+    sa.Column('submissions_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('reputation_score_sum', sa.Float(), server_default='0', nullable=False),
+    sa.Column('ai_verification_score_sum', sa.Float(), server_default='0', nullable=False),
+    sa.Column('ai_verification_score_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('campaigns_contributed_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('campaigns_created_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('wallet_address')
+    )
+    op.create_index(
+        'ix_campaign_contributors_contributor_campaign_id',
+        'campaign_contributors',
+        ['contributor', 'campaign_id'],
+        unique=False,
+    )
+
+    # Backfill from the existing contributions and campaigns
+    op.execute("""
+        INSERT INTO wallet_stats (
+            wallet_address, submissions_count, reputation_score_sum,
+            ai_verification_score_sum, ai_verification_score_count,
+            campaigns_contributed_count, campaigns_created_count, updated_at
+        )
+        SELECT
+            wallet_address,
+            SUM(submissions_count),
+            SUM(reputation_score_sum),
+            SUM(ai_verification_score_sum),
+            SUM(ai_verification_score_count),
+            SUM(campaigns_contributed_count),
+            SUM(campaigns_created_count),
+            NOW()
+        FROM (
+            SELECT
+                contributor AS wallet_address,
+                COUNT(*) AS submissions_count,
+                COALESCE(SUM(reputation_score), 0) AS reputation_score_sum,
+                COALESCE(SUM(ai_verification_score), 0) AS ai_verification_score_sum,
+                COUNT(ai_verification_score) AS ai_verification_score_count,
+                COUNT(DISTINCT campaign_id) AS campaigns_contributed_count,
+                0 AS campaigns_created_count
+            FROM contributions
+            WHERE contributor IS NOT NULL
+            GROUP BY contributor
+            UNION ALL
+            SELECT creator_wallet_address, 0, 0, 0, 0, 0, COUNT(*)
+            FROM campaigns
+            WHERE creator_wallet_address IS NOT NULL AND creator_wallet_address <> ''
+            GROUP BY creator_wallet_address
+        ) AS per_wallet
+        GROUP BY wallet_address
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_campaign_contributors_contributor_campaign_id', table_name='campaign_contributors')
+    op.drop_table('wallet_stats')
@@ -0,0 +1,42 @@
+"""added campaign search vector
+
+Adds campaigns.search_vector, a stored generated tsvector over title, description and
+data_requirements (weighted A, B and C), and a GIN index on it for full-text search.
+
+Revision ID: f4c9e1a7b352
+Revises: e8b2d4c6f103
+Create Date: 2026-10-17 16:47:21.530418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c9e1a7b352'
+down_revision: Union[str, None] = 'e8b2d4c6f103'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('campaigns', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(data_requirements, '')), 'C')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_campaigns_search_vector', 'campaigns', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_campaigns_search_vector', table_name='campaigns', postgresql_using='gin')
+    op.drop_column('campaigns', 'search_vector')
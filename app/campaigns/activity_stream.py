@@ -0,0 +1,234 @@
+"""
+Write-behind ingestion of Activity rows through a Redis Stream (opt-in via ACTIVITY_WRITE_BEHIND).
+
+Activity rows are derived telemetry, so with write-behind enabled the submit path commits the
+contribution (and the campaign's activity counters) and then only XADDs one stream entry per
+activity row. The drain_activity_stream Celery task reads the stream through a consumer group,
+bulk-inserts each batch and only then XACKs (and XDELs) the entries, so:
+  - an entry is acknowledged only after its batch is committed;
+  - a batch that fails to insert, or whose worker dies mid-batch, stays in the group's pending
+    list and is re-claimed with XAUTOCLAIM once idle for CLAIM_IDLE_MS, until it is written;
+  - the XADDs of one submission run in a MULTI/EXEC transaction, so they are appended all or none;
+  - if the XADD fails, the submit path inserts the rows directly instead, and if that fails too
+    the rows are retried (XADD, then direct insert) in the background with exponential backoff
+    until one succeeds. Only rows still waiting on that retry are lost if the process dies.
+Entries that cannot be parsed are moved to DEAD_LETTER_STREAM_KEY rather than retried forever.
+Consumer lag is reported by get_activity_stream_lag (served at /metrics/activity-stream).
+"""
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from redis import Redis as SyncRedis
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.campaigns.models import Activity
+from app.core.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_STREAM_KEY = "stream:activity"
+DEAD_LETTER_STREAM_KEY = "stream:activity:dead"
+ACTIVITY_CONSUMER_GROUP = "activity-writers"
+DRAIN_BATCH_SIZE = 500
+MAX_BATCHES_PER_RUN = 20
+CLAIM_IDLE_MS = 60_000
+RETRY_BASE_DELAY_SECONDS = 1
+RETRY_MAX_DELAY_SECONDS = 60
+
+StreamEntry = Tuple[bytes, Dict[bytes, bytes]]
+
+# Strong references to the background retries, so they are not garbage collected mid-flight
+_retry_tasks: Set[asyncio.Task] = set()
+
+
+def _encode(row: dict) -> Dict[str, str]:
+    return {
+        "campaign_id": row["campaign_id"],
+        "contribution_id": row["contribution_id"] or "",
+        "timestamp": row["timestamp"].isoformat(),
+        "activity_level": repr(float(row["activity_level"] or 0)),
+    }
+
+
+def _decode(fields: Dict[bytes, bytes]) -> dict:
+    return {
+        "campaign_id": fields[b"campaign_id"].decode(),
+        "contribution_id": fields[b"contribution_id"].decode() or None,
+        "timestamp": datetime.fromisoformat(fields[b"timestamp"].decode()),
+        "activity_level": float(fields[b"activity_level"]),
+    }
+
+
+async def enqueue_activities(redis: Redis, activity_rows: List[dict]):
+    """
+    Append one stream entry per activity row, in a single MULTI/EXEC transaction so that either
+    every entry is appended or none is; a fallback after a failure never duplicates rows.
+    """
+    pipe = redis.pipeline(transaction=True)
+    for row in activity_rows:
+        pipe.xadd(ACTIVITY_STREAM_KEY, _encode(row))
+    await pipe.execute()
+
+
+async def store_activities(redis: Redis, activity_rows: List[dict]):
+    """
+    Enqueue activity rows, or insert them directly when the stream cannot be written.
+    Raises if both fail.
+    """
+    try:
+        await enqueue_activities(redis, activity_rows)
+        return
+    except RedisError as e:
+        logger.warning(f"Failed to enqueue {len(activity_rows)} activities, writing them directly: {e}")
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Activity), activity_rows)
+        await db.commit()
+
+
+async def retry_store_activities(redis: Redis, activity_rows: List[dict]):
+    """
+    Retry store_activities with exponential backoff, capped at RETRY_MAX_DELAY_SECONDS,
+    until the rows are written.
+    """
+    delay = RETRY_BASE_DELAY_SECONDS
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            await store_activities(redis, activity_rows)
+            logger.info(f"Stored {len(activity_rows)} activities after retrying")
+            return
+        except Exception as e:
+            delay = min(delay * 2, RETRY_MAX_DELAY_SECONDS)
+            logger.error(f"Failed to store {len(activity_rows)} activities, retrying in {delay}s: {e}")
+
+
+async def write_behind_activities(redis: Redis, activity_rows: List[dict]):
+    """
+    Hand activity rows to the stream consumer, falling back to inserting them directly when the
+    stream cannot be written. When both fail the rows are retried in the background rather than
+    dropped, so the caller is not held up by the outage.
+    """
+    if not activity_rows:
+        return
+    try:
+        await store_activities(redis, activity_rows)
+    except Exception as e:
+        logger.error(f"Failed to store {len(activity_rows)} activities, retrying in the background: {e}")
+        task = asyncio.create_task(retry_store_activities(redis, activity_rows))
+        _retry_tasks.add(task)
+        task.add_done_callback(_retry_tasks.discard)
+
+
+def ensure_consumer_group(redis: SyncRedis):
+    try:
+        redis.xgroup_create(ACTIVITY_STREAM_KEY, ACTIVITY_CONSUMER_GROUP, id="0", mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def consumer_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def write_activity_entries(redis: SyncRedis, db: Session, entries: List[StreamEntry]) -> int:
+    """
+    Bulk-insert a batch of stream entries and acknowledge them once committed.
+    On a database error the batch is rolled back and left pending for XAUTOCLAIM to retry.
+    Returns the number of activity rows written.
+    """
+    rows, written_ids, dead = [], [], []
+    for entry_id, fields in entries:
+        try:
+            rows.append(_decode(fields))
+            written_ids.append(entry_id)
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Malformed activity stream entry {entry_id}: {e}")
+            dead.append((entry_id, fields))
+
+    if rows:
+        try:
+            db.execute(insert(Activity), rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to write {len(rows)} activities, leaving them pending for retry: {e}")
+            written_ids = []
+            rows = []
+
+    pipe = redis.pipeline(transaction=False)
+    for entry_id, fields in dead:
+        pipe.xadd(DEAD_LETTER_STREAM_KEY, fields)
+    acked = written_ids + [entry_id for entry_id, _ in dead]
+    if acked:
+        pipe.xack(ACTIVITY_STREAM_KEY, ACTIVITY_CONSUMER_GROUP, *acked)
+        pipe.xdel(ACTIVITY_STREAM_KEY, *acked)
+    pipe.execute()
+    return len(rows)
+
+
+def drain_activity_stream_once(redis: SyncRedis, db: Session, consumer: str) -> int:
+    """
+    Re-claim entries left pending by failed or crashed runs, then read new entries, in batches
+    of DRAIN_BATCH_SIZE, until the stream is drained or MAX_BATCHES_PER_RUN is reached.
+    """
+    ensure_consumer_group(redis)
+    written = 0
+    start_id = "0-0"
+    for _ in range(MAX_BATCHES_PER_RUN):
+        start_id, claimed = redis.xautoclaim(
+            ACTIVITY_STREAM_KEY, ACTIVITY_CONSUMER_GROUP, consumer, CLAIM_IDLE_MS, start_id, count=DRAIN_BATCH_SIZE
+        )[:2]
+        # Entries deleted while pending come back as None
+        claimed = [entry for entry in claimed if entry and entry[1]]
+        if claimed:
+            written += write_activity_entries(redis, db, claimed)
+        if start_id in (b"0-0", "0-0"):
+            break
+
+    for _ in range(MAX_BATCHES_PER_RUN):
+        response = redis.xreadgroup(
+            ACTIVITY_CONSUMER_GROUP, consumer, {ACTIVITY_STREAM_KEY: ">"}, count=DRAIN_BATCH_SIZE
+        )
+        if not response:
+            break
+        entries = response[0][1]
+        written += write_activity_entries(redis, db, entries)
+        if len(entries) < DRAIN_BATCH_SIZE:
+            break
+    return written
+
+
+def get_activity_stream_lag(redis: SyncRedis) -> Dict[str, Optional[int]]:
+    """
+    Consumer lag of the activity stream: entries not yet delivered to the group (lag, Redis 7+),
+    entries delivered but not yet acknowledged (pending), and the age of the oldest pending entry.
+    """
+    try:
+        groups = redis.xinfo_groups(ACTIVITY_STREAM_KEY)
+        length = redis.xlen(ACTIVITY_STREAM_KEY)
+    except ResponseError:
+        # The stream has not been created yet
+        return {"length": 0, "lag": 0, "pending": 0, "oldest_pending_age_seconds": None}
+    group = next((g for g in groups if g["name"] in (ACTIVITY_CONSUMER_GROUP, ACTIVITY_CONSUMER_GROUP.encode())), None)
+    if group is None:
+        return {"length": length, "lag": length, "pending": 0, "oldest_pending_age_seconds": None}
+
+    oldest_age = None
+    if group["pending"]:
+        oldest = redis.xpending(ACTIVITY_STREAM_KEY, ACTIVITY_CONSUMER_GROUP)["min"]
+        oldest_ms = int((oldest.decode() if isinstance(oldest, bytes) else oldest).split("-")[0])
+        oldest_age = max(int(datetime.utcnow().timestamp() - oldest_ms / 1000), 0)
+    return {
+        "length": length,
+        "lag": group.get("lag"),
+        "pending": group["pending"],
+        "oldest_pending_age_seconds": oldest_age,
+    }
@@ -0,0 +1,85 @@
+"""
+Per-day HyperLogLog sketches of active contributors, kept in Redis.
+
+Every submitted contribution PFADDs its contributor into two keys for the submission day
+(UTC): one for the campaign and one platform-wide. Counting distinct contributors over any
+date range is then a single PFCOUNT over the day keys, which merges the sketches server-side,
+so the cost depends on the number of days in the range and never on contribution history.
+
+Memory and accuracy:
+  - A key uses Redis' sparse encoding while small (a few hundred bytes for a quiet campaign day)
+    and is promoted to the dense encoding at hll-sparse-max-bytes (3000 bytes by default).
+    A dense key is capped at 12 KB regardless of how many contributors it holds.
+  - Footprint is therefore at most (campaigns with activity that day + 1) * 12 KB per day,
+    and keys expire after SKETCH_RETENTION_DAYS.
+  - Counts carry a standard error of 0.81%, for single days and merged ranges alike.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from redis.asyncio import Redis
+
+SKETCH_KEY_PREFIX = "hll:contributors"
+GLOBAL_SCOPE = "global"
+SKETCH_RETENTION_DAYS = 400
+MAX_RANGE_DAYS = 366
+
+
+def sketch_key(day: date, onchain_campaign_id: Optional[str] = None) -> str:
+    scope = f"campaign:{onchain_campaign_id}" if onchain_campaign_id else GLOBAL_SCOPE
+    return f"{SKETCH_KEY_PREFIX}:{scope}:{day.isoformat()}"
+
+
+def sketch_keys(start: date, end: date, onchain_campaign_id: Optional[str] = None) -> List[str]:
+    days = (end - start).days + 1
+    return [sketch_key(start + timedelta(days=i), onchain_campaign_id) for i in range(days)]
+
+
+async def record_active_contributor(
+    redis: Redis,
+    onchain_campaign_id: str,
+    contributor: str,
+    at: Optional[datetime] = None,
+):
+    """
+    Add the contributor to the campaign and global sketches of the given (UTC) day.
+    """
+    await record_active_contributors(redis, [(onchain_campaign_id, contributor, at)])
+
+
+async def record_active_contributors(
+    redis: Redis,
+    entries: Iterable[Tuple[str, str, Optional[datetime]]],
+):
+    """
+    Batch form of record_active_contributor for (onchain_campaign_id, contributor, at) entries,
+    sent as a single pipeline.
+    """
+    ttl = SKETCH_RETENTION_DAYS * 24 * 60 * 60
+    now = datetime.utcnow()
+    members = defaultdict(set)
+    for onchain_campaign_id, contributor, at in entries:
+        day = (at or now).date()
+        members[sketch_key(day, onchain_campaign_id)].add(contributor)
+        members[sketch_key(day)].add(contributor)
+    if not members:
+        return
+    pipe = redis.pipeline(transaction=False)
+    for key, contributors in members.items():
+        pipe.pfadd(key, *contributors)
+        pipe.expire(key, ttl)
+    await pipe.execute()
+
+
+async def count_active_contributors(
+    redis: Redis,
+    start: date,
+    end: date,
+    onchain_campaign_id: Optional[str] = None,
+) -> int:
+    """
+    Estimated number of distinct contributors between start and end (inclusive).
+    PFCOUNT over several keys merges them into a temporary sketch on the server.
+    """
+    return await redis.pfcount(*sketch_keys(start, end, onchain_campaign_id))
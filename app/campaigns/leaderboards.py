@@ -0,0 +1,73 @@
+"""
+Global leaderboards served from Postgres materialized views.
+
+contributor_leaderboard and creator_leaderboard are created by migration and refreshed with
+REFRESH MATERIALIZED VIEW CONCURRENTLY by the refresh_leaderboards Celery task, so readers are
+never blocked by a refresh. Each view carries a 1-based position, so pages are index range scans
+on position instead of OFFSET scans. The time of the last refresh of each view is recorded in
+materialized_view_refreshes and returned as refreshed_at.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, String, column, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.campaigns.models import MaterializedViewRefresh
+
+CONTRIBUTOR_LEADERBOARD_VIEW = "contributor_leaderboard"
+CREATOR_LEADERBOARD_VIEW = "creator_leaderboard"
+LEADERBOARD_VIEWS = (CONTRIBUTOR_LEADERBOARD_VIEW, CREATOR_LEADERBOARD_VIEW)
+
+contributor_leaderboard = table(
+    CONTRIBUTOR_LEADERBOARD_VIEW,
+    column("position", Integer),
+    column("contributor", String),
+    column("total_contributions", Integer),
+    column("success_rate", Float),
+    column("total_amount_earned", Float),
+)
+
+creator_leaderboard = table(
+    CREATOR_LEADERBOARD_VIEW,
+    column("position", Integer),
+    column("creator", String),
+    column("total_campaigns", Integer),
+    column("total_amount_spent", Float),
+    column("reputation_score", Float),
+)
+
+
+def refresh_leaderboard_views(db: Session):
+    """
+    Refresh every leaderboard view concurrently and record the refresh time. Does not commit.
+    """
+    now = datetime.utcnow()
+    for view_name in LEADERBOARD_VIEWS:
+        db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name}"))
+    stmt = pg_insert(MaterializedViewRefresh).values([
+        {"view_name": view_name, "refreshed_at": now} for view_name in LEADERBOARD_VIEWS
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[MaterializedViewRefresh.view_name],
+        set_={"refreshed_at": stmt.excluded.refreshed_at},
+    ))
+
+
+async def get_leaderboard_page(
+    db: AsyncSession, view, columns: List, limit: int, offset: int
+) -> Tuple[List[Dict], Optional[datetime]]:
+    """
+    Rows offset+1 .. offset+limit of a leaderboard view by position, and the view's refreshed_at.
+    """
+    rows = (await db.execute(
+        select(*columns)
+        .where(view.c.position > offset, view.c.position <= offset + limit)
+        .order_by(view.c.position)
+    )).all()
+    refreshed_at: Optional[datetime] = await db.scalar(
+        select(MaterializedViewRefresh.refreshed_at).where(MaterializedViewRefresh.view_name == view.name)
+    )
+    return [dict(row._mapping) for row in rows], refreshed_at
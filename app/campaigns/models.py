@@ -1,6 +1,7 @@
 import uuid
-from sqlalchemy import Column, Integer, String, Boolean, Float, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, Float, Date, DateTime, ForeignKey, Index, Computed, Identity, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from datetime import datetime
 
 from app.core.database import Base
@@ -8,8 +9,8 @@ from app.core.database import Base
 class Campaign(Base):
     __tablename__ = 'campaigns'
     
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
-    onchain_campaign_id = Column(String, index=True)
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    onchain_campaign_id = Column(String, index=True, unique=True)
     creator_wallet_address = Column(String, index=True) 
     title = Column(String, index=True)
     description = Column(String)
@@ -29,23 +30,63 @@ class Campaign(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     current_activity_level = Column(Float, default=0.0)
+    # Running SUM/COUNT of the campaign's Activity rows; current_activity_level is their ratio
+    activity_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    activity_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Exponentially decayed SUM/COUNT, as of activity_decayed_at; their ratio weights recent activity
+    activity_decayed_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    activity_decayed_count = Column(Float, nullable=False, default=0.0, server_default="0")
+    activity_decayed_at = Column(DateTime, nullable=True)
+    # Full-text search document, title weighted above description above data requirements;
+    # deferred so loading a Campaign never reads it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(data_requirements, '')), 'C')",
+            persisted=True,
+        ),
+    ))
+
+    # Dense integer position of the campaign in the Redis browse bitmaps (see app.campaigns.tag_index)
+    bitmap_offset = Column(Integer, Identity(), unique=True, nullable=False)
 
     contributions = relationship("Contribution", back_populates="campaign")
     activities = relationship("Activity", back_populates="campaign")
+    stats = relationship("CampaignStats", back_populates="campaign", uselist=False)
+
+    __table_args__ = (
+        # Keyset pagination order for campaign listings
+        Index("ix_campaigns_created_at_id", "created_at", "id"),
+        # Expiry sweep only ever looks at active campaigns
+        Index("ix_campaigns_active_expiration", "expiration", postgresql_where=text("is_active")),
+        Index("ix_campaigns_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
 
 class Contribution(Base):
     __tablename__ = 'contributions'
 
-    contribution_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
+    contribution_id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     onchain_contribution_id = Column(String, index=True, nullable=True)
     campaign_id = Column(String, ForeignKey("campaigns.id"), nullable=False)
-    contributor = Column(String, index=True)
+    contributor = Column(String)
     data_url = Column(String)
     transaction_hash = Column(String)
     ai_verification_score = Column(Float, nullable=True)
     reputation_score = Column(Float, nullable=True)
     quality_score = Column(Integer)
+    # Mirrors get_quality_score_category so tier filters run in SQL
+    quality_tier = Column(
+        String,
+        Computed(
+            "CASE WHEN quality_score > 95 THEN 'High Quality' "
+            "WHEN quality_score >= 80 THEN 'Medium Quality' "
+            "ELSE 'Low Quality' END",
+            persisted=True,
+        ),
+    )
     is_verified = Column(Boolean, default=False)
     reward_claimed = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -53,14 +94,150 @@ class Contribution(Base):
     campaign = relationship("Campaign", back_populates="contributions")
     activities = relationship("Activity", back_populates="contribution")
 
+    __table_args__ = (
+        # Keyset pagination order for a campaign's contributions
+        Index("ix_contributions_campaign_id_created_at", "campaign_id", "created_at", "contribution_id"),
+        Index("ix_contributions_campaign_id_quality_tier", "campaign_id", "quality_tier", "created_at", "contribution_id"),
+        Index("ix_contributions_campaign_id_contributor", "campaign_id", "contributor"),
+        Index("ix_contributions_contributor_campaign_id", "contributor", "campaign_id"),
+    )
+
 
 class Activity(Base):
     __tablename__ = 'activity'
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     campaign_id = Column(String, ForeignKey("campaigns.id"), nullable=False)  # Foreign key to track activity by campaign
-    contribution_id = Column(String, ForeignKey("contributions.contribution_id"), nullable=True)
+    contribution_id = Column(String, ForeignKey("contributions.contribution_id"), nullable=True, index=True)
     timestamp = Column(DateTime, index=True)
     activity_level = Column(Float)  # Activity level (0-100)
     
     campaign = relationship("Campaign", back_populates="activities")
-    contribution = relationship("Contribution", back_populates="activities")
\ No newline at end of file
+    contribution = relationship("Contribution", back_populates="activities")
+
+    __table_args__ = (
+        Index("ix_activity_campaign_id_timestamp", "campaign_id", "timestamp"),
+    )
+
+
+class ActivityHourly(Base):
+    """
+    Hourly activity rollup per campaign: the number of contributions made in each hour and the sum of
+    their activity levels, maintained in the same transaction as each contribution insert.
+    """
+    __tablename__ = 'activity_hourly'
+
+    campaign_id = Column(String, ForeignKey("campaigns.id"), primary_key=True)
+    hour_bucket = Column(DateTime, primary_key=True)  # Contribution time truncated to the hour (UTC)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+    sum_level = Column(Float, nullable=False, default=0.0, server_default="0")
+
+
+class CampaignStats(Base):
+    """
+    Precomputed per-campaign aggregates, maintained in the same transaction as each contribution insert.
+    """
+    __tablename__ = 'campaign_stats'
+
+    campaign_id = Column(String, ForeignKey("campaigns.id"), primary_key=True)
+    contributions_count = Column(Integer, nullable=False, default=0, server_default="0")
+    unique_contributors = Column(Integer, nullable=False, default=0, server_default="0")
+    quality_score_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    quality_score_count = Column(Integer, nullable=False, default=0, server_default="0")
+    ai_verification_score_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    ai_verification_score_count = Column(Integer, nullable=False, default=0, server_default="0")
+    reputation_score_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    reputation_score_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rewards_claimed_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Exponentially time-decayed submission count, recomputed periodically by refresh_trending_scores
+    trending_score = Column(Float, nullable=False, default=0.0, server_default="0")
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    campaign = relationship("Campaign", back_populates="stats")
+
+    __table_args__ = (
+        # Popular and trending campaign feeds
+        Index("ix_campaign_stats_contributions_count", "contributions_count", "campaign_id"),
+        Index("ix_campaign_stats_trending_score", "trending_score", "campaign_id"),
+    )
+
+
+class CampaignContributor(Base):
+    """
+    One row per distinct (campaign, contributor) pair; backs the exact unique contributor count.
+    """
+    __tablename__ = 'campaign_contributors'
+
+    campaign_id = Column(String, ForeignKey("campaigns.id"), primary_key=True)
+    contributor = Column(String, primary_key=True)
+    first_contributed_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Campaigns a wallet has contributed to
+        Index("ix_campaign_contributors_contributor_campaign_id", "contributor", "campaign_id"),
+    )
+
+
+class CampaignTag(Base):
+    """
+    One row per tag (a PromptTagEnum value) of a campaign.
+    """
+    __tablename__ = 'campaign_tags'
+
+    campaign_id = Column(String, ForeignKey("campaigns.id"), primary_key=True)
+    tag = Column(String, primary_key=True)
+
+
+class WalletStats(Base):
+    """
+    Precomputed per-wallet aggregates, maintained in the same transaction as each contribution
+    insert and each campaign creation; backs the wallet analytics endpoints.
+    """
+    __tablename__ = 'wallet_stats'
+
+    wallet_address = Column(String, primary_key=True)
+    submissions_count = Column(Integer, nullable=False, default=0, server_default="0")
+    reputation_score_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    ai_verification_score_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    ai_verification_score_count = Column(Integer, nullable=False, default=0, server_default="0")
+    campaigns_contributed_count = Column(Integer, nullable=False, default=0, server_default="0")
+    campaigns_created_count = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class CampaignDailyStats(Base):
+    """
+    Per-campaign, per-day (UTC) contribution aggregates, maintained in the same transaction as
+    each contribution insert; backs the daily/weekly/monthly campaign analytics.
+    """
+    __tablename__ = 'campaign_daily_stats'
+
+    campaign_id = Column(String, ForeignKey("campaigns.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    submissions = Column(Integer, nullable=False, default=0, server_default="0")
+    quality_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    quality_count = Column(Integer, nullable=False, default=0, server_default="0")
+    ai_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    ai_count = Column(Integer, nullable=False, default=0, server_default="0")
+    unique_contributors = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class CampaignDailyContributor(Base):
+    """
+    One row per distinct (campaign, day, contributor); backs the exact daily unique contributor
+    count and distinct counts over weeks and months.
+    """
+    __tablename__ = 'campaign_daily_contributors'
+
+    campaign_id = Column(String, ForeignKey("campaigns.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    contributor = Column(String, primary_key=True)
+
+
+class MaterializedViewRefresh(Base):
+    """
+    When each materialized view was last refreshed (see app.campaigns.leaderboards).
+    """
+    __tablename__ = 'materialized_view_refreshes'
+
+    view_name = Column(String, primary_key=True)
+    refreshed_at = Column(DateTime, nullable=False)
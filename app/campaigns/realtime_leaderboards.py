@@ -0,0 +1,159 @@
+"""
+Real-time leaderboards kept as Redis sorted sets.
+
+Every submitted contribution ZINCRBYs its contributor in three sets: global submissions,
+the campaign's submissions, and global amount earned (the campaign's unit_price per contribution).
+Reads never touch Postgres: the top N is a ZREVRANGE, and a wallet's rank with its neighbours is a
+ZREVRANK followed by a ZREVRANGE around it, both O(log N + M).
+
+The sets are derived data. rebuild_realtime_leaderboards recomputes them from the contributions
+table for recovery; it builds new sets under temporary keys and RENAMEs them into place, so readers
+never see a partial leaderboard. Increments made while a rebuild is running may be lost, so run it
+when the sets are known to be wrong, not on a schedule.
+"""
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from redis import Redis as SyncRedis
+from redis.asyncio import Redis
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.campaigns.models import Campaign, Contribution
+from app.core.enums.leaderboards import RealtimeLeaderboardEnum
+
+LEADERBOARD_KEY_PREFIX = "leaderboard"
+REBUILD_SUFFIX = ":rebuild"
+REBUILD_CHUNK_SIZE = 1000
+MAX_RANK_NEIGHBOURS = 50
+
+
+def leaderboard_key(board: RealtimeLeaderboardEnum, onchain_campaign_id: Optional[str] = None) -> str:
+    scope = f"campaign:{onchain_campaign_id}" if onchain_campaign_id else "global"
+    return f"{LEADERBOARD_KEY_PREFIX}:{scope}:{board.value}"
+
+
+async def record_leaderboard_submissions(redis: Redis, entries: Iterable[Tuple[str, str, Optional[float]]]):
+    """
+    Count new contributions, as (onchain_campaign_id, contributor, unit_price) entries,
+    in the leaderboards with a single pipeline.
+    """
+    submissions = Counter()
+    campaign_submissions = defaultdict(Counter)
+    earned = Counter()
+    for onchain_campaign_id, contributor, unit_price in entries:
+        submissions[contributor] += 1
+        campaign_submissions[onchain_campaign_id][contributor] += 1
+        earned[contributor] += unit_price or 0
+    if not submissions:
+        return
+
+    pipe = redis.pipeline(transaction=False)
+    for contributor, count in submissions.items():
+        pipe.zincrby(leaderboard_key(RealtimeLeaderboardEnum.SUBMISSIONS), count, contributor)
+        pipe.zincrby(leaderboard_key(RealtimeLeaderboardEnum.EARNED), earned[contributor], contributor)
+    for onchain_campaign_id, counts in campaign_submissions.items():
+        key = leaderboard_key(RealtimeLeaderboardEnum.SUBMISSIONS, onchain_campaign_id)
+        for contributor, count in counts.items():
+            pipe.zincrby(key, count, contributor)
+    await pipe.execute()
+
+
+def _entries(members: List[Tuple[bytes, float]], first_rank: int, board: RealtimeLeaderboardEnum) -> List[Dict]:
+    return [
+        {
+            "rank": first_rank + i,
+            "wallet_address": member.decode(),
+            "score": int(score) if board == RealtimeLeaderboardEnum.SUBMISSIONS else score,
+        }
+        for i, (member, score) in enumerate(members)
+    ]
+
+
+async def get_top(
+    redis: Redis, board: RealtimeLeaderboardEnum, limit: int, onchain_campaign_id: Optional[str] = None
+) -> List[Dict]:
+    """
+    The top `limit` wallets of a leaderboard, with 1-based ranks.
+    """
+    members = await redis.zrevrange(leaderboard_key(board, onchain_campaign_id), 0, limit - 1, withscores=True)
+    return _entries(members, 1, board)
+
+
+async def get_wallet_rank(
+    redis: Redis,
+    board: RealtimeLeaderboardEnum,
+    wallet_address: str,
+    neighbours: int,
+    onchain_campaign_id: Optional[str] = None,
+) -> Optional[Dict]:
+    """
+    A wallet's 1-based rank and score, with up to `neighbours` wallets ranked directly above and below it.
+    Returns None if the wallet is not on the leaderboard.
+    """
+    key = leaderboard_key(board, onchain_campaign_id)
+    pipe = redis.pipeline(transaction=False)
+    pipe.zrevrank(key, wallet_address)
+    pipe.zscore(key, wallet_address)
+    rank, score = await pipe.execute()
+    if rank is None:
+        return None
+
+    start = max(rank - neighbours, 0)
+    members = await redis.zrevrange(key, start, rank + neighbours, withscores=True)
+    window = _entries(members, start + 1, board)
+    return {
+        "rank": rank + 1,
+        "score": int(score) if board == RealtimeLeaderboardEnum.SUBMISSIONS else score,
+        "above": [entry for entry in window if entry["rank"] <= rank],
+        "below": [entry for entry in window if entry["rank"] > rank + 1],
+    }
+
+
+def rebuild_realtime_leaderboards(redis: SyncRedis, db: Session) -> int:
+    """
+    Recompute every leaderboard set from the contributions table and swap it into place.
+    Campaign sets for campaigns that no longer have contributions are removed.
+    Returns the number of sets written.
+    """
+    scores = defaultdict(dict)
+    for row in db.execute(
+        select(
+            Contribution.contributor,
+            func.count(Contribution.contribution_id).label("submissions"),
+            func.coalesce(func.sum(Campaign.unit_price), 0).label("earned"),
+        )
+        .join(Campaign, Campaign.id == Contribution.campaign_id)
+        .where(Contribution.contributor.isnot(None))
+        .group_by(Contribution.contributor)
+    ):
+        scores[leaderboard_key(RealtimeLeaderboardEnum.SUBMISSIONS)][row.contributor] = row.submissions
+        scores[leaderboard_key(RealtimeLeaderboardEnum.EARNED)][row.contributor] = float(row.earned)
+    for row in db.execute(
+        select(
+            Campaign.onchain_campaign_id,
+            Contribution.contributor,
+            func.count(Contribution.contribution_id).label("submissions"),
+        )
+        .join(Campaign, Campaign.id == Contribution.campaign_id)
+        .where(Contribution.contributor.isnot(None))
+        .group_by(Campaign.onchain_campaign_id, Contribution.contributor)
+    ):
+        key = leaderboard_key(RealtimeLeaderboardEnum.SUBMISSIONS, row.onchain_campaign_id)
+        scores[key][row.contributor] = row.submissions
+
+    stale_keys = {
+        key.decode() for key in redis.scan_iter(match=f"{LEADERBOARD_KEY_PREFIX}:*", count=REBUILD_CHUNK_SIZE)
+    } - set(scores)
+    for key, members in scores.items():
+        rebuild_key = key + REBUILD_SUFFIX
+        pipe = redis.pipeline(transaction=False)
+        pipe.delete(rebuild_key)
+        items = list(members.items())
+        for i in range(0, len(items), REBUILD_CHUNK_SIZE):
+            pipe.zadd(rebuild_key, dict(items[i:i + REBUILD_CHUNK_SIZE]))
+        pipe.rename(rebuild_key, key)
+        pipe.execute()
+    if stale_keys:
+        redis.delete(*stale_keys)
+    return len(scores)
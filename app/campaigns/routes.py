@@ -1,14 +1,36 @@
 import logging
-from fastapi import FastAPI, HTTPException, Depends, APIRouter
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from fastapi import FastAPI, HTTPException, Depends, APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from typing import List, Optional, Dict
-from datetime import datetime, timedelta
-
-from app.campaigns.models import Campaign, Contribution, Activity
-from app.campaigns.schemas import CampaignCreate, CampaignResponse, ContributionCreate, ContributionResponse, CampaignsActiveResponse, ContributionsListResponse, WalletCampaignsResponse, WeeklyAnalyticsResponse
-from app.campaigns.services import serialize_campaign, track_campaign_activity_overall, track_contribution_activity, get_quality_score_category
-from app.core.database import get_session
+from datetime import datetime, timedelta, date
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.campaigns.models import Campaign, Contribution, Activity, CampaignStats, WalletStats
+from app.campaigns.schemas import CampaignCreate, CampaignResponse, ContributionCreate, ContributionResponse, ContributionsListResponse, WalletCampaignsResponse, WeeklyAnalyticsResponse, CampaignsPageResponse, ActiveCampaignsPageResponse, ContributionBatchCreate, ContributionBatchResponse, CampaignAnalyticsBatchRequest, CampaignSearchPageResponse, CampaignFeedPageResponse, CampaignBrowsePageResponse
+from app.campaigns.services import stream_contributions_export, serialize_campaign, serialize_campaign_row, select_campaigns_with_counts, select_campaign_rows, CAMPAIGN_RESPONSE_COLUMNS, ACTIVE_CAMPAIGN_RESPONSE_COLUMNS, CONTRIBUTION_RESPONSE_COLUMNS, init_campaign_stats, get_campaign_stats, campaign_cache_tag, wallet_cache_tag, CAMPAIGNS_CACHE_TAG, LEADERBOARDS_CACHE_TAG, build_contribution, build_activity_rows, insert_contributions, recent_activity_level, get_peak_activity, truncate_to_bucket, to_utc_naive, ACTIVITY_BUCKET_HOURS, MAX_PEAK_ACTIVITY_RANGE_DAYS, align_to_period, count_periods, select_campaign_period_stats, MAX_ANALYTICS_PERIODS, select_campaign_analytics, campaign_analytics_from_row, record_campaign_created, wallet_stats_summary, contributed_by_wallet, select_contributor_analytics, contributor_analytics_from_row, select_campaign_search, FEED_SCORE_COLUMNS, CAMPAIGN_TAGS, record_campaign_tags
+from app.campaigns.activity_stream import write_behind_activities
+from app.campaigns.leaderboards import contributor_leaderboard, creator_leaderboard, get_leaderboard_page
+from app.campaigns.realtime_leaderboards import record_leaderboard_submissions, get_top, get_wallet_rank, MAX_RANK_NEIGHBOURS
+from app.campaigns.contributor_sketches import record_active_contributor, record_active_contributors, count_active_contributors, MAX_RANGE_DAYS
+from app.campaigns.tag_index import index_campaign, browse_campaigns
+from app.core.constants import ACTIVITY_WRITE_BEHIND
+from app.core.cache import cached_response, conditional_response, invalidate_tags_async
+from app.core.database import get_async_session
+from app.core.enums.activity_buckets import ActivityBucketEnum
+from app.core.enums.analytics_windows import ActiveContributorWindowEnum, AnalyticsGranularityEnum, ContributorBreakdownEnum
+from app.core.enums.contribution_batch_status import ContributionBatchStatusEnum
+from app.core.enums.export_formats import ExportFormatEnum
+from app.core.enums.leaderboards import RealtimeLeaderboardEnum
+from app.core.enums.premium_filters import PremiumPromptFilterType
+from app.core.enums.quality_tiers import QualityTierEnum, QUALITY_TIER_LABELS
+from app.core.enums.sort_order import SortOrderEnum
+from app.core.enums.tags import PromptTagEnum, TagMatchEnum
+from app.core.redis import get_redis_pool
+from app.core.pagination import keyset_paginate, rank_paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.core.responses import FastJSONResponse, rows_to_dicts
 
 
 logging.basicConfig(level=logging.INFO)
@@ -17,7 +39,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # @router.delete("/campaigns/{campaign_id}", summary="Delete a campaign by its ID", response_model=dict)
-# def delete_campaign(campaign_id: str, db: Session = Depends(get_session)):
+# def delete_campaign(campaign_id: str, db: AsyncSession = Depends(get_async_session)):
 #     """
 #     Delete the campaign with the given campaign_id.
 #     """
@@ -30,165 +52,429 @@ router = APIRouter()
 #     return {"detail": "Campaign deleted successfully"}
 
 
-@router.get("/all", response_model=List[CampaignResponse])
-def get_all_campaigns(db: Session = Depends(get_session)):
-    db_campaigns = (
-        db.query(Campaign)
-        .options(joinedload(Campaign.contributions))
-        .order_by(Campaign.created_at.desc())
-        .all()
+@router.get("/all", response_model=CampaignsPageResponse)
+@conditional_response("all_campaigns", tags=lambda **_: [CAMPAIGNS_CACHE_TAG])
+async def get_all_campaigns(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_session)
+):
+    rows, next_cursor, has_more = await keyset_paginate(
+        db,
+        select_campaign_rows(CAMPAIGN_RESPONSE_COLUMNS),
+        Campaign.created_at,
+        Campaign.id,
+        cursor,
+        limit,
+        cursor_of=lambda row: (row.created_at, row.campaign_id),
     )
-    result = []
-    for campaign in db_campaigns:
-        contributions_count = len(campaign.contributions)
-        unique_count = db.query(func.count(func.distinct(Contribution.contributor))) \
-                         .filter(Contribution.campaign_id == campaign.id).scalar()
-        # Extend the serialized campaign with the unique contributions count.
-        serialized = serialize_campaign(campaign, contributions_count)
-        serialized["unique_contributions_count"] = unique_count
-        result.append(serialized)
-    return result
+    return FastJSONResponse({
+        "campaigns": rows_to_dicts(rows),
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    })
 
 
 @router.get(
     "/{creator_wallet_address}/campaigns/created", 
-    response_model=List[CampaignResponse],
+    response_model=CampaignsPageResponse,
     summary="Get all campaigns created by a creator wallet address"
 )
-def get_campaigns_created_by_wallet(
+@conditional_response("created_campaigns", tags=lambda **_: [CAMPAIGNS_CACHE_TAG])
+async def get_campaigns_created_by_wallet(
     creator_wallet_address: str, 
-    db: Session = Depends(get_session)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_session)
 ):
-    campaigns = (
-        db.query(Campaign)
-        .filter(Campaign.creator_wallet_address == creator_wallet_address)
-        .options(joinedload(Campaign.contributions))
-        .order_by(Campaign.created_at.desc())
-        .all()
+    rows, next_cursor, has_more = await keyset_paginate(
+        db,
+        select_campaign_rows(CAMPAIGN_RESPONSE_COLUMNS, Campaign.creator_wallet_address == creator_wallet_address),
+        Campaign.created_at,
+        Campaign.id,
+        cursor,
+        limit,
+        cursor_of=lambda row: (row.created_at, row.campaign_id),
     )
-    if not campaigns:
+    if not rows and cursor is None:
         raise HTTPException(
             status_code=404, 
             detail="No campaigns found for the given creator wallet address."
         )
     
-    result = []
-    for campaign in campaigns:
-        contributions_count = len(campaign.contributions)
-        unique_count = db.query(func.count(func.distinct(Contribution.contributor))) \
-                         .filter(Contribution.campaign_id == campaign.id).scalar()
-        serialized = serialize_campaign(campaign, contributions_count)
-        serialized["unique_contributions_count"] = unique_count
-        result.append(serialized)
-    return result
+    return FastJSONResponse({
+        "campaigns": rows_to_dicts(rows),
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    })
 
 
 @router.post("/create-campaigns", response_model=CampaignResponse)
-def create_campaign(campaign: CampaignCreate, db: Session = Depends(get_session)):
-    db_campaign = Campaign(**campaign.dict())
+async def create_campaign(
+    campaign: CampaignCreate,
+    db: AsyncSession = Depends(get_async_session),
+    redis: Redis = Depends(get_redis_pool)
+):
+    db_campaign = Campaign(**campaign.dict(exclude={"tags"}))
     db_campaign.is_active = True
     db.add(db_campaign)
-    db.commit()
-    db.refresh(db_campaign)
+    await db.flush()
+    await init_campaign_stats(db, db_campaign.id)
+    tags = await record_campaign_tags(db, db_campaign.id, campaign.tags)
+    await record_campaign_created(db, db_campaign.creator_wallet_address)
+    await db.commit()
+    await db.refresh(db_campaign)
+    touched_tags = [campaign_cache_tag(db_campaign.onchain_campaign_id), CAMPAIGNS_CACHE_TAG]
+    if db_campaign.creator_wallet_address:
+        touched_tags.append(wallet_cache_tag(db_campaign.creator_wallet_address))
+    await invalidate_tags_async(*touched_tags)
+    try:
+        await index_campaign(
+            redis,
+            db_campaign.bitmap_offset,
+            db_campaign.id,
+            db_campaign.campaign_type,
+            db_campaign.is_premium,
+            db_campaign.is_active,
+            campaign.tags,
+        )
+    except RedisError as e:
+        # The campaign is stored; the browse index catches up on the next rebuild_campaign_browse_index
+        logger.warning(f"Could not index campaign {db_campaign.onchain_campaign_id} for browsing: {e}")
     # New campaign: no contributions, so both counts are 0.
-    return {**serialize_campaign(db_campaign, 0), "unique_contributions_count": 0}
+    return {**serialize_campaign(db_campaign, 0), "unique_contributions_count": 0, "tags": tags}
 
 
-@router.get("/active", response_model=List[CampaignsActiveResponse])
-def get_active_campaigns(db: Session = Depends(get_session)):
-    db_campaigns = (
-        db.query(Campaign)
-        .options(joinedload(Campaign.contributions))
-        .order_by(Campaign.created_at.desc())
-        .filter(Campaign.is_active == True)
-        .all()
+@router.get("/active", response_model=ActiveCampaignsPageResponse)
+@conditional_response("active_campaigns", tags=lambda **_: [CAMPAIGNS_CACHE_TAG])
+async def get_active_campaigns(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_session)
+):
+    rows, next_cursor, has_more = await keyset_paginate(
+        db,
+        select_campaign_rows(ACTIVE_CAMPAIGN_RESPONSE_COLUMNS, Campaign.is_active == True),
+        Campaign.created_at,
+        Campaign.id,
+        cursor,
+        limit,
+        cursor_of=lambda row: (row.created_at, row.campaign_id),
+    )
+    return FastJSONResponse({
+        "campaigns": rows_to_dicts(rows),
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    })
+
+
+@router.get("/search", response_model=CampaignSearchPageResponse)
+async def search_campaigns(
+    q: str = Query(..., min_length=1, max_length=256),
+    campaign_type: Optional[str] = None,
+    is_premium: Optional[bool] = None,
+    is_active: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Full-text search over campaign titles, descriptions and data requirements, best matches first.
+    q accepts web-search syntax: quoted phrases, OR and -excluded words.
+    """
+    filters = []
+    if campaign_type is not None:
+        filters.append(Campaign.campaign_type == campaign_type)
+    if is_premium is not None:
+        filters.append(Campaign.is_premium == is_premium)
+    if is_active is not None:
+        filters.append(Campaign.is_active == is_active)
+
+    statement, rank = select_campaign_search(CAMPAIGN_RESPONSE_COLUMNS, q, *filters)
+    rows, next_cursor, has_more = await rank_paginate(
+        db,
+        statement,
+        rank,
+        Campaign.id,
+        cursor,
+        limit,
+        cursor_of=lambda row: (row.rank, row.campaign_id),
     )
-    result = []
-    for campaign in db_campaigns:
-        unique_count = db.query(func.count(func.distinct(Contribution.contributor))) \
-                         .filter(Contribution.campaign_id == campaign.id).scalar()
-        result.append({
-            "campaign_id": campaign.id,
-            "onchain_campaign_id": str(campaign.onchain_campaign_id),
-            "creator_wallet_address": str(campaign.creator_wallet_address),
-            "unit_price": campaign.unit_price,
-            "campaign_type": campaign.campaign_type,
-            "total_budget": float(campaign.total_budget),
-            "max_data_count": int(campaign.max_data_count),
-            "current_contributions": len(campaign.contributions),
-            "unique_contributions_count": unique_count,
-            "title": campaign.title,
-            "description": campaign.description,
-            "is_active": campaign.is_active,
-            "expiration": campaign.expiration
-        })
-    return result
+    return FastJSONResponse({
+        "campaigns": rows_to_dicts(rows),
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    })
+
+
+@router.get("/feed", response_model=CampaignFeedPageResponse)
+@conditional_response("campaign_feed", tags=lambda **_: [CAMPAIGNS_CACHE_TAG])
+async def get_campaign_feed(
+    sort: PremiumPromptFilterType = PremiumPromptFilterType.RECENT,
+    premium: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Active campaigns, newest first (recent), by lifetime contributions (popular) or by
+    time-decayed recent contributions (trending); premium=true limits the feed to premium campaigns.
+    Popular and trending pages are index scans over the precomputed campaign_stats scores.
+    """
+    filters = [Campaign.is_active == True]
+    if premium is not None:
+        filters.append(Campaign.is_premium == premium)
+    columns = (*CAMPAIGN_RESPONSE_COLUMNS, Campaign.is_premium)
+
+    if sort == PremiumPromptFilterType.RECENT:
+        rows, next_cursor, has_more = await keyset_paginate(
+            db,
+            select_campaign_rows(columns, *filters),
+            Campaign.created_at,
+            Campaign.id,
+            cursor,
+            limit,
+            cursor_of=lambda row: (row.created_at, row.campaign_id),
+        )
+    else:
+        score = FEED_SCORE_COLUMNS[sort]
+        # Every campaign has a campaign_stats row; requiring it makes the outer join an inner join
+        filters.append(CampaignStats.campaign_id.isnot(None))
+        rows, next_cursor, has_more = await rank_paginate(
+            db,
+            select_campaign_rows((*columns, score.label("score")), *filters),
+            score,
+            CampaignStats.campaign_id,
+            cursor,
+            limit,
+            cursor_of=lambda row: (row.score, row.campaign_id),
+        )
+    return FastJSONResponse({
+        "sort": sort,
+        "campaigns": rows_to_dicts(rows),
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    })
+
+
+@router.get("/browse", response_model=CampaignBrowsePageResponse)
+async def browse_campaigns_by_tag(
+    tags: List[PromptTagEnum] = Query([]),
+    match: TagMatchEnum = TagMatchEnum.ANY,
+    campaign_type: Optional[str] = None,
+    premium: Optional[bool] = None,
+    active: Optional[bool] = True,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_session),
+    redis: Redis = Depends(get_redis_pool)
+):
+    """
+    Campaigns with any (match=any) or all (match=all) of the given tags and the given campaign_type,
+    premium and active flags, newest first, with the number of matches and, for the browse sidebar,
+    how many of them have each tag, campaign type, premium flag and active flag.
+    Filtering and counting run on the Redis bitmap index; only the page's campaigns are read from Postgres.
+    """
+    if cursor is not None and not cursor.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    browse = await browse_campaigns(
+        redis,
+        tags,
+        match,
+        campaign_type,
+        premium,
+        active,
+        int(cursor) if cursor is not None else None,
+        limit,
+    )
+    rows = []
+    if browse["campaign_ids"]:
+        rows = (await db.execute(
+            select_campaign_rows(CAMPAIGN_RESPONSE_COLUMNS, Campaign.id.in_(browse["campaign_ids"]))
+            .order_by(Campaign.bitmap_offset.desc())
+        )).all()
+    return FastJSONResponse({
+        "campaigns": rows_to_dicts(rows),
+        "total": browse["total"],
+        "facets": browse["facets"],
+        "limit": limit,
+        "next_cursor": str(browse["next_cursor"]) if browse["next_cursor"] is not None else None,
+        "has_more": browse["has_more"],
+    })
 
 
 @router.get("/{onchain_campaign_id}", response_model=CampaignResponse)
-def get_campaign(onchain_campaign_id: str, db: Session = Depends(get_session)):
-    db_campaign = db.query(Campaign).filter(Campaign.onchain_campaign_id == onchain_campaign_id).first()
-    if db_campaign is None:
+@conditional_response("campaign_detail", tags=lambda onchain_campaign_id, **_: [campaign_cache_tag(onchain_campaign_id)])
+@cached_response("campaign_detail", tags=lambda onchain_campaign_id, **_: [campaign_cache_tag(onchain_campaign_id)])
+async def get_campaign(onchain_campaign_id: str, db: AsyncSession = Depends(get_async_session)):
+    row = (await db.execute(
+        select_campaigns_with_counts(Campaign.onchain_campaign_id == onchain_campaign_id).add_columns(CAMPAIGN_TAGS)
+    )).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    contributions_count = db.query(Contribution).filter(Contribution.campaign_id == db_campaign.id).count()
-    unique_count = db.query(func.count(func.distinct(Contribution.contributor))) \
-                     .filter(Contribution.campaign_id == db_campaign.id).scalar()
-    serialized = serialize_campaign(db_campaign, contributions_count)
-    serialized["unique_contributions_count"] = unique_count
-    return serialized
+    return {**serialize_campaign_row(row[:3]), "tags": row.tags}
 
 
 
 
 @router.post("/submit-contributions", response_model=ContributionResponse)
-def submit_contribution(contribution: ContributionCreate, db: Session = Depends(get_session)):
+async def submit_contribution(contribution: ContributionCreate, db: AsyncSession = Depends(get_async_session)):
+    """
+    Records a contribution as one unit of work: the contribution, its activity rows and the campaign
+    aggregates are written in a single transaction with one commit, so a failure leaves nothing behind.
+    The response is built from the insert's RETURNING row instead of a refresh.
+    """
+    # Look up the campaign by its onchain_campaign_id
+    campaign = (await db.execute(
+        select(Campaign.id, Campaign.unit_price).where(Campaign.onchain_campaign_id == contribution.campaign_id)
+    )).first()
+    if campaign is None:
+        raise HTTPException(status_code=404, detail="Campaign not found for given campaign_id")
+
+    # Replace the submitted campaign_id (onchain_campaign_id) with the internal campaign id
+    db_contribution = build_contribution(contribution, campaign.id, datetime.utcnow())
     try:
-        # Look up the campaign by its onchain_campaign_id
-        campaign = db.query(Campaign).filter(Campaign.onchain_campaign_id == contribution.campaign_id).first()
-        if not campaign:
-            raise HTTPException(status_code=404, detail="Campaign not found for given campaign_id")
-        
-        # Replace the submitted campaign_id (onchain_campaign_id) with the internal campaign id
-        contribution_data = contribution.dict()
-        contribution_data["campaign_id"] = campaign.id
-        
-        # Create and insert the contribution
-        db_contribution = Contribution(**contribution_data)
-        db.add(db_contribution)
-        db.commit()
-        db.refresh(db_contribution)
-
-        # Track individual activity
-        track_contribution_activity(campaign.id, db, db_contribution)
-
-        # Track overall campaign activity
-        track_campaign_activity_overall(campaign.id, db, db_contribution)
-        
-        # Prepare the response by mapping the quality score using our helper function.
-        mapped_quality = get_quality_score_category(db_contribution.quality_score)
-        
-        # Remove SQLAlchemy's internal state from the __dict__
-        contrib_data = {k: v for k, v in db_contribution.__dict__.items() if k != "_sa_instance_state"}
-        contrib_data["quality_score"] = mapped_quality  # Override the quality_score with the category
-        
-        return ContributionResponse(**contrib_data)
+        (inserted,) = await insert_contributions(db, [db_contribution], write_activities=not ACTIVITY_WRITE_BEHIND)
+        await db.commit()
     except Exception as e:
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to submit contribution: {str(e)}")
 
+    # The contribution is committed; a failed activity write is logged rather than failing the submission
+    if ACTIVITY_WRITE_BEHIND:
+        try:
+            await write_behind_activities(await get_redis_pool(), build_activity_rows([db_contribution]))
+        except Exception as e:
+            logger.error(f"Failed to write the activity rows of contribution {db_contribution.contribution_id}: {e}")
+
+    # Feed the daily active contributor sketches and the real-time leaderboards;
+    # analytics telemetry must not fail the submission
+    redis = await get_redis_pool()
+    try:
+        await record_active_contributor(
+            redis, contribution.campaign_id, db_contribution.contributor, db_contribution.created_at
+        )
+        await record_leaderboard_submissions(
+            redis, [(contribution.campaign_id, db_contribution.contributor, campaign.unit_price)]
+        )
+    except RedisError as e:
+        logger.warning(f"Failed to record contribution telemetry: {e}")
+
+    await invalidate_tags_async(
+        campaign_cache_tag(contribution.campaign_id),
+        wallet_cache_tag(db_contribution.contributor),
+        CAMPAIGNS_CACHE_TAG,
+    )
+
+    # quality_score carries the category from the generated quality_tier column
+    return inserted._asdict()
+
+
+
+
+@router.post("/submit-contributions/batch", response_model=ContributionBatchResponse)
+async def submit_contributions_batch(batch: ContributionBatchCreate, db: AsyncSession = Depends(get_async_session)):
+    """
+    Submits up to MAX_CONTRIBUTION_BATCH_SIZE contributions, possibly for different campaigns, in one transaction.
+    Campaign ids are resolved with a single query; contributions and their activity rows are bulk inserted and
+    each campaign's aggregates are updated once. Items whose campaign does not exist are reported and skipped.
+    """
+    onchain_ids = {item.campaign_id for item in batch.contributions}
+    campaign_rows = (await db.execute(
+        select(Campaign.id, Campaign.onchain_campaign_id, Campaign.unit_price).where(Campaign.onchain_campaign_id.in_(onchain_ids))
+    )).all()
+    campaigns_by_onchain_id = {row.onchain_campaign_id: row for row in campaign_rows}
+
+    now = datetime.utcnow()
+    results = []
+    new_contributions = []
+    sketch_entries = []
+    leaderboard_entries = []
+    touched_tags = {CAMPAIGNS_CACHE_TAG}
+    for index, item in enumerate(batch.contributions):
+        campaign = campaigns_by_onchain_id.get(item.campaign_id)
+        if campaign is None:
+            results.append({
+                "index": index,
+                "status": ContributionBatchStatusEnum.CAMPAIGN_NOT_FOUND,
+                "detail": "Campaign not found for given campaign_id",
+            })
+            continue
+        new_contributions.append(build_contribution(item, campaign.id, now))
+        sketch_entries.append((item.campaign_id, item.contributor, now))
+        leaderboard_entries.append((item.campaign_id, item.contributor, campaign.unit_price))
+        touched_tags.update((campaign_cache_tag(item.campaign_id), wallet_cache_tag(item.contributor)))
+        results.append({"index": index, "status": ContributionBatchStatusEnum.CREATED})
+
+    if new_contributions:
+        try:
+            inserted = await insert_contributions(db, new_contributions, write_activities=not ACTIVITY_WRITE_BEHIND)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=500, detail=f"Failed to submit contributions: {str(e)}")
+
+        # The contributions are committed; a failed activity write is logged rather than failing the batch
+        if ACTIVITY_WRITE_BEHIND:
+            try:
+                await write_behind_activities(await get_redis_pool(), build_activity_rows(new_contributions))
+            except Exception as e:
+                logger.error(f"Failed to write the activity rows of {len(new_contributions)} contributions: {e}")
+
+        # RETURNING rows come back in input order, matching the created results
+        created_results = (result for result in results if result["status"] == ContributionBatchStatusEnum.CREATED)
+        for result, row in zip(created_results, inserted):
+            result["contribution"] = row._asdict()
+
+        # Feed the daily active contributor sketches and the real-time leaderboards;
+        # analytics telemetry must not fail the submission
+        redis = await get_redis_pool()
+        try:
+            await record_active_contributors(redis, sketch_entries)
+            await record_leaderboard_submissions(redis, leaderboard_entries)
+        except RedisError as e:
+            logger.warning(f"Failed to record contribution telemetry: {e}")
+
+        await invalidate_tags_async(*touched_tags)
+
+    return {
+        "created": len(new_contributions),
+        "failed": len(results) - len(new_contributions),
+        "results": results,
+    }
+
 
 
 
 @router.get("/get-contributions/{onchain_campaign_id}", response_model=ContributionsListResponse)
-def get_contributions(
+@conditional_response("contributions", tags=lambda onchain_campaign_id, **_: [campaign_cache_tag(onchain_campaign_id)])
+async def get_contributions(
     onchain_campaign_id: Optional[str] = None, 
     contributor: Optional[str] = None, 
-    db: Session = Depends(get_session)
+    quality_tier: Optional[QualityTierEnum] = None,
+    is_verified: Optional[bool] = None,
+    reward_claimed: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    sort: SortOrderEnum = SortOrderEnum.DESC,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_session)
 ):
+    """
+    Returns a page of the campaign's contributions. All filters run in SQL against the
+    (campaign_id, created_at) and (campaign_id, quality_tier, created_at) indexes.
+    """
     # Log the incoming request parameters
     logger.info(f"Received get-contributions request. Parameters: onchain_campaign_id={onchain_campaign_id}, contributor={contributor}")
 
     # Find the campaign using onchain_campaign_id
-    campaign = db.query(Campaign).filter(Campaign.onchain_campaign_id == onchain_campaign_id).first()
+    campaign = await db.scalar(select(Campaign).where(Campaign.onchain_campaign_id == onchain_campaign_id))
     logger.info(f"Campaign: {campaign}")
     if campaign is None:
         logger.warning(f"Campaign with onchain_campaign_id={onchain_campaign_id} not found.")
@@ -197,100 +483,134 @@ def get_contributions(
     # Log the found campaign
     logger.info(f"Found campaign: {campaign.title} (ID: {campaign.id})")
 
-    query = db.query(Contribution)
+    # Select exactly the ContributionResponse fields, with quality_score read from the generated quality_tier column
+    statement = select(*CONTRIBUTION_RESPONSE_COLUMNS)
 
     # Filter by campaign.id
     if campaign:
-        query = query.filter(Contribution.campaign_id == campaign.id)
+        statement = statement.where(Contribution.campaign_id == campaign.id)
         logger.info(f"Filtering contributions by campaign ID: {campaign.id}")
     
+    filters = []
     if contributor:
-        query = query.filter(Contribution.contributor == contributor)
-        logger.info(f"Filtering contributions by contributor: {contributor}")
+        filters.append(Contribution.contributor == contributor)
+    if quality_tier:
+        filters.append(Contribution.quality_tier == QUALITY_TIER_LABELS[quality_tier])
+    if is_verified is not None:
+        filters.append(Contribution.is_verified == is_verified)
+    if reward_claimed is not None:
+        filters.append(Contribution.reward_claimed == reward_claimed)
+    # created_at is naive UTC; asyncpg rejects aware datetimes (e.g. ...Z) against it
+    if created_from:
+        filters.append(Contribution.created_at >= to_utc_naive(created_from))
+    if created_to:
+        filters.append(Contribution.created_at <= to_utc_naive(created_to))
+    if filters:
+        statement = statement.where(*filters)
+        logger.info(f"Applied {len(filters)} contribution filters")
     
-    query = query.order_by(Contribution.created_at.desc())
-    contributions = query.all()
-
-    # Calculate unique contributions (based on unique contributor)
-    unique_contributors = {contrib.contributor for contrib in contributions}
-    unique_count = len(unique_contributors)
-
-    logger.info(f"Found {len(contributions)} contributions. Unique contributors: {unique_count}")
-
-    # Map the quality scores for each contribution
-    contributions_with_mapped_quality = []
-    for contrib in contributions:
-        # Map the quality score to a category (as a string)
-        mapped_quality = get_quality_score_category(contrib.quality_score)
-        # Copy contribution data
-        contrib_data = contrib.__dict__.copy()
-        contrib_data.pop("_sa_instance_state", None)  # Remove internal SQLAlchemy state
-        # Ensure onchain_contribution_id is a valid string (default to empty string if None)
-        contrib_data["onchain_contribution_id"] = contrib_data.get("onchain_contribution_id") or ""
-        # Override quality_score with the mapped category
-        contrib_data["quality_score"] = mapped_quality
-        contrib_response = ContributionResponse(**contrib_data)
-        contributions_with_mapped_quality.append(contrib_response)
-
-    logger.info(f"Mapped quality scores for {len(contributions_with_mapped_quality)} contributions")
-
-    return ContributionsListResponse(
-        contributions=contributions_with_mapped_quality,
-        unique_contributions_count=unique_count
+    rows, next_cursor, has_more = await keyset_paginate(
+        db,
+        statement,
+        Contribution.created_at,
+        Contribution.contribution_id,
+        cursor,
+        limit,
+        cursor_of=lambda row: (row.created_at, row.contribution_id),
+        descending=sort == SortOrderEnum.DESC,
     )
 
+    # Unique contributors across every page: precomputed when unfiltered, otherwise counted in SQL
+    if filters:
+        unique_count = await db.scalar(
+            statement.with_only_columns(func.count(func.distinct(Contribution.contributor)))
+        )
+    else:
+        unique_count = (await get_campaign_stats(db, campaign.id)).unique_contributors
+
+    logger.info(f"Found {len(rows)} contributions. Unique contributors: {unique_count}")
+
+    return FastJSONResponse({
+        "contributions": rows_to_dicts(rows),
+        "unique_contributions_count": unique_count,
+        "limit": limit,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    })
 
 
 
+
+@router.get("/get-contributions/{onchain_campaign_id}/export", summary="Stream every contribution of a campaign as NDJSON or CSV")
+async def export_contributions(
+    onchain_campaign_id: str,
+    format: ExportFormatEnum = ExportFormatEnum.NDJSON,
+    contributor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Streams all contributions of the campaign, oldest first, with quality scores mapped to their category.
+    Rows are read from a server-side cursor so memory use is constant and the first bytes arrive immediately.
+    """
+    campaign = await db.scalar(select(Campaign).where(Campaign.onchain_campaign_id == onchain_campaign_id))
+    if campaign is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    media_type = "text/csv" if format == ExportFormatEnum.CSV else "application/x-ndjson"
+    return StreamingResponse(
+        stream_contributions_export(campaign.id, format, contributor),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="contributions-{onchain_campaign_id}.{format.value}"'},
+    )
+
+
 @router.get("/wallet/{wallet_address}/campaign-details", response_model=WalletCampaignsResponse, summary="Get campaigns created and contributed to by a wallet")
-def get_wallet_campaigns_details(wallet_address: str, db: Session = Depends(get_session)):
+async def get_wallet_campaigns_details(
+    wallet_address: str,
+    created_cursor: Optional[str] = None,
+    contributed_cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_session)
+):
     """
-    Returns all campaigns related to the given wallet address. 
-    This includes:
+    Returns the campaigns related to the given wallet address, newest first, one page of each:
       - Campaigns created by the wallet (where the wallet is the creator)
-      - Campaigns the wallet has contributed to (where the wallet appears in contributions)
-    Each campaign is serialized using serialize_campaign and includes the unique_contributions_count.
-    """
-    # Campaigns created by the wallet
-    created_campaigns = (
-        db.query(Campaign)
-        .filter(Campaign.creator_wallet_address == wallet_address)
-        .options(joinedload(Campaign.contributions))
-        .order_by(Campaign.created_at.desc())
-        .all()
+      - Campaigns the wallet has contributed to (resolved through campaign_contributors)
+    The two lists are paged independently with created_cursor and contributed_cursor.
+    """
+    created_rows, next_created_cursor, _ = await keyset_paginate(
+        db,
+        select_campaign_rows(CAMPAIGN_RESPONSE_COLUMNS, Campaign.creator_wallet_address == wallet_address),
+        Campaign.created_at,
+        Campaign.id,
+        created_cursor,
+        limit,
+        cursor_of=lambda row: (row.created_at, row.campaign_id),
+    )
+    contributed_rows, next_contributed_cursor, _ = await keyset_paginate(
+        db,
+        select_campaign_rows(CAMPAIGN_RESPONSE_COLUMNS, contributed_by_wallet(wallet_address)),
+        Campaign.created_at,
+        Campaign.id,
+        contributed_cursor,
+        limit,
+        cursor_of=lambda row: (row.created_at, row.campaign_id),
     )
-    created_serialized = []
-    for campaign in created_campaigns:
-        contributions_count = len(campaign.contributions)
-        unique_count = db.query(func.count(func.distinct(Contribution.contributor)))\
-                         .filter(Contribution.campaign_id == campaign.id).scalar()
-        serialized = serialize_campaign(campaign, contributions_count)
-        serialized["unique_contributions_count"] = unique_count
-        created_serialized.append(serialized)
-
-    # Campaigns contributed to by the wallet
-    contributions = db.query(Contribution).filter(Contribution.contributor == wallet_address).all()
-    campaign_ids = list({contribution.campaign_id for contribution in contributions})
-    contributed_serialized = []
-    if campaign_ids:
-        contributed_campaigns = db.query(Campaign).filter(Campaign.id.in_(campaign_ids)).all()
-        for campaign in contributed_campaigns:
-            contributions_count = len(campaign.contributions)
-            unique_count = db.query(func.count(func.distinct(Contribution.contributor)))\
-                             .filter(Contribution.campaign_id == campaign.id).scalar()
-            serialized = serialize_campaign(campaign, contributions_count)
-            serialized["unique_contributions_count"] = unique_count
-            contributed_serialized.append(serialized)
     
-    return {
-        "created": created_serialized,
-        "contributed": contributed_serialized
-    }
+    return FastJSONResponse({
+        "created": rows_to_dicts(created_rows),
+        "contributed": rows_to_dicts(contributed_rows),
+        "limit": limit,
+        "next_created_cursor": next_created_cursor,
+        "next_contributed_cursor": next_contributed_cursor,
+    })
 
 
 
 @router.get("/analytics/campaign/{onchain_campaign_id}")
-def get_campaign_analytics(onchain_campaign_id: str, db: Session = Depends(get_session)):
+@conditional_response("campaign_analytics", tags=lambda onchain_campaign_id, **_: [campaign_cache_tag(onchain_campaign_id)])
+@cached_response("campaign_analytics", tags=lambda onchain_campaign_id, **_: [campaign_cache_tag(onchain_campaign_id)])
+async def get_campaign_analytics(onchain_campaign_id: str, db: AsyncSession = Depends(get_async_session)):
     """
     Returns analytics for a given campaign identified by onchain_campaign_id, including:
       - Total contributions
@@ -299,214 +619,258 @@ def get_campaign_analytics(onchain_campaign_id: str, db: Session = Depends(get_s
       - Top 10 contributors for that campaign
       - Unique contributor count
       - Total rewards paid
+    Computed in a single statement (see select_campaign_analytics).
     """
-    campaign = db.query(Campaign).filter(Campaign.onchain_campaign_id == onchain_campaign_id).first()
-    if not campaign:
+    row = (await db.execute(select_campaign_analytics([onchain_campaign_id]))).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
+    return campaign_analytics_from_row(row)
 
-    # Total contributions
-    total_contribs = db.query(Contribution).filter(Contribution.campaign_id == campaign.id).count()
-
-    # Average cost per submission (if no contributions, return 0)
-    avg_cost = float(campaign.total_budget) / total_contribs if total_contribs > 0 else 0
-
-    # Peak activity hours (group contributions by hour)
-    peak_results = (
-        db.query(
-            func.extract('hour', Contribution.created_at).label("hour"),
-            func.count(Contribution.contribution_id).label("count")
-        )
-        .filter(Contribution.campaign_id == campaign.id)
-        .group_by("hour")
-        .all()
-    )
-    if peak_results:
-        max_count = max(r.count for r in peak_results)
-        peak_hours = [int(r.hour) for r in peak_results if r.count == max_count]
-    else:
-        max_count = 0
-        peak_hours = []
-
-    # Top 10 contributors for this campaign
-    top_contributors_q = (
-        db.query(
-            Contribution.contributor,
-            func.count(Contribution.contribution_id).label("submissions")
-        )
-        .filter(Contribution.campaign_id == campaign.id)
-        .group_by(Contribution.contributor)
-        .order_by(func.count(Contribution.contribution_id).desc())
-        .limit(10)
-        .all()
-    )
-    top_contributors = [{"contributor": r.contributor, "submissions": r.submissions} for r in top_contributors_q]
-
-    # Unique contributor count
-    unique_contributors = (
-        db.query(func.count(func.distinct(Contribution.contributor)))
-        .filter(Contribution.campaign_id == campaign.id)
-        .scalar()
-    )
-
-    # Total rewards paid (reward_claimed == True)
-    total_rewards_paid = db.query(Contribution).filter(
-        Contribution.campaign_id == campaign.id, Contribution.reward_claimed == True
-    ).count()
 
+@router.post("/analytics/campaigns/batch")
+async def get_campaigns_analytics_batch(request: CampaignAnalyticsBatchRequest, db: AsyncSession = Depends(get_async_session)):
+    """
+    Returns the campaign analytics of up to MAX_ANALYTICS_BATCH_SIZE campaigns, keyed by
+    onchain_campaign_id, computed in one query. Unknown ids are listed in not_found.
+    """
+    onchain_campaign_ids = list(dict.fromkeys(request.onchain_campaign_ids))
+    rows = (await db.execute(select_campaign_analytics(onchain_campaign_ids))).all()
+    analytics = {row.onchain_campaign_id: campaign_analytics_from_row(row) for row in rows}
     return {
-        "total_contributions": total_contribs,
-        "average_cost_per_submission": avg_cost,
-        "peak_activity": {
-            # "peak_hours": peak_hours,
-            "max_submissions": max_count
-        },
-        "top_contributors": top_contributors,
-        "unique_contributor_count": unique_contributors,
-        "total_rewards_paid": total_rewards_paid,
+        "campaigns": analytics,
+        "not_found": [onchain_campaign_id for onchain_campaign_id in onchain_campaign_ids if onchain_campaign_id not in analytics],
     }
 
 
-@router.get("/analytics/campaign/{onchain_campaign_id}/weekly")
-def get_weekly_campaign_analytics(onchain_campaign_id: str, db: Session = Depends(get_session)):
+@router.get("/analytics/campaign/{onchain_campaign_id}/weekly", response_model=List[WeeklyAnalyticsResponse])
+@conditional_response("campaign_weekly_analytics", tags=lambda onchain_campaign_id, **_: [campaign_cache_tag(onchain_campaign_id)])
+@cached_response("campaign_weekly_analytics", tags=lambda onchain_campaign_id, **_: [campaign_cache_tag(onchain_campaign_id)])
+async def get_weekly_campaign_analytics(
+    onchain_campaign_id: str,
+    start_date: Optional[date] = Query(None, alias="from"),
+    end_date: Optional[date] = Query(None, alias="to"),
+    granularity: AnalyticsGranularityEnum = AnalyticsGranularityEnum.DAY,
+    db: AsyncSession = Depends(get_async_session)
+):
     """
-    Returns weekly analytics for a given campaign identified by onchain_campaign_id, including:
-      - Total submissions for each day of the week
-      - Average quality score for submissions on each day of the week
+    Returns analytics for a given campaign identified by onchain_campaign_id for each day, week
+    or month between from and to (UTC, inclusive), including:
+      - Total submissions
+      - Average quality score and average AI verification score of the submissions
+      - Unique contributors
+    By default this is every day of the current week (Monday to Sunday). Weeks start on Monday
+    and months on the 1st; from is aligned down to the start of its period. Periods without
+    submissions are included with zeros. Served in one query from the campaign_daily_stats rollup.
     """
     # Get the campaign from the database
-    campaign = db.query(Campaign).filter(Campaign.onchain_campaign_id == onchain_campaign_id).first()
-    if not campaign:
+    campaign_id = await db.scalar(select(Campaign.id).where(Campaign.onchain_campaign_id == onchain_campaign_id))
+    if campaign_id is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    # Get today's date and calculate the start of the week (Monday)
-    today = datetime.now()
-    start_of_week = today - timedelta(days=today.weekday())  # This will give us Monday
-    end_of_week = start_of_week + timedelta(days=6)  # This gives us Sunday of the current week
-
-    # Query to get all submissions within the current week
-    result = (
-        db.query(
-            func.extract('dow', Contribution.created_at).label('day_of_week'),  # Day of the week (0=Monday, 6=Sunday)
-            func.count(Contribution.contribution_id).label('submissions'),
-            func.avg(Contribution.quality_score).label('avg_quality_score')
-        )
-        .filter(
-            Contribution.campaign_id == campaign.id,
-            Contribution.created_at >= start_of_week,
-            Contribution.created_at <= end_of_week
-        )
-        .group_by(func.extract('dow', Contribution.created_at))
-        .order_by(func.extract('dow', Contribution.created_at))
-        .all()
-    )
-
-    # Create a list of dates for each day of the week (starting from Monday)
-    dates = [(start_of_week + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7)]  # Get dates from Monday to Sunday
-
-    # Create a dictionary with all days initialized with 0 submissions and quality score 0
-    weekly_data = {date: {'submissions': 0, 'avg_quality_score': 0} for date in dates}
-
-    # Map the query result to the expected response format
-    for day, submissions, avg_quality_score in result:
-        adjusted_day = int(day)  # day is in range 0 (Monday) to 6 (Sunday)
-        specific_date = dates[adjusted_day]  # Get the corresponding date
-        weekly_data[specific_date] = {
-            'submissions': submissions,
-            'avg_quality_score': avg_quality_score or 0,  # Default to 0 if no data
-        }
-
-    # Return the weekly data in the correct order
+    if start_date is None and end_date is None:
+        today = datetime.utcnow().date()
+        start_date = today - timedelta(days=today.weekday())  # Monday of the current week
+        end_date = start_date + timedelta(days=6)
+    elif start_date is None:
+        start_date = end_date - timedelta(days=6)
+    elif end_date is None:
+        end_date = start_date + timedelta(days=6)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    start_date = align_to_period(start_date, granularity)
+    if count_periods(start_date, end_date, granularity) > MAX_ANALYTICS_PERIODS:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_ANALYTICS_PERIODS} periods")
+
+    result = (await db.execute(select_campaign_period_stats(campaign_id, granularity, start_date, end_date))).all()
     return [
         {
-            'date': date,
-            'submissions': data['submissions'],
-            'avg_quality_score': data['avg_quality_score']
-        } 
-        for date, data in weekly_data.items()
+            'date': row.period.strftime('%Y-%m-%d'),
+            'submissions': row.submissions,
+            'avg_quality_score': row.avg_quality_score,
+            'avg_ai_verification_score': row.avg_ai_verification_score,
+            'unique_contributors': row.unique_contributors,
+        }
+        for row in result
     ]
 
 
 @router.get("/analytics/wallet/{wallet_address}")
-def get_wallet_analytics(wallet_address: str, db: Session = Depends(get_session)):
+async def get_wallet_analytics(
+    wallet_address: str,
+    created_cursor: Optional[str] = None,
+    contributed_cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_session)
+):
     """
     Returns analytics for a given contributor (wallet_address), including:
       - Average reputation (total reputation score divided by number of contributions)
       - Total submissions across all campaigns
       - Campaigns created by the wallet
       - Campaigns contributed to by the wallet
+    The averages and counts are read from the precomputed wallet_stats row; the campaign lists
+    are newest-first pages, paged independently with created_cursor and contributed_cursor.
     """
-    # Average reputation
-    total_rep = db.query(func.sum(Contribution.reputation_score)).filter(
-        Contribution.contributor == wallet_address
-    ).scalar() or 0
+    stats = await db.get(WalletStats, wallet_address)
+
+    created_campaigns, next_created_cursor, _ = await keyset_paginate(
+        db,
+        select_campaigns_with_counts(Campaign.creator_wallet_address == wallet_address),
+        Campaign.created_at,
+        Campaign.id,
+        created_cursor,
+        limit,
+        cursor_of=lambda row: (row[0].created_at, row[0].id),
+    )
+    contributed_campaigns, next_contributed_cursor, _ = await keyset_paginate(
+        db,
+        select_campaigns_with_counts(contributed_by_wallet(wallet_address)),
+        Campaign.created_at,
+        Campaign.id,
+        contributed_cursor,
+        limit,
+        cursor_of=lambda row: (row[0].created_at, row[0].id),
+    )
 
-    contrib_count = db.query(func.count(Contribution.contribution_id)).filter(
-        Contribution.contributor == wallet_address
-    ).scalar() or 0
+    return {
+        **wallet_stats_summary(stats),
+        "campaigns_created": [
+            serialize_campaign(campaign, contributions_count)
+            for campaign, contributions_count, _ in created_campaigns
+        ],
+        "campaigns_contributed": [
+            serialize_campaign(campaign, contributions_count)
+            for campaign, contributions_count, _ in contributed_campaigns
+        ],
+        "limit": limit,
+        "next_created_cursor": next_created_cursor,
+        "next_contributed_cursor": next_contributed_cursor,
+    }
 
-    average_reputation = total_rep / contrib_count if contrib_count > 0 else 0
 
-    # Total submissions
-    total_submissions = contrib_count
+WINDOW_DAYS = {
+    ActiveContributorWindowEnum.DAY: 1,
+    ActiveContributorWindowEnum.WEEK: 7,
+    ActiveContributorWindowEnum.MONTH: 30,
+}
 
-    # Campaigns created by the wallet (assuming Campaign.creator_wallet_address)
-    created_campaigns = db.query(Campaign).filter(
-        Campaign.creator_wallet_address == wallet_address
-    ).options(joinedload(Campaign.contributions)).order_by(Campaign.created_at.desc()).all()
-    created_campaigns_serialized = [
-        serialize_campaign(c, len(c.contributions)) for c in created_campaigns
-    ]
-
-    # Campaigns contributed to by the wallet
-    contributions = db.query(Contribution).filter(
-        Contribution.contributor == wallet_address
-    ).all()
-    campaign_ids = list({c.campaign_id for c in contributions})
-    contributed_campaigns = db.query(Campaign).filter(Campaign.id.in_(campaign_ids)).all()
-    contributed_campaigns_serialized = [
-        serialize_campaign(c, len(c.contributions)) for c in contributed_campaigns
-    ]
 
+@router.get("/analytics/active-contributors")
+async def get_active_contributors(
+    window: ActiveContributorWindowEnum = ActiveContributorWindowEnum.DAY,
+    start_date: Optional[date] = Query(None, alias="from"),
+    end_date: Optional[date] = Query(None, alias="to"),
+    onchain_campaign_id: Optional[str] = None,
+    redis: Redis = Depends(get_redis_pool)
+):
+    """
+    Returns the estimated number of distinct active contributors, platform-wide or for one campaign.
+    By default the range is the trailing day, week (7 days) or month (30 days) ending today (UTC);
+    pass from/to to count over an explicit date range instead.
+    Served from per-day HyperLogLog sketches in Redis (standard error 0.81%).
+    """
+    end = end_date or datetime.utcnow().date()
+    start = start_date or end - timedelta(days=WINDOW_DAYS[window] - 1)
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    if (end - start).days + 1 > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_RANGE_DAYS} days")
+
+    active_contributors = await count_active_contributors(redis, start, end, onchain_campaign_id)
     return {
-        "average_reputation": average_reputation,
-        "total_submissions": total_submissions,
-        "campaigns_created": created_campaigns_serialized,
-        "campaigns_contributed": contributed_campaigns_serialized,
+        "scope": onchain_campaign_id or "global",
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "active_contributors": active_contributors,
     }
 
 
 @router.get("/analytics/leaderboard/global")
-def get_global_leaderboard(db: Session = Depends(get_session)):
-    results = (
-        db.query(
-            Contribution.contributor,
-            func.count(Contribution.contribution_id).label("submissions")
-        )
-        .group_by(Contribution.contributor)
-        .order_by(func.count(Contribution.contribution_id).desc())
-        .limit(10)
-        .all()
+@conditional_response("global_leaderboard", tags=lambda **_: [LEADERBOARDS_CACHE_TAG])
+@cached_response("global_leaderboard", tags=lambda **_: [LEADERBOARDS_CACHE_TAG])
+async def get_global_leaderboard(
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Returns contributors ranked by number of submissions, from the contributor_leaderboard view.
+    """
+    entries, refreshed_at = await get_leaderboard_page(
+        db, contributor_leaderboard,
+        [
+            contributor_leaderboard.c.position,
+            contributor_leaderboard.c.contributor,
+            contributor_leaderboard.c.total_contributions.label("submissions"),
+        ],
+        limit, offset,
     )
-    return [{"contributor": r.contributor, "submissions": r.submissions} for r in results]
+    return {"refreshed_at": refreshed_at, "limit": limit, "offset": offset, "contributors": entries}
+
+
+@router.get("/analytics/leaderboard/realtime")
+async def get_realtime_leaderboard(
+    board: RealtimeLeaderboardEnum = RealtimeLeaderboardEnum.SUBMISSIONS,
+    onchain_campaign_id: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    redis: Redis = Depends(get_redis_pool)
+):
+    """
+    Returns the top wallets by submissions (global or, with onchain_campaign_id, within a campaign)
+    or by amount earned, from the real-time Redis leaderboards.
+    """
+    if onchain_campaign_id and board != RealtimeLeaderboardEnum.SUBMISSIONS:
+        raise HTTPException(status_code=400, detail="Campaign leaderboards are only kept for submissions")
+    return {
+        "board": board,
+        "scope": onchain_campaign_id or "global",
+        "entries": await get_top(redis, board, limit, onchain_campaign_id),
+    }
+
+
+@router.get("/analytics/leaderboard/realtime/{wallet_address}")
+async def get_realtime_leaderboard_rank(
+    wallet_address: str,
+    board: RealtimeLeaderboardEnum = RealtimeLeaderboardEnum.SUBMISSIONS,
+    onchain_campaign_id: Optional[str] = None,
+    neighbours: int = Query(2, ge=0, le=MAX_RANK_NEIGHBOURS),
+    redis: Redis = Depends(get_redis_pool)
+):
+    """
+    Returns a wallet's rank and score on a real-time leaderboard, with the wallets ranked
+    directly above and below it.
+    """
+    if onchain_campaign_id and board != RealtimeLeaderboardEnum.SUBMISSIONS:
+        raise HTTPException(status_code=400, detail="Campaign leaderboards are only kept for submissions")
+    rank = await get_wallet_rank(redis, board, wallet_address, neighbours, onchain_campaign_id)
+    if rank is None:
+        raise HTTPException(status_code=404, detail="Wallet is not on this leaderboard")
+    return {
+        "board": board,
+        "scope": onchain_campaign_id or "global",
+        "wallet_address": wallet_address,
+        **rank,
+    }
 
 
 @router.get("/analytics/average-ai-verification/{wallet_address}/{onchain_campaign_id}")
-def get_average_ai_verification(
+@cached_response("average_ai_verification", tags=lambda wallet_address, **_: [wallet_cache_tag(wallet_address)])
+async def get_average_ai_verification(
     wallet_address: str, 
     onchain_campaign_id: str, 
-    db: Session = Depends(get_session)
+    db: AsyncSession = Depends(get_async_session)
 ):
-    campaign = db.query(Campaign).filter(Campaign.onchain_campaign_id == onchain_campaign_id).first()
+    campaign = await db.scalar(select(Campaign).where(Campaign.onchain_campaign_id == onchain_campaign_id))
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    total_ai_score, contrib_count = db.query(
+    total_ai_score, contrib_count = (await db.execute(select(
         func.sum(Contribution.ai_verification_score).label('total_ai_score'),
         func.count(Contribution.contribution_id).label('contrib_count')
-    ).filter(
+    ).where(
         Contribution.contributor == wallet_address,
         Contribution.campaign_id == campaign.id
-    ).first()
+    ))).one()
 
     if contrib_count == 0:
         return {"average_ai_verification": 0}
@@ -517,135 +881,140 @@ def get_average_ai_verification(
 
 
 @router.get("/analytics/leaderboard/global/contributors")
-def get_top_global_contributors(db: Session = Depends(get_session)):
+@conditional_response("global_contributors_leaderboard", tags=lambda **_: [LEADERBOARDS_CACHE_TAG])
+@cached_response("global_contributors_leaderboard", tags=lambda **_: [LEADERBOARDS_CACHE_TAG])
+async def get_top_global_contributors(
+    limit: int = Query(5, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_session)
+):
     """
-    Returns top 5 global contributors across all campaigns.
+    Returns global contributors across all campaigns, ranked by total contributions,
+    from the contributor_leaderboard view (refreshed periodically; see refreshed_at).
     For each contributor, returns:
+      - position
       - address
       - total contributions (count)
       - success rate (average AI verification score)
       - total amount earned (sum of campaign.unit_price for each contribution)
     """
-    results = (
-        db.query(
-            Contribution.contributor.label("address"),
-            func.count(Contribution.contribution_id).label("total_contributions"),
-            func.avg(Contribution.ai_verification_score).label("success_rate"),
-            func.sum(Campaign.unit_price).label("total_amount_earned")
-        )
-        .join(Campaign, Campaign.id == Contribution.campaign_id)
-        .group_by(Contribution.contributor)
-        .order_by(func.count(Contribution.contribution_id).desc())  # Order by total contributions (descending)
-        .limit(5)
-        .all()
+    entries, refreshed_at = await get_leaderboard_page(
+        db, contributor_leaderboard,
+        [
+            contributor_leaderboard.c.position,
+            contributor_leaderboard.c.contributor.label("address"),
+            contributor_leaderboard.c.total_contributions,
+            contributor_leaderboard.c.success_rate,
+            contributor_leaderboard.c.total_amount_earned,
+        ],
+        limit, offset,
     )
-    # Use the _mapping attribute to convert each row to a dict.
-    return [dict(r._mapping) for r in results]
+    return {"refreshed_at": refreshed_at, "limit": limit, "offset": offset, "contributors": entries}
 
 
 
 @router.get("/analytics/leaderboard/global/creators")
-def get_top_campaign_creators(db: Session = Depends(get_session)):
+@conditional_response("global_creators_leaderboard", tags=lambda **_: [LEADERBOARDS_CACHE_TAG])
+@cached_response("global_creators_leaderboard", tags=lambda **_: [LEADERBOARDS_CACHE_TAG])
+async def get_top_campaign_creators(
+    limit: int = Query(5, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_session)
+):
     """
-    Returns top 5 campaign creators.
+    Returns campaign creators ranked by number of campaigns created,
+    from the creator_leaderboard view (refreshed periodically; see refreshed_at).
     For each creator, returns:
+      - position
       - creator wallet address
       - total number of campaigns created
       - total amount spent (sum of campaign.total_budget for campaigns they created)
       - reputation score (average reputation_score from contributions on their campaigns)
     """
-    # First, build a subquery to compute the average reputation score for each creator.
-    creator_reputation_subq = (
-        db.query(
-            Campaign.creator_wallet_address.label("creator"),
-            func.avg(Contribution.reputation_score).label("avg_reputation")
-        )
-        .join(Contribution, Contribution.campaign_id == Campaign.id)
-        .group_by(Campaign.creator_wallet_address)
-        .subquery()
-    )
-
-    results = (
-        db.query(
-            Campaign.creator_wallet_address.label("creator"),
-            func.count(Campaign.id).label("total_campaigns"),
-            func.sum(Campaign.total_budget).label("total_amount_spent"),
-            creator_reputation_subq.c.avg_reputation.label("reputation_score")
-        )
-        .outerjoin(creator_reputation_subq, Campaign.creator_wallet_address == creator_reputation_subq.c.creator)
-        .group_by(Campaign.creator_wallet_address, creator_reputation_subq.c.avg_reputation)
-        .order_by(func.count(Campaign.id).desc())
-        .limit(5)
-        .all()
+    entries, refreshed_at = await get_leaderboard_page(
+        db, creator_leaderboard,
+        [
+            creator_leaderboard.c.position,
+            creator_leaderboard.c.creator,
+            creator_leaderboard.c.total_campaigns,
+            creator_leaderboard.c.total_amount_spent,
+            creator_leaderboard.c.reputation_score,
+        ],
+        limit, offset,
     )
-    return [dict(r._mapping) for r in results]
-
+    return {"refreshed_at": refreshed_at, "limit": limit, "offset": offset, "creators": entries}
 
 
 
-@router.post("/calculate-peak-activity")
-def calculate_peak_activity_hours(onchain_campaign_id: str, db: Session = Depends(get_session)):
-    # Get the current date (today's date)
-    today = datetime.utcnow().date()  # Use UTC to ensure the current date is consistent across time zones
-
-    # Generate the 6-hour time intervals for the current day
-    timeframes = []
-    for i in range(0, 24, 6):
-        start_time = datetime.combine(today, datetime.min.time()) + timedelta(hours=i)
-        end_time = start_time + timedelta(hours=6)
-        timeframes.append({
-            "start_time": start_time,
-            "end_time": end_time
-        })
-
-    peak_activity_by_campaign = {}
-
-    # Loop over each timeframe and calculate activity for the specified campaign
-    for timeframe in timeframes:
-        start_time = timeframe["start_time"]
-        end_time = timeframe["end_time"]
-
-        # Query to get the campaign by onchain_campaign_id
-        campaign = db.query(Campaign).filter(Campaign.onchain_campaign_id == onchain_campaign_id).first()
-        if not campaign:
-            raise HTTPException(status_code=404, detail="Campaign not found for the given onchain_campaign_id")
-
-        # Get the campaign ID
-        campaign_id = campaign.id
-
-        # Query to fetch activities within the time range for the specific campaign
-        activity_data = (
-            db.query(func.avg(Activity.activity_level).label("avg_activity"))
-            .filter(
-                Activity.timestamp >= start_time,
-                Activity.timestamp < end_time,  # Ensure it's strictly within the time range
-                Activity.campaign_id == campaign_id  # Filter by campaign ID
-            )
-            .scalar()
-        )
 
-        # Store the activity level for the specific campaign and timeframe
-        if activity_data is not None:
-            if campaign_id not in peak_activity_by_campaign:
-                peak_activity_by_campaign[campaign_id] = {}
+@router.get("/analytics/campaign/{onchain_campaign_id}/peak-activity")
+@conditional_response("campaign_peak_activity", tags=lambda onchain_campaign_id, **_: [campaign_cache_tag(onchain_campaign_id)])
+@cached_response("campaign_peak_activity", tags=lambda onchain_campaign_id, **_: [campaign_cache_tag(onchain_campaign_id)])
+async def get_campaign_peak_activity(
+    onchain_campaign_id: str,
+    bucket: ActivityBucketEnum = ActivityBucketEnum.HOUR,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Returns a campaign's submissions and average activity level per 1h, 6h or 1d bucket over [from, to)
+    (default: the trailing 7 days, UTC), the peak bucket, and a 7x24 heatmap of submissions by
+    weekday (0 = Monday) and hour of day over the same range.
+    Answered with a single query over the activity_hourly rollup.
+    """
+    end = to_utc_naive(end) if end else datetime.utcnow()
+    start = to_utc_naive(start) if start else end - timedelta(days=7)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="'from' must be before 'to'")
+    if end - start > timedelta(days=MAX_PEAK_ACTIVITY_RANGE_DAYS):
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_PEAK_ACTIVITY_RANGE_DAYS} days")
+
+    peak_activity = await get_peak_activity(db, onchain_campaign_id, bucket, start, end)
+    if peak_activity is None:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return {
+        "campaign_id": onchain_campaign_id,
+        "bucket": bucket,
+        "from": truncate_to_bucket(start, ACTIVITY_BUCKET_HOURS[bucket]),
+        "to": end,
+        "buckets": peak_activity["buckets"],
+        "peak_bucket": peak_activity["peak_bucket"],
+        "heatmap": peak_activity["heatmap"],
+    }
 
-            peak_activity_by_campaign[campaign_id][f"{start_time.strftime('%H:%M')} - {end_time.strftime('%H:%M')}"] = activity_data
-        else:
-            # If no activity data is found for this timeframe, set it to 0
-            if campaign_id not in peak_activity_by_campaign:
-                peak_activity_by_campaign[campaign_id] = {}
 
-            peak_activity_by_campaign[campaign_id][f"{start_time.strftime('%H:%M')} - {end_time.strftime('%H:%M')}"] = 0
+@router.post("/calculate-peak-activity")
+async def calculate_peak_activity_hours(onchain_campaign_id: str, db: AsyncSession = Depends(get_async_session)):
+    """
+    Average activity level of the campaign in each 6-hour window of the current day (UTC), keyed by
+    campaign id and window label. Served from the activity_hourly rollup in one query.
+    """
+    today_start = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    peak_activity = await get_peak_activity(
+        db, onchain_campaign_id, ActivityBucketEnum.SIX_HOURS, today_start, today_start + timedelta(days=1)
+    )
+    if peak_activity is None:
+        raise HTTPException(status_code=404, detail="Campaign not found for the given onchain_campaign_id")
 
-    return peak_activity_by_campaign
+    return {
+        peak_activity["campaign_id"]: {
+            f"{b['start'].strftime('%H:%M')} - {(b['start'] + timedelta(hours=6)).strftime('%H:%M')}": b["average_activity_level"]
+            for b in peak_activity["buckets"]
+        }
+    }
 
 
 @router.get("/analytics/campaign/{onchain_campaign_id}/activity")
-def get_campaign_activity(onchain_campaign_id: str, db: Session = Depends(get_session)):
+@conditional_response("campaign_activity", tags=lambda onchain_campaign_id, **_: [campaign_cache_tag(onchain_campaign_id)])
+@cached_response("campaign_activity", tags=lambda onchain_campaign_id, **_: [campaign_cache_tag(onchain_campaign_id)])
+async def get_campaign_activity(onchain_campaign_id: str, db: AsyncSession = Depends(get_async_session)):
     """
-    Returns the overall activity level for the given campaign identified by onchain_campaign_id.
+    Returns the overall activity level for the given campaign identified by onchain_campaign_id,
+    plus recent_activity_level, the same average with older activity exponentially decayed
+    (half-life ACTIVITY_HALF_LIFE_HOURS). Both are read from counters maintained on submit.
     """
-    campaign = db.query(Campaign).filter(Campaign.onchain_campaign_id == onchain_campaign_id).first()
+    campaign = await db.scalar(select(Campaign).where(Campaign.onchain_campaign_id == onchain_campaign_id))
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
@@ -653,22 +1022,26 @@ def get_campaign_activity(onchain_campaign_id: str, db: Session = Depends(get_se
     if campaign.current_activity_level is None:
         raise HTTPException(status_code=404, detail="No activity recorded for this campaign yet")
 
-    return {"campaign_id": campaign.id, "overall_activity_level": campaign.current_activity_level}
+    return {
+        "campaign_id": campaign.id,
+        "overall_activity_level": campaign.current_activity_level,
+        "recent_activity_level": recent_activity_level(campaign),
+    }
 
 
 
 @router.get("/analytics/contribution/{contribution_id}/activity")
-def get_contribution_activity(contribution_id: str, db: Session = Depends(get_session)):
+async def get_contribution_activity(contribution_id: str, db: AsyncSession = Depends(get_async_session)):
     """
     Returns the activity level of a specific contribution identified by its contribution_id.
     """
     # Retrieve the contribution by its contribution_id
-    contribution = db.query(Contribution).filter(Contribution.contribution_id == contribution_id).first()
+    contribution = await db.scalar(select(Contribution).where(Contribution.contribution_id == contribution_id))
     if not contribution:
         raise HTTPException(status_code=404, detail="Contribution not found")
     
     # Retrieve the associated activity record using the contribution_id
-    activity = db.query(Activity).filter(Activity.contribution_id == contribution.contribution_id).first()
+    activity = await db.scalar(select(Activity).where(Activity.contribution_id == contribution.contribution_id).limit(1))
     
     if not activity:
         raise HTTPException(status_code=404, detail="Activity for this contribution not found")
@@ -682,7 +1055,12 @@ def get_contribution_activity(contribution_id: str, db: Session = Depends(get_se
 
 
 @router.get("/analytics/contributor/{wallet_address}")
-def get_contributor_analytics(wallet_address: str, db: Session = Depends(get_session)):
+@cached_response("contributor_analytics", tags=lambda wallet_address, **_: [wallet_cache_tag(wallet_address)])
+async def get_contributor_analytics(
+    wallet_address: str,
+    breakdown: Optional[ContributorBreakdownEnum] = None,
+    db: AsyncSession = Depends(get_async_session)
+):
     """
     Returns analytics for a given contributor (by wallet address), including:
       - average quality score category across campaigns (calculated from the average raw quality score)
@@ -690,33 +1068,23 @@ def get_contributor_analytics(wallet_address: str, db: Session = Depends(get_ses
       - unique contributions (distinct campaign IDs contributed to)
       - total contributions (count of all contributions)
       - average reputation score across contributions
+    With breakdown=campaign or breakdown=month, the same analytics are also returned per campaign
+    or per month. Everything is computed by one aggregate statement (see select_contributor_analytics).
     """
-    # Query all contributions for this contributor
-    contributions = db.query(Contribution).filter(Contribution.contributor == wallet_address).all()
-    
-    if not contributions:
+    rows = (await db.execute(select_contributor_analytics(wallet_address, breakdown))).all()
+    total = next(row for row in rows if breakdown is None or row.is_total)
+    if not total.total_contributions:
         raise HTTPException(status_code=404, detail="No contributions found for this contributor")
-    
-    total_contributions = len(contributions)
-    unique_contributions = len({c.campaign_id for c in contributions})
-    
-    # Average quality score
-    quality_scores = [c.quality_score for c in contributions if c.quality_score is not None]
-    average_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
-    overall_quality_category = get_quality_score_category(average_quality) if quality_scores else "No Data"
-    
-    # Average AI verification score
-    ai_scores = [c.ai_verification_score for c in contributions if c.ai_verification_score is not None]
-    average_ai = sum(ai_scores) / len(ai_scores) if ai_scores else 0
 
-    # Average reputation score
-    rep_scores = [c.reputation_score for c in contributions if c.reputation_score is not None]
-    average_reputation = sum(rep_scores) / len(rep_scores) if rep_scores else 0
-
-    return {
-        "average_quality_category": overall_quality_category,
-        "average_ai_verification_score": average_ai,
-        "unique_contributions": unique_contributions,
-        "total_contributions": total_contributions,
-        "average_reputation_score": average_reputation
-    }
\ No newline at end of file
+    analytics = contributor_analytics_from_row(total)
+    if breakdown == ContributorBreakdownEnum.CAMPAIGN:
+        analytics["breakdown"] = [
+            {"onchain_campaign_id": row.period, **contributor_analytics_from_row(row)}
+            for row in rows if not row.is_total
+        ]
+    elif breakdown == ContributorBreakdownEnum.MONTH:
+        analytics["breakdown"] = [
+            {"month": row.period.strftime("%Y-%m"), **contributor_analytics_from_row(row)}
+            for row in rows if not row.is_total
+        ]
+    return analytics
\ No newline at end of file
@@ -1,7 +1,14 @@
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict
 from datetime import datetime
 
+from app.core.enums.contribution_batch_status import ContributionBatchStatusEnum
+from app.core.enums.premium_filters import PremiumPromptFilterType
+from app.core.enums.tags import PromptTagEnum
+
+MAX_CONTRIBUTION_BATCH_SIZE = 500
+MAX_ANALYTICS_BATCH_SIZE = 100
+
 class CampaignCreate(BaseModel):
     onchain_campaign_id: str
     title: str
@@ -18,6 +25,7 @@ class CampaignCreate(BaseModel):
     metadata_uri: str
     transaction_hash: str
     platform_fee: float
+    tags: List[PromptTagEnum] = []
 
 class CampaignResponse(CampaignCreate):
     campaign_id: str
@@ -26,6 +34,40 @@ class CampaignResponse(CampaignCreate):
     unique_contributions_count: int
     created_at: datetime
 
+class CampaignSearchResult(CampaignResponse):
+    rank: float
+
+class CampaignSearchPageResponse(BaseModel):
+    campaigns: List[CampaignSearchResult]
+    limit: int
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+class CampaignFeedItem(CampaignResponse):
+    is_premium: bool
+    score: Optional[float] = None
+
+class CampaignFeedPageResponse(BaseModel):
+    sort: PremiumPromptFilterType
+    campaigns: List[CampaignFeedItem]
+    limit: int
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+class CampaignBrowseFacets(BaseModel):
+    tags: Dict[str, int]
+    campaign_type: Dict[str, int]
+    is_premium: Dict[str, int]
+    is_active: Dict[str, int]
+
+class CampaignBrowsePageResponse(BaseModel):
+    campaigns: List[CampaignResponse]
+    total: int
+    facets: CampaignBrowseFacets
+    limit: int
+    next_cursor: Optional[str] = None
+    has_more: bool
+
 class ContributionCreate(BaseModel):
     onchain_contribution_id: str
     campaign_id: str
@@ -51,6 +93,22 @@ class ContributionResponse(BaseModel):
     created_at: datetime
     quality_score: str
 
+class ContributionBatchCreate(BaseModel):
+    contributions: List[ContributionCreate] = Field(..., min_length=1, max_length=MAX_CONTRIBUTION_BATCH_SIZE)
+
+
+class ContributionBatchItemResult(BaseModel):
+    index: int
+    status: ContributionBatchStatusEnum
+    contribution: Optional[ContributionResponse] = None
+    detail: Optional[str] = None
+
+
+class ContributionBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[ContributionBatchItemResult]
+
 class CampaignsActiveResponse(BaseModel):
     campaign_id: str
     onchain_campaign_id: str
@@ -65,18 +123,45 @@ class CampaignsActiveResponse(BaseModel):
     description: str
     is_active: bool
     expiration: int
+    created_at: datetime
+
+class CampaignsPageResponse(BaseModel):
+    campaigns: List[CampaignResponse]
+    limit: int
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+
+class ActiveCampaignsPageResponse(BaseModel):
+    campaigns: List[CampaignsActiveResponse]
+    limit: int
+    next_cursor: Optional[str] = None
+    has_more: bool
+
 
 class ContributionsListResponse(BaseModel):
     contributions: List[ContributionResponse]
     unique_contributions_count: int
+    limit: int
+    next_cursor: Optional[str] = None
+    has_more: bool
 
 
 class WalletCampaignsResponse(BaseModel):
     created: List[CampaignResponse]
     contributed: List[CampaignResponse]
+    limit: int
+    next_created_cursor: Optional[str] = None
+    next_contributed_cursor: Optional[str] = None
 
 
 class WeeklyAnalyticsResponse(BaseModel):
     date: str
     submissions: int
-    avg_quality_score: float
\ No newline at end of file
+    avg_quality_score: float
+    avg_ai_verification_score: float
+    unique_contributors: int
+
+
+class CampaignAnalyticsBatchRequest(BaseModel):
+    onchain_campaign_ids: List[str] = Field(..., min_length=1, max_length=MAX_ANALYTICS_BATCH_SIZE)
@@ -1,8 +1,24 @@
-from datetime import datetime
+import csv
+import io
+import math
+import uuid
+from collections import Counter
+import orjson
+from datetime import date, datetime, timedelta, timezone
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
-from typing import List, Optional
-from app.campaigns.models import Campaign, Contribution, Activity
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import ColumnElement, Row, Select, Date, DateTime, Float, Integer, String, bindparam, cast, func, literal, literal_column, select, insert, update, delete, or_, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, insert as pg_insert
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from app.campaigns.models import Campaign, Contribution, Activity, ActivityHourly, CampaignStats, CampaignContributor, CampaignDailyStats, CampaignDailyContributor, WalletStats, CampaignTag
+from app.campaigns.schemas import ContributionCreate
+from app.core.database import AsyncSessionLocal
+from app.core.enums.activity_buckets import ActivityBucketEnum
+from app.core.enums.analytics_windows import AnalyticsGranularityEnum, ContributorBreakdownEnum
+from app.core.enums.export_formats import ExportFormatEnum
+from app.core.enums.premium_filters import PremiumPromptFilterType
+from app.core.enums.tags import PromptTagEnum
+from app.core.responses import orjson_dumps
 
 
 
@@ -30,77 +46,1101 @@ def serialize_campaign(campaign: Campaign, contributions_count: int) -> dict:
     }
 
 
-def track_campaign_activity_overall(campaign_id: str, db: Session, contribution: Contribution):
+def select_campaigns_with_counts(*campaign_filters) -> Select:
     """
-    Track overall activity for the given campaign when a new contribution is made.
-    Activity level is determined based on contribution data and updates the campaign's aggregated activity level.
+    Build a statement returning (Campaign, current_contributions, unique_contributions_count) rows.
+    The counts are read from the precomputed campaign_stats row, so no Contribution rows are touched.
     """
-    activity_level = calculate_activity_level(contribution)
+    statement = (
+        select(
+            Campaign,
+            func.coalesce(CampaignStats.contributions_count, 0).label("current_contributions"),
+            func.coalesce(CampaignStats.unique_contributors, 0).label("unique_contributions_count"),
+        )
+        .outerjoin(CampaignStats, CampaignStats.campaign_id == Campaign.id)
+    )
+    if campaign_filters:
+        statement = statement.where(*campaign_filters)
+    return statement
+
+
+def serialize_campaign_row(row) -> dict:
+    """
+    Serialize a row produced by select_campaigns_with_counts.
+    """
+    campaign, contributions_count, unique_count = row
+    serialized = serialize_campaign(campaign, contributions_count)
+    serialized["unique_contributions_count"] = unique_count
+    return serialized
+
+
+# Column sets for the fast list path: each selects exactly the fields of a response model,
+# in the model's field order, so rows can be encoded without building ORM objects or Pydantic models.
+_current_contributions = func.coalesce(CampaignStats.contributions_count, 0).label("current_contributions")
+_unique_contributions_count = func.coalesce(CampaignStats.unique_contributors, 0).label("unique_contributions_count")
+
+# A campaign's tags, alphabetically, read from the campaign_tags primary key
+CAMPAIGN_TAGS = (
+    select(func.coalesce(
+        func.array_agg(aggregate_order_by(CampaignTag.tag, CampaignTag.tag)),
+        literal_column("'{}'::varchar[]"),
+        type_=ARRAY(String),
+    ))
+    .where(CampaignTag.campaign_id == Campaign.id)
+    .scalar_subquery()
+    .label("tags")
+)
+
+CAMPAIGN_RESPONSE_COLUMNS = (
+    Campaign.onchain_campaign_id,
+    Campaign.title,
+    Campaign.description,
+    Campaign.data_requirements,
+    func.coalesce(Campaign.creator_wallet_address, "").label("creator_wallet_address"),
+    Campaign.quality_criteria,
+    Campaign.unit_price,
+    Campaign.campaign_type,
+    Campaign.total_budget,
+    Campaign.min_data_count,
+    Campaign.max_data_count,
+    Campaign.expiration,
+    Campaign.metadata_uri,
+    Campaign.transaction_hash,
+    Campaign.platform_fee,
+    CAMPAIGN_TAGS,
+    Campaign.id.label("campaign_id"),
+    Campaign.is_active,
+    _current_contributions,
+    _unique_contributions_count,
+    Campaign.created_at,
+)
+
+ACTIVE_CAMPAIGN_RESPONSE_COLUMNS = (
+    Campaign.id.label("campaign_id"),
+    Campaign.onchain_campaign_id,
+    func.coalesce(Campaign.creator_wallet_address, "").label("creator_wallet_address"),
+    Campaign.campaign_type,
+    Campaign.unit_price,
+    Campaign.total_budget,
+    Campaign.max_data_count,
+    _current_contributions,
+    _unique_contributions_count,
+    Campaign.title,
+    Campaign.description,
+    Campaign.is_active,
+    Campaign.expiration,
+    Campaign.created_at,
+)
+
+CONTRIBUTION_RESPONSE_COLUMNS = (
+    Contribution.contribution_id,
+    func.coalesce(Contribution.onchain_contribution_id, "").label("onchain_contribution_id"),
+    Contribution.campaign_id,
+    Contribution.contributor,
+    Contribution.data_url,
+    Contribution.transaction_hash,
+    Contribution.ai_verification_score,
+    Contribution.reputation_score,
+    Contribution.is_verified,
+    Contribution.reward_claimed,
+    Contribution.created_at,
+    Contribution.quality_tier.label("quality_score"),
+)
+
+
+def select_campaign_rows(columns, *campaign_filters) -> Select:
+    """
+    Like select_campaigns_with_counts, but selecting plain columns (e.g. CAMPAIGN_RESPONSE_COLUMNS)
+    so each row can go straight to the response encoder.
+    """
+    statement = (
+        select(*columns)
+        .select_from(Campaign)
+        .outerjoin(CampaignStats, CampaignStats.campaign_id == Campaign.id)
+    )
+    if campaign_filters:
+        statement = statement.where(*campaign_filters)
+    return statement
+
+
+# Text search configuration of Campaign.search_vector; queries must use the same one
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+
+def select_campaign_search(columns, query: str, *campaign_filters) -> Tuple[Select, ColumnElement]:
+    """
+    select_campaign_rows over the campaigns matching a web-search style query (quoted phrases,
+    OR, -exclusions) against Campaign.search_vector, a GIN-indexed match, with a "rank" column.
+    Returns the statement and the rank expression to order and page by.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    rank = func.ts_rank(Campaign.search_vector, tsquery)
+    statement = select_campaign_rows(
+        (*columns, rank.label("rank")),
+        Campaign.search_vector.op("@@")(tsquery),
+        *campaign_filters,
+    )
+    return statement, rank
+
+
+CAMPAIGNS_CACHE_TAG = "campaigns"
+LEADERBOARDS_CACHE_TAG = "leaderboards"
+
+
+def campaign_cache_tag(onchain_campaign_id: str) -> str:
+    return f"campaign:{onchain_campaign_id}"
+
+
+def wallet_cache_tag(wallet_address: str) -> str:
+    return f"wallet:{wallet_address}"
+
+
+STATS_COUNTER_COLUMNS = (
+    "contributions_count",
+    "unique_contributors",
+    "quality_score_sum",
+    "quality_score_count",
+    "ai_verification_score_sum",
+    "ai_verification_score_count",
+    "reputation_score_sum",
+    "reputation_score_count",
+    "rewards_claimed_count",
+)
+
+
+async def init_campaign_stats(db: AsyncSession, campaign_id: str):
+    """
+    Insert the zeroed campaign_stats row for a newly created campaign.
+    Does not commit; runs in the caller's transaction.
+    """
+    await db.execute(
+        pg_insert(CampaignStats)
+        .values(campaign_id=campaign_id, updated_at=datetime.utcnow())
+        .on_conflict_do_nothing(index_elements=[CampaignStats.campaign_id])
+    )
+
+
+def _stats_increments(contribution: Contribution) -> dict:
+    return {
+        "contributions_count": 1,
+        "unique_contributors": 0,
+        "quality_score_sum": contribution.quality_score or 0,
+        "quality_score_count": int(contribution.quality_score is not None),
+        "ai_verification_score_sum": contribution.ai_verification_score or 0,
+        "ai_verification_score_count": int(contribution.ai_verification_score is not None),
+        "reputation_score_sum": contribution.reputation_score or 0,
+        "reputation_score_count": int(contribution.reputation_score is not None),
+        "rewards_claimed_count": int(bool(contribution.reward_claimed)),
+    }
+
+
+async def record_contributions_stats(db: AsyncSession, contributions: List[Contribution]):
+    """
+    Fold new contributions, possibly spanning several campaigns, into campaign_stats and
+    campaign_contributors with one statement each: contributor pairs are inserted only if
+    absent, and each campaign's counters and running sums are incremented in place once.
+    The contributors' wallet_stats are incremented the same way, counting each newly inserted
+    pair as a newly contributed campaign. Rows are written in campaign order so concurrent batches lock them in the same order.
+    Does not commit; must run in the same transaction as the contribution inserts.
+    """
+    if not contributions:
+        return
+    now = datetime.utcnow()
+
+    first_seen = {}
+    for contribution in contributions:
+        if contribution.contributor is None:
+            continue
+        pair = (contribution.campaign_id, contribution.contributor)
+        contributed_at = contribution.created_at or now
+        if pair not in first_seen or contributed_at < first_seen[pair]:
+            first_seen[pair] = contributed_at
+
+    new_contributors = Counter()
+    new_wallet_campaigns = Counter()
+    if first_seen:
+        inserted = await db.execute(
+            pg_insert(CampaignContributor)
+            .values([
+                {"campaign_id": campaign_id, "contributor": contributor, "first_contributed_at": first_contributed_at}
+                for (campaign_id, contributor), first_contributed_at in sorted(first_seen.items())
+            ])
+            .on_conflict_do_nothing(index_elements=[CampaignContributor.campaign_id, CampaignContributor.contributor])
+            .returning(CampaignContributor.campaign_id, CampaignContributor.contributor)
+        )
+        new_pairs = inserted.all()
+        new_contributors.update(row.campaign_id for row in new_pairs)
+        new_wallet_campaigns.update(row.contributor for row in new_pairs)
+
+    increments = {}
+    for contribution in contributions:
+        totals = increments.setdefault(contribution.campaign_id, dict.fromkeys(STATS_COUNTER_COLUMNS, 0))
+        for column, value in _stats_increments(contribution).items():
+            totals[column] += value
+    for campaign_id, count in new_contributors.items():
+        increments[campaign_id]["unique_contributors"] = count
+
+    stmt = pg_insert(CampaignStats).values([
+        {"campaign_id": campaign_id, "updated_at": now, **increments[campaign_id]}
+        for campaign_id in sorted(increments)
+    ])
+    stats_table = CampaignStats.__table__
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CampaignStats.campaign_id],
+            set_={
+                **{column: stats_table.c[column] + stmt.excluded[column] for column in STATS_COUNTER_COLUMNS},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+    wallet_increments = {}
+    for contribution in contributions:
+        if contribution.contributor is None:
+            continue
+        totals = wallet_increments.setdefault(contribution.contributor, dict.fromkeys(WALLET_STATS_COUNTER_COLUMNS, 0))
+        totals["submissions_count"] += 1
+        totals["reputation_score_sum"] += contribution.reputation_score or 0
+        totals["ai_verification_score_sum"] += contribution.ai_verification_score or 0
+        totals["ai_verification_score_count"] += int(contribution.ai_verification_score is not None)
+    for contributor, count in new_wallet_campaigns.items():
+        wallet_increments[contributor]["campaigns_contributed_count"] = count
+    await record_wallet_stats(db, wallet_increments)
+
+
+WALLET_STATS_COUNTER_COLUMNS = (
+    "submissions_count",
+    "reputation_score_sum",
+    "ai_verification_score_sum",
+    "ai_verification_score_count",
+    "campaigns_contributed_count",
+    "campaigns_created_count",
+)
+
+
+async def record_wallet_stats(db: AsyncSession, increments: Dict[str, dict]):
+    """
+    Increment the wallet_stats counters of each wallet in place with one upsert, creating missing
+    rows. Rows are written in wallet order so concurrent transactions lock them in the same order.
+    Does not commit; runs in the caller's transaction.
+    """
+    if not increments:
+        return
+    now = datetime.utcnow()
+    stmt = pg_insert(WalletStats).values([
+        {
+            "wallet_address": wallet_address,
+            "updated_at": now,
+            **{column: increments[wallet_address].get(column, 0) for column in WALLET_STATS_COUNTER_COLUMNS},
+        }
+        for wallet_address in sorted(increments)
+    ])
+    wallet_table = WalletStats.__table__
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[WalletStats.wallet_address],
+            set_={
+                **{column: wallet_table.c[column] + stmt.excluded[column] for column in WALLET_STATS_COUNTER_COLUMNS},
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+
+async def record_campaign_created(db: AsyncSession, creator_wallet_address: Optional[str]):
+    """
+    Count a newly created campaign in its creator's wallet_stats. Does not commit.
+    """
+    if creator_wallet_address:
+        await record_wallet_stats(db, {creator_wallet_address: {"campaigns_created_count": 1}})
+
+
+async def record_campaign_tags(db: AsyncSession, campaign_id: str, tags: List[PromptTagEnum]) -> List[str]:
+    """
+    Store the tags of a newly created campaign, ignoring repeats. Does not commit.
+    Returns the stored tag values in the order CAMPAIGN_TAGS reads them back.
+    """
+    values = sorted({tag.value for tag in tags})
+    if values:
+        await db.execute(insert(CampaignTag), [{"campaign_id": campaign_id, "tag": value} for value in values])
+    return values
+
+
+def wallet_stats_summary(stats: Optional[WalletStats]) -> dict:
+    """
+    Averages and counts of a wallet_stats row; a wallet without one has no activity yet.
+    Average reputation is over all submissions, as it has always been reported.
+    """
+    if stats is None:
+        return {
+            "average_reputation": 0,
+            "average_ai_verification_score": 0,
+            "total_submissions": 0,
+            "campaigns_contributed_count": 0,
+            "campaigns_created_count": 0,
+        }
+    return {
+        "average_reputation": average_from_sum(stats.reputation_score_sum, stats.submissions_count),
+        "average_ai_verification_score": average_from_sum(
+            stats.ai_verification_score_sum, stats.ai_verification_score_count
+        ),
+        "total_submissions": stats.submissions_count,
+        "campaigns_contributed_count": stats.campaigns_contributed_count,
+        "campaigns_created_count": stats.campaigns_created_count,
+    }
+
+
+def contributed_by_wallet(wallet_address: str):
+    """
+    Campaign filter matching the campaigns a wallet has contributed to, resolved through
+    campaign_contributors so no contribution rows are read.
+    """
+    return Campaign.id.in_(
+        select(CampaignContributor.campaign_id).where(CampaignContributor.contributor == wallet_address)
+    )
+
+
+DAILY_STATS_COUNTER_COLUMNS = ("submissions", "quality_sum", "quality_count", "ai_sum", "ai_count", "unique_contributors")
+
+
+async def record_daily_stats(db: AsyncSession, contributions: List[Contribution]):
+    """
+    Fold new contributions into campaign_daily_contributors and campaign_daily_stats, keyed by
+    campaign and UTC day of created_at, the same way record_contributions_stats maintains
+    campaign_contributors and campaign_stats. Does not commit.
+    """
+    if not contributions:
+        return
+
+    pairs = {
+        (contribution.campaign_id, contribution.created_at.date(), contribution.contributor)
+        for contribution in contributions
+        if contribution.contributor is not None
+    }
+    new_contributors = Counter()
+    if pairs:
+        inserted = await db.execute(
+            pg_insert(CampaignDailyContributor)
+            .values([
+                {"campaign_id": campaign_id, "day": day, "contributor": contributor}
+                for campaign_id, day, contributor in sorted(pairs)
+            ])
+            .on_conflict_do_nothing(index_elements=[
+                CampaignDailyContributor.campaign_id, CampaignDailyContributor.day, CampaignDailyContributor.contributor
+            ])
+            .returning(CampaignDailyContributor.campaign_id, CampaignDailyContributor.day)
+        )
+        new_contributors.update((row.campaign_id, row.day) for row in inserted)
+
+    increments = {}
+    for contribution in contributions:
+        totals = increments.setdefault(
+            (contribution.campaign_id, contribution.created_at.date()), dict.fromkeys(DAILY_STATS_COUNTER_COLUMNS, 0)
+        )
+        totals["submissions"] += 1
+        totals["quality_sum"] += contribution.quality_score or 0
+        totals["quality_count"] += int(contribution.quality_score is not None)
+        totals["ai_sum"] += contribution.ai_verification_score or 0
+        totals["ai_count"] += int(contribution.ai_verification_score is not None)
+    for key, count in new_contributors.items():
+        increments[key]["unique_contributors"] = count
+
+    stmt = pg_insert(CampaignDailyStats).values([
+        {"campaign_id": campaign_id, "day": day, **increments[(campaign_id, day)]}
+        for campaign_id, day in sorted(increments)
+    ])
+    daily_table = CampaignDailyStats.__table__
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CampaignDailyStats.campaign_id, CampaignDailyStats.day],
+            set_={column: daily_table.c[column] + stmt.excluded[column] for column in DAILY_STATS_COUNTER_COLUMNS},
+        )
+    )
+
+
+MAX_ANALYTICS_PERIODS = 366
+
+
+def align_to_period(day: date, granularity: AnalyticsGranularityEnum) -> date:
+    """
+    First day of the period containing day: itself, its ISO week's Monday, or the 1st of its month.
+    """
+    if granularity == AnalyticsGranularityEnum.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == AnalyticsGranularityEnum.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def count_periods(start: date, end: date, granularity: AnalyticsGranularityEnum) -> int:
+    if granularity == AnalyticsGranularityEnum.WEEK:
+        return (end - start).days // 7 + 1
+    if granularity == AnalyticsGranularityEnum.MONTH:
+        return (end.year - start.year) * 12 + end.month - start.month + 1
+    return (end - start).days + 1
+
+
+def select_campaign_period_stats(
+    campaign_id: str, granularity: AnalyticsGranularityEnum, start: date, end: date
+) -> Select:
+    """
+    One statement over campaign_daily_stats returning one row per day, week or month from start
+    (aligned to the period) through end, with periods without contributions filled in by
+    generate_series. Unique contributors of weeks and months are distinct counts over
+    campaign_daily_contributors, since daily counts cannot be summed.
+    """
+    # The granularity is inlined (it comes from the enum) so the period expression is identical
+    # in the select list and GROUP BY
+    unit = literal_column(f"'{granularity.value}'")
+    periods = select(
+        cast(
+            func.generate_series(
+                cast(start, DateTime), cast(end, DateTime), literal_column(f"interval '1 {granularity.value}'")
+            ),
+            Date,
+        ).label("period")
+    ).subquery()
+
+    daily_period = cast(func.date_trunc(unit, cast(CampaignDailyStats.day, DateTime)), Date)
+    daily = (
+        select(
+            daily_period.label("period"),
+            func.sum(CampaignDailyStats.submissions).label("submissions"),
+            func.sum(CampaignDailyStats.quality_sum).label("quality_sum"),
+            func.sum(CampaignDailyStats.quality_count).label("quality_count"),
+            func.sum(CampaignDailyStats.ai_sum).label("ai_sum"),
+            func.sum(CampaignDailyStats.ai_count).label("ai_count"),
+            func.sum(CampaignDailyStats.unique_contributors).label("unique_contributors"),
+        )
+        .where(
+            CampaignDailyStats.campaign_id == campaign_id,
+            CampaignDailyStats.day >= start,
+            CampaignDailyStats.day <= end,
+        )
+        .group_by(daily_period)
+        .subquery()
+    )
+    unique_contributors = daily.c.unique_contributors
+
+    statement = select(
+        periods.c.period,
+        func.coalesce(daily.c.submissions, 0).label("submissions"),
+        func.coalesce(daily.c.quality_sum / func.nullif(daily.c.quality_count, 0), 0).label("avg_quality_score"),
+        func.coalesce(daily.c.ai_sum / func.nullif(daily.c.ai_count, 0), 0).label("avg_ai_verification_score"),
+    ).select_from(periods).outerjoin(daily, daily.c.period == periods.c.period)
+
+    if granularity != AnalyticsGranularityEnum.DAY:
+        contributor_period = cast(func.date_trunc(unit, cast(CampaignDailyContributor.day, DateTime)), Date)
+        contributors = (
+            select(
+                contributor_period.label("period"),
+                func.count(func.distinct(CampaignDailyContributor.contributor)).label("unique_contributors"),
+            )
+            .where(
+                CampaignDailyContributor.campaign_id == campaign_id,
+                CampaignDailyContributor.day >= start,
+                CampaignDailyContributor.day <= end,
+            )
+            .group_by(contributor_period)
+            .subquery()
+        )
+        statement = statement.outerjoin(contributors, contributors.c.period == periods.c.period)
+        unique_contributors = contributors.c.unique_contributors
+
+    return statement.add_columns(
+        func.coalesce(unique_contributors, 0).label("unique_contributors")
+    ).order_by(periods.c.period)
+
+
+async def get_campaign_stats(db: AsyncSession, campaign_id: str) -> CampaignStats:
+    """
+    Return the campaign_stats row, or a zeroed transient one if the campaign has none yet.
+    """
+    stats = await db.get(CampaignStats, campaign_id)
+    if stats is None:
+        stats = CampaignStats(campaign_id=campaign_id, **{column: 0 for column in STATS_COUNTER_COLUMNS})
+    return stats
+
+
+def average_from_sum(total: float, count: int) -> float:
+    return total / count if count else 0
+
 
-    # Create a new Activity entry for the campaign
-    new_activity = Activity(
-        campaign_id=campaign_id,
-        timestamp=datetime.utcnow(),
-        activity_level=activity_level
+def campaign_stats_aggregate(*campaign_filters):
+    """
+    Recompute campaign_stats values from the raw contributions table, one row per campaign.
+    """
+    return (
+        select(
+            Campaign.id.label("campaign_id"),
+            func.count(Contribution.contribution_id).label("contributions_count"),
+            func.count(func.distinct(Contribution.contributor)).label("unique_contributors"),
+            func.coalesce(func.sum(Contribution.quality_score), 0).label("quality_score_sum"),
+            func.count(Contribution.quality_score).label("quality_score_count"),
+            func.coalesce(func.sum(Contribution.ai_verification_score), 0).label("ai_verification_score_sum"),
+            func.count(Contribution.ai_verification_score).label("ai_verification_score_count"),
+            func.coalesce(func.sum(Contribution.reputation_score), 0).label("reputation_score_sum"),
+            func.count(Contribution.reputation_score).label("reputation_score_count"),
+            func.count(Contribution.contribution_id).filter(Contribution.reward_claimed == True).label("rewards_claimed_count"),
+        )
+        .select_from(Campaign)
+        .outerjoin(Contribution, Contribution.campaign_id == Campaign.id)
+        .where(*campaign_filters)
+        .group_by(Campaign.id)
+    )
+
+
+def find_campaign_stats_drift(db: Session) -> List[str]:
+    """
+    Consistency check: return the ids of campaigns whose campaign_stats row is missing
+    or disagrees with the raw contributions table.
+    """
+    expected = campaign_stats_aggregate().subquery()
+    mismatches = [
+        func.coalesce(getattr(CampaignStats, column), -1) != getattr(expected.c, column)
+        for column in STATS_COUNTER_COLUMNS
+        if not column.endswith("_sum")
+    ] + [
+        func.abs(func.coalesce(getattr(CampaignStats, column), 0) - getattr(expected.c, column)) > 1e-6
+        for column in STATS_COUNTER_COLUMNS
+        if column.endswith("_sum")
+    ]
+    rows = db.execute(
+        select(expected.c.campaign_id)
+        .outerjoin(CampaignStats, CampaignStats.campaign_id == expected.c.campaign_id)
+        .where(or_(*mismatches))
+    ).all()
+    return [row.campaign_id for row in rows]
+
+
+def rebuild_campaign_stats(db: Session, campaign_ids: Optional[List[str]] = None):
+    """
+    Rebuild campaign_contributors and campaign_stats from the raw contributions table.
+    Rebuilds every campaign when campaign_ids is None. Does not commit.
+    """
+    contributor_filters = [Contribution.contributor.isnot(None)]
+    campaign_filters = []
+    if campaign_ids is not None:
+        contributor_filters.append(Contribution.campaign_id.in_(campaign_ids))
+        campaign_filters.append(Campaign.id.in_(campaign_ids))
+
+    pair_delete = delete(CampaignContributor)
+    if campaign_ids is not None:
+        pair_delete = pair_delete.where(CampaignContributor.campaign_id.in_(campaign_ids))
+    db.execute(pair_delete)
+    db.execute(
+        pg_insert(CampaignContributor).from_select(
+            ["campaign_id", "contributor", "first_contributed_at"],
+            select(
+                Contribution.campaign_id,
+                Contribution.contributor,
+                func.min(Contribution.created_at),
+            )
+            .where(*contributor_filters)
+            .group_by(Contribution.campaign_id, Contribution.contributor),
+        )
+    )
+
+    aggregate = campaign_stats_aggregate(*campaign_filters).add_columns(func.now().label("updated_at"))
+    stmt = pg_insert(CampaignStats).from_select(["campaign_id", *STATS_COUNTER_COLUMNS, "updated_at"], aggregate)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CampaignStats.campaign_id],
+            set_={column: stmt.excluded[column] for column in (*STATS_COUNTER_COLUMNS, "updated_at")},
+        )
     )
 
-    # Save the new activity to the database
-    db.add(new_activity)
-    db.commit()
-    db.refresh(new_activity)
 
-    # Update campaign's overall activity level
-    campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
-    if campaign:
-        # Calculate the average activity level for the campaign (optional)
-        total_activity = db.query(func.sum(Activity.activity_level)).filter(Activity.campaign_id == campaign_id).scalar() or 0
-        activity_count = db.query(func.count(Activity.id)).filter(Activity.campaign_id == campaign_id).scalar() or 1
-        avg_activity_level = total_activity / activity_count
-        campaign.current_activity_level = avg_activity_level
-        db.commit()  # Save the updated activity level for the campaign
+TOP_CONTRIBUTORS_LIMIT = 10
 
 
-# def track_contribution_activity(campaign_id: str, db: Session, contribution: Contribution):
-#     """
-#     Track activity for the given campaign at the individual contribution level.
-#     Activity level is determined based on contribution data, without affecting the overall campaign activity.
-#     """
-#     activity_level = calculate_activity_level(contribution)
+def select_campaign_analytics(onchain_campaign_ids: List[str]) -> Select:
+    """
+    One statement computing the campaign analytics of every given campaign:
+      - targets: the campaigns with their campaign_stats counters
+      - contributor_counts: submissions per contributor, ranked within each campaign
+      - hour_counts: submissions per hour of day, from the activity_hourly rollup
+    The top contributors are collected with array_agg ... FILTER (WHERE rank <= 10), so a
+    dashboard asking for many campaigns costs one round trip instead of several per campaign.
+    """
+    targets = (
+        select(
+            Campaign.id,
+            Campaign.onchain_campaign_id,
+            Campaign.total_budget,
+            func.coalesce(CampaignStats.contributions_count, 0).label("contributions_count"),
+            func.coalesce(CampaignStats.unique_contributors, 0).label("unique_contributors"),
+            func.coalesce(CampaignStats.rewards_claimed_count, 0).label("rewards_claimed_count"),
+        )
+        .outerjoin(CampaignStats, CampaignStats.campaign_id == Campaign.id)
+        .where(Campaign.onchain_campaign_id.in_(onchain_campaign_ids))
+        .cte("targets")
+    )
+    submissions = func.count(Contribution.contribution_id)
+    contributor_counts = (
+        select(
+            Contribution.campaign_id,
+            Contribution.contributor,
+            submissions.label("submissions"),
+            func.row_number().over(
+                partition_by=Contribution.campaign_id,
+                order_by=(submissions.desc(), Contribution.contributor),
+            ).label("rank"),
+        )
+        .where(Contribution.campaign_id.in_(select(targets.c.id)))
+        .group_by(Contribution.campaign_id, Contribution.contributor)
+        .cte("contributor_counts")
+    )
+    top_contributors = (
+        select(
+            contributor_counts.c.campaign_id,
+            func.array_agg(aggregate_order_by(contributor_counts.c.contributor, contributor_counts.c.rank))
+            .filter(contributor_counts.c.rank <= TOP_CONTRIBUTORS_LIMIT)
+            .label("top_contributors"),
+            func.array_agg(aggregate_order_by(contributor_counts.c.submissions, contributor_counts.c.rank))
+            .filter(contributor_counts.c.rank <= TOP_CONTRIBUTORS_LIMIT)
+            .label("top_submissions"),
+        )
+        .group_by(contributor_counts.c.campaign_id)
+        .cte("top_contributors")
+    )
+    hour_of_day = func.extract("hour", ActivityHourly.hour_bucket)
+    hour_counts = (
+        select(ActivityHourly.campaign_id, func.sum(ActivityHourly.count).label("submissions"))
+        .where(ActivityHourly.campaign_id.in_(select(targets.c.id)))
+        .group_by(ActivityHourly.campaign_id, hour_of_day)
+        .cte("hour_counts")
+    )
+    peaks = (
+        select(hour_counts.c.campaign_id, func.max(hour_counts.c.submissions).label("max_submissions"))
+        .group_by(hour_counts.c.campaign_id)
+        .cte("peaks")
+    )
+    return (
+        select(
+            targets.c.onchain_campaign_id,
+            targets.c.total_budget,
+            targets.c.contributions_count,
+            targets.c.unique_contributors,
+            targets.c.rewards_claimed_count,
+            top_contributors.c.top_contributors,
+            top_contributors.c.top_submissions,
+            func.coalesce(peaks.c.max_submissions, 0).label("max_submissions"),
+        )
+        .select_from(targets)
+        .outerjoin(top_contributors, top_contributors.c.campaign_id == targets.c.id)
+        .outerjoin(peaks, peaks.c.campaign_id == targets.c.id)
+    )
 
-#     # Create a new Activity entry for the campaign (individual contribution activity)
-#     new_activity = Activity(
-#         campaign_id=campaign_id,
-#         timestamp=datetime.utcnow(),
-#         activity_level=activity_level
-#     )
 
-#     # Save the new activity to the database
-#     db.add(new_activity)
-#     db.commit()
-#     db.refresh(new_activity)
+def campaign_analytics_from_row(row: Row) -> dict:
+    total_contribs = row.contributions_count
+    return {
+        "total_contributions": total_contribs,
+        "average_cost_per_submission": float(row.total_budget) / total_contribs if total_contribs > 0 else 0,
+        "peak_activity": {
+            "max_submissions": int(row.max_submissions)
+        },
+        "top_contributors": [
+            {"contributor": contributor, "submissions": submissions}
+            for contributor, submissions in zip(row.top_contributors or [], row.top_submissions or [])
+        ],
+        "unique_contributor_count": row.unique_contributors,
+        "total_rewards_paid": row.rewards_claimed_count,
+    }
 
 
-def track_contribution_activity(campaign_id: str, db: Session, contribution: Contribution):
+def select_contributor_analytics(
+    wallet_address: str, breakdown: Optional[ContributorBreakdownEnum] = None
+) -> Select:
     """
-    Track activity for the given campaign at the individual contribution level.
-    Activity level is determined based on contribution data, without affecting the overall campaign activity.
+    One aggregate statement over a contributor's contributions returning the submission count,
+    the distinct campaign count and the sum and count of each score (counts use FILTER on the
+    score being set), so averages are computed without loading any contribution rows.
+
+    Without a breakdown the distinct campaign count is read from campaign_contributors: a
+    COUNT(DISTINCT) would sort the input, and summing the float scores in a different order
+    can change the last digit of the averages.
+    With a breakdown, GROUPING SETS also return one row per campaign (onchain_campaign_id) or per
+    month of created_at, labelled period; the overall row is the one with is_total = 1.
     """
-    activity_level = calculate_activity_level(contribution)
+    if breakdown is None:
+        unique_contributions = (
+            select(func.count())
+            .select_from(CampaignContributor)
+            .where(CampaignContributor.contributor == wallet_address)
+            .scalar_subquery()
+        )
+    else:
+        unique_contributions = func.count(Contribution.campaign_id.distinct())
+    statement = select(
+        func.count(Contribution.contribution_id).label("total_contributions"),
+        unique_contributions.label("unique_contributions"),
+        func.sum(Contribution.quality_score).label("quality_score_sum"),
+        func.count().filter(Contribution.quality_score.isnot(None)).label("quality_score_count"),
+        func.sum(Contribution.ai_verification_score).label("ai_verification_score_sum"),
+        func.count().filter(Contribution.ai_verification_score.isnot(None)).label("ai_verification_score_count"),
+        func.sum(Contribution.reputation_score).label("reputation_score_sum"),
+        func.count().filter(Contribution.reputation_score.isnot(None)).label("reputation_score_count"),
+    ).where(Contribution.contributor == wallet_address)
+    if breakdown is None:
+        return statement
+
+    if breakdown == ContributorBreakdownEnum.CAMPAIGN:
+        period = Campaign.onchain_campaign_id
+        statement = statement.join(Campaign, Campaign.id == Contribution.campaign_id)
+    else:
+        period = func.date_trunc("month", Contribution.created_at)
+    return (
+        statement
+        .add_columns(period.label("period"), func.grouping(period).label("is_total"))
+        .group_by(func.grouping_sets(tuple_(), tuple_(period)))
+        .order_by(period)
+    )
+
 
-    # Create a new Activity entry, linking it to the specific contribution via contribution_id
-    new_activity = Activity(
-        campaign_id=campaign_id,
-        contribution_id=contribution.contribution_id,
-        timestamp=datetime.utcnow(),
-        activity_level=activity_level
+def contributor_analytics_from_row(row: Row) -> dict:
+    average_quality = average_from_sum(row.quality_score_sum, row.quality_score_count)
+    return {
+        "average_quality_category": (
+            get_quality_score_category(average_quality) if row.quality_score_count else "No Data"
+        ),
+        "average_ai_verification_score": average_from_sum(
+            row.ai_verification_score_sum, row.ai_verification_score_count
+        ),
+        "unique_contributions": row.unique_contributions,
+        "total_contributions": row.total_contributions,
+        "average_reputation_score": average_from_sum(row.reputation_score_sum, row.reputation_score_count),
+    }
+
+
+def build_contribution(item: ContributionCreate, campaign_id: str, created_at: datetime) -> Contribution:
+    """
+    Transient Contribution for a submitted item, with every column set client-side so it can be
+    written by insert_contributions without a flush or refresh.
+    """
+    return Contribution(
+        **{**item.dict(), "campaign_id": campaign_id},
+        contribution_id=str(uuid.uuid4()),
+        is_verified=False,
+        reward_claimed=False,
+        created_at=created_at,
     )
 
-    # Save the new activity to the database
-    db.add(new_activity)
-    db.commit()
-    db.refresh(new_activity)
+
+def build_activity_rows(contributions: List[Contribution]) -> List[dict]:
+    """
+    Activity rows recorded for new contributions: a per-contribution row and an overall campaign row each.
+    """
+    activity_rows = []
+    for contribution in contributions:
+        activity_level = calculate_activity_level(contribution)
+        activity_rows.append({
+            "campaign_id": contribution.campaign_id,
+            "contribution_id": contribution.contribution_id,
+            "timestamp": contribution.created_at,
+            "activity_level": activity_level,
+        })
+        activity_rows.append({
+            "campaign_id": contribution.campaign_id,
+            "contribution_id": None,
+            "timestamp": contribution.created_at,
+            "activity_level": activity_level,
+        })
+    return activity_rows
+
+
+async def insert_contributions(
+    db: AsyncSession, contributions: List[Contribution], write_activities: bool = True
+) -> List[Row]:
+    """
+    Write new (transient) contributions, possibly spanning several campaigns, as one unit of work
+    with a fixed number of statements whatever their number: one executemany insert for the
+    contributions, one for their activity rows (see build_activity_rows), one upsert each for
+    campaign_contributors, campaign_stats, wallet_stats, campaign_daily_contributors,
+    campaign_daily_stats and activity_hourly, and one executemany UPDATE
+    incrementing the activity counters of every campaign touched.
+
+    With write_activities=False the activity rows themselves are left to the caller (write-behind,
+    see app.campaigns.activity_stream); the campaign activity counters are still updated here.
+
+    Returns the CONTRIBUTION_RESPONSE_COLUMNS of each inserted contribution, in input order, from
+    the insert's RETURNING clause. Does not commit; the caller commits once, so a failure leaves
+    neither contributions nor activity rows behind.
+    """
+    if not contributions:
+        return []
+    contribution_columns = [column.key for column in Contribution.__table__.columns if column.computed is None]
+    inserted = (await db.execute(
+        insert(Contribution).returning(*CONTRIBUTION_RESPONSE_COLUMNS, sort_by_parameter_order=True),
+        [{column: getattr(contribution, column) for column in contribution_columns} for contribution in contributions],
+    )).all()
+
+    activity_rows = build_activity_rows(contributions)
+    if write_activities:
+        await db.execute(insert(Activity), activity_rows)
+
+    await record_contributions_stats(db, contributions)
+    await record_daily_stats(db, contributions)
+    await record_campaign_activity(db, activity_rows)
+    await record_activity_hourly(db, activity_rows)
+    return inserted
+
+
+ACTIVITY_HALF_LIFE_HOURS = 24
+# Cap on the decay exponent (in half-lives): Postgres raises on float underflow in exp()
+MAX_DECAY_HALF_LIVES = 1000
 
 
+async def record_campaign_activity(db: AsyncSession, activity_rows: List[dict]):
+    """
+    Fold new activity rows into each campaign's running activity counters in place
+    (x = x + :delta), one UPDATE per campaign sent as a single executemany, so the cost does not
+    depend on how much activity a campaign already has. current_activity_level is kept equal to
+    activity_sum / activity_count, i.e. the average over all of the campaign's Activity rows.
+
+    The decayed counters are first decayed by the time elapsed since activity_decayed_at, with a
+    half-life of ACTIVITY_HALF_LIFE_HOURS, and then incremented. Does not commit.
+    """
+    deltas = {}
+    for row in activity_rows:
+        level_sum, count = deltas.get(row["campaign_id"], (0.0, 0))
+        deltas[row["campaign_id"]] = (level_sum + (row["activity_level"] or 0), count + 1)
+    if not deltas:
+        return
+
+    now = datetime.utcnow()
+    campaigns = Campaign.__table__
+    level_delta = bindparam("level_delta", type_=Float)
+    count_delta = bindparam("count_delta", type_=Integer)
+    elapsed_half_lives = func.extract(
+        "epoch", literal(now) - func.coalesce(campaigns.c.activity_decayed_at, literal(now))
+    ) / (ACTIVITY_HALF_LIFE_HOURS * 3600)
+    decay = func.exp(-math.log(2) * func.least(func.greatest(elapsed_half_lives, 0), MAX_DECAY_HALF_LIVES))
+    await db.execute(
+        update(campaigns)
+        .where(campaigns.c.id == bindparam("target_campaign_id"))
+        .values(
+            activity_sum=campaigns.c.activity_sum + level_delta,
+            activity_count=campaigns.c.activity_count + count_delta,
+            current_activity_level=(campaigns.c.activity_sum + level_delta) / (campaigns.c.activity_count + count_delta),
+            activity_decayed_sum=campaigns.c.activity_decayed_sum * decay + level_delta,
+            activity_decayed_count=campaigns.c.activity_decayed_count * decay + count_delta,
+            activity_decayed_at=now,
+        ),
+        [
+            {"target_campaign_id": campaign_id, "level_delta": level_sum, "count_delta": count}
+            for campaign_id, (level_sum, count) in sorted(deltas.items())
+        ],
+    )
+
+
+def recent_activity_level(campaign: Campaign) -> Optional[float]:
+    """
+    Exponentially decayed average activity level: like current_activity_level, but each Activity
+    row is weighted by 2^(-age / ACTIVITY_HALF_LIFE_HOURS). Both decayed counters shrink by the
+    same factor over time, so their ratio only changes when new activity is recorded.
+    """
+    if not campaign.activity_decayed_count:
+        return None
+    return campaign.activity_decayed_sum / campaign.activity_decayed_count
+
+
+ACTIVITY_BUCKET_HOURS = {
+    ActivityBucketEnum.HOUR: 1,
+    ActivityBucketEnum.SIX_HOURS: 6,
+    ActivityBucketEnum.DAY: 24,
+}
+MAX_PEAK_ACTIVITY_RANGE_DAYS = 366
+
+
+def to_utc_naive(at: datetime) -> datetime:
+    """
+    Timestamps are stored as naive UTC; convert an aware datetime (e.g. a query parameter) to match.
+    """
+    if at.tzinfo is None:
+        return at
+    return at.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def truncate_to_hour(at: datetime) -> datetime:
+    return at.replace(minute=0, second=0, microsecond=0)
+
+
+def truncate_to_bucket(at: datetime, bucket_hours: int) -> datetime:
+    return at.replace(hour=at.hour - at.hour % bucket_hours, minute=0, second=0, microsecond=0)
+
+
+async def record_activity_hourly(db: AsyncSession, activity_rows: List[dict]):
+    """
+    Fold new activity rows into the activity_hourly rollup with one multi-row upsert.
+    Only the per-contribution rows are counted, so count is the number of contributions in the hour;
+    the overall campaign row of a contribution carries the same level, so sum_level / count is also
+    the average over all of the hour's Activity rows. Does not commit.
+    """
+    totals = {}
+    for row in activity_rows:
+        if row["contribution_id"] is None:
+            continue
+        key = (row["campaign_id"], truncate_to_hour(row["timestamp"]))
+        count, level_sum = totals.get(key, (0, 0.0))
+        totals[key] = (count + 1, level_sum + (row["activity_level"] or 0))
+    if not totals:
+        return
+
+    stmt = pg_insert(ActivityHourly).values([
+        {"campaign_id": campaign_id, "hour_bucket": hour_bucket, "count": count, "sum_level": level_sum}
+        for (campaign_id, hour_bucket), (count, level_sum) in sorted(totals.items())
+    ])
+    hourly_table = ActivityHourly.__table__
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ActivityHourly.campaign_id, ActivityHourly.hour_bucket],
+            set_={
+                "count": hourly_table.c["count"] + stmt.excluded["count"],
+                "sum_level": hourly_table.c.sum_level + stmt.excluded.sum_level,
+            },
+        )
+    )
+
+
+def select_peak_activity(onchain_campaign_id: str, bucket_hours: int, start: datetime, end: datetime) -> Select:
+    """
+    One statement over activity_hourly returning, via GROUPING SETS, both the campaign's activity per
+    bucket of bucket_hours (rows with is_heatmap = 0) and per (weekday, hour of day) cell of the weekly
+    heatmap (is_heatmap = 1, weekday 0 = Monday), for hours in [start, end).
+    The campaign is outer joined so an existing campaign without activity still yields a row.
+    """
+    hour_of_day = cast(func.extract("hour", ActivityHourly.hour_bucket), Integer)
+    hourly = (
+        select(
+            ActivityHourly.campaign_id,
+            (
+                func.date_trunc("day", ActivityHourly.hour_bucket)
+                + func.make_interval(0, 0, 0, 0, hour_of_day // bucket_hours * bucket_hours)
+            ).label("bucket_start"),
+            (cast(func.extract("isodow", ActivityHourly.hour_bucket), Integer) - 1).label("weekday"),
+            hour_of_day.label("hour"),
+            ActivityHourly.count,
+            ActivityHourly.sum_level,
+        )
+        .where(
+            ActivityHourly.campaign_id == select(Campaign.id)
+            .where(Campaign.onchain_campaign_id == onchain_campaign_id)
+            .scalar_subquery(),
+            ActivityHourly.hour_bucket >= start,
+            ActivityHourly.hour_bucket < end,
+        )
+        .subquery()
+    )
+    return (
+        select(
+            Campaign.id.label("campaign_id"),
+            hourly.c.bucket_start,
+            hourly.c.weekday,
+            hourly.c.hour,
+            func.grouping(hourly.c.bucket_start).label("is_heatmap"),
+            func.coalesce(func.sum(hourly.c["count"]), 0).label("submissions"),
+            func.coalesce(func.sum(hourly.c.sum_level), 0).label("level_sum"),
+        )
+        .select_from(Campaign)
+        .outerjoin(hourly, hourly.c.campaign_id == Campaign.id)
+        .where(Campaign.onchain_campaign_id == onchain_campaign_id)
+        .group_by(func.grouping_sets(
+            tuple_(Campaign.id, hourly.c.bucket_start),
+            tuple_(Campaign.id, hourly.c.weekday, hourly.c.hour),
+        ))
+    )
+
+
+async def get_peak_activity(
+    db: AsyncSession, onchain_campaign_id: str, bucket: ActivityBucketEnum, start: datetime, end: datetime
+) -> Optional[Dict]:
+    """
+    Activity of a campaign per bucket over [start, end) (start is aligned down to the bucket),
+    with empty buckets filled in, the busiest bucket, and a 7x24 heatmap of submissions by weekday
+    (0 = Monday) and hour of day (UTC). Returns None if the campaign does not exist.
+    """
+    bucket_hours = ACTIVITY_BUCKET_HOURS[bucket]
+    start = truncate_to_bucket(start, bucket_hours)
+    rows = (await db.execute(select_peak_activity(onchain_campaign_id, bucket_hours, start, end))).all()
+    if not rows:
+        return None
+
+    by_bucket = {}
+    heatmap = [[0] * 24 for _ in range(7)]
+    for row in rows:
+        if row.is_heatmap:
+            if row.weekday is not None:
+                heatmap[row.weekday][row.hour] = int(row.submissions)
+        elif row.bucket_start is not None:
+            by_bucket[row.bucket_start] = row
+
+    buckets = []
+    bucket_start = start
+    while bucket_start < end:
+        row = by_bucket.get(bucket_start)
+        submissions = int(row.submissions) if row else 0
+        buckets.append({
+            "start": bucket_start,
+            "submissions": submissions,
+            "average_activity_level": float(row.level_sum) / submissions if submissions else 0,
+        })
+        bucket_start += timedelta(hours=bucket_hours)
+
+    peak = max(buckets, key=lambda b: b["submissions"], default=None)
+    return {
+        "campaign_id": rows[0].campaign_id,
+        "buckets": buckets,
+        "peak_bucket": peak if peak and peak["submissions"] else None,
+        "heatmap": heatmap,
+    }
+
+
+TRENDING_HALF_LIFE_HOURS = 24
+# Contributions older than this weigh less than 2^-14 and are left out of the trending score
+TRENDING_WINDOW_DAYS = 14
+
+
+def refresh_trending_scores(db: Session) -> int:
+    """
+    Recompute campaign_stats.trending_score from the activity_hourly rollup: each hour's
+    contributions weighted by 2^(-age / TRENDING_HALF_LIFE_HOURS), summed over the trailing
+    TRENDING_WINDOW_DAYS. Campaigns with no contributions in the window are reset to 0.
+    Returns the number of campaigns with a non-zero score. Does not commit.
+    """
+    now = datetime.utcnow()
+    # EXTRACT returns numeric; the decay is computed in double precision, which is much faster
+    age_half_lives = cast(
+        func.extract("epoch", literal(now) - ActivityHourly.hour_bucket), Float
+    ) / (TRENDING_HALF_LIFE_HOURS * 3600)
+    scores = (
+        select(
+            ActivityHourly.campaign_id,
+            func.sum(ActivityHourly.count * func.exp(-math.log(2) * age_half_lives)).label("score"),
+        )
+        .where(ActivityHourly.hour_bucket >= truncate_to_hour(now) - timedelta(days=TRENDING_WINDOW_DAYS))
+        .group_by(ActivityHourly.campaign_id)
+        .subquery()
+    )
+    db.execute(
+        update(CampaignStats)
+        .where(CampaignStats.trending_score != 0, CampaignStats.campaign_id.not_in(select(scores.c.campaign_id)))
+        .values(trending_score=0)
+    )
+    return db.execute(
+        update(CampaignStats)
+        .where(CampaignStats.campaign_id == scores.c.campaign_id)
+        .values(trending_score=scores.c.score)
+    ).rowcount
+
+
+FEED_SCORE_COLUMNS = {
+    PremiumPromptFilterType.POPULAR: CampaignStats.contributions_count,
+    PremiumPromptFilterType.TRENDING: CampaignStats.trending_score,
+}
+
 
 def calculate_activity_level(contribution: Contribution) -> float:
     """
@@ -136,3 +1176,70 @@ def get_quality_score_category(quality_score: float) -> str:
     else:
         return "Low Quality"
 
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    "contribution_id",
+    "onchain_contribution_id",
+    "campaign_id",
+    "contributor",
+    "data_url",
+    "transaction_hash",
+    "ai_verification_score",
+    "reputation_score",
+    "is_verified",
+    "reward_claimed",
+    "created_at",
+    "quality_score",
+)
+
+
+def _export_row(row) -> dict:
+    values = row._asdict()
+    if values["created_at"] is not None:
+        values["created_at"] = values["created_at"].isoformat()
+    return values
+
+
+async def stream_contributions_export(
+    campaign_id: str,
+    export_format: ExportFormatEnum,
+    contributor: Optional[str] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a campaign's contributions as NDJSON lines or CSV rows.
+
+    Rows are read through a server-side cursor (yield_per) in batches of EXPORT_BATCH_SIZE and
+    encoded batch by batch (orjson for NDJSON), so memory stays constant regardless of campaign size. The generator
+    owns its session because the request-scoped one is closed before the body is streamed.
+    """
+    statement = (
+        select(
+            *(getattr(Contribution, column) for column in EXPORT_COLUMNS if column != "quality_score"),
+            Contribution.quality_tier.label("quality_score"),
+        )
+        .where(Contribution.campaign_id == campaign_id)
+        .order_by(Contribution.created_at, Contribution.contribution_id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    if contributor:
+        statement = statement.where(Contribution.contributor == contributor)
+
+    if export_format == ExportFormatEnum.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue().encode()
+
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(statement)
+        async for partition in result.partitions():
+            if export_format == ExportFormatEnum.CSV:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                for row in partition:
+                    values = _export_row(row)
+                    writer.writerow(values[column] for column in EXPORT_COLUMNS)
+                yield buffer.getvalue().encode()
+            else:
+                yield b"".join(orjson_dumps(row._asdict(), orjson.OPT_APPEND_NEWLINE) for row in partition)
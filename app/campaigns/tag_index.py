@@ -0,0 +1,330 @@
+"""
+Browse index of campaigns kept as Redis bitmaps.
+
+Every campaign has a dense integer bitmap_offset, and one bitmap per attribute value has the
+campaign's bit set: all campaigns, active, premium, each campaign_type and each tag. A browse
+query combines the bitmaps with BITOP (AND across filters, AND or OR across tags) and counts
+each facet with BITCOUNT over the result, all inside one MULTI pipeline, so filters and facet
+counts never touch Postgres. Offsets are assigned sequentially, so the bitmaps are dense: one
+bit per campaign (12.5 KB per bitmap for 100k campaigns) and plain bitmaps need no compression.
+
+The bitmaps are updated incrementally: index_campaign sets a new campaign's bits after it is
+created and mark_campaigns_inactive clears the active bit of expired campaigns.
+rebuild_campaign_bitmaps recomputes every bitmap from Postgres for recovery; it writes new
+bitmaps under temporary keys and RENAMEs them into place, so readers never see a partial index.
+
+A rebuild swaps in bitmaps computed from a snapshot, which would revert incremental updates made
+after the snapshot was read. While a rebuild holds REBUILD_LOCK_KEY, index_campaign and
+mark_campaigns_inactive also append the offsets they touch to REBUILD_LOG_KEY; after the swap the
+rebuild re-reads those campaigns from Postgres and sets their bits again.
+"""
+import uuid
+from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from redis import Redis as SyncRedis
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.campaigns.models import Campaign, CampaignTag
+from app.core.enums.tags import PromptTagEnum, TagMatchEnum
+
+BITMAP_KEY_PREFIX = "campaign_bitmap"
+ALL_KEY = f"{BITMAP_KEY_PREFIX}:all"
+ACTIVE_KEY = f"{BITMAP_KEY_PREFIX}:active"
+PREMIUM_KEY = f"{BITMAP_KEY_PREFIX}:premium"
+# Hash of bitmap_offset -> campaign id, to turn result bits into campaigns
+IDS_KEY = f"{BITMAP_KEY_PREFIX}:ids"
+# Set of the campaign types that have a bitmap
+TYPES_KEY = f"{BITMAP_KEY_PREFIX}:types"
+QUERY_KEY_TTL_SECONDS = 60
+REBUILD_SUFFIX = ":rebuild"
+REBUILD_CHUNK_SIZE = 1000
+# Held while a rebuild runs; live updates log the offsets they touch for the rebuild to reapply
+REBUILD_LOCK_KEY = f"{BITMAP_KEY_PREFIX}:rebuild_lock"
+REBUILD_LOG_KEY = f"{BITMAP_KEY_PREFIX}:rebuild_log"
+REBUILD_LOCK_TTL_SECONDS = 10 * 60
+
+
+def tag_key(tag: PromptTagEnum) -> str:
+    return f"{BITMAP_KEY_PREFIX}:tag:{tag.value}"
+
+
+def type_key(campaign_type: str) -> str:
+    return f"{BITMAP_KEY_PREFIX}:type:{campaign_type}"
+
+
+def _queue_campaign_bits(
+    pipe,
+    bitmap_offset: int,
+    campaign_id: str,
+    campaign_type: Optional[str],
+    is_premium: bool,
+    is_active: bool,
+    tags: Iterable[PromptTagEnum],
+):
+    pipe.hset(IDS_KEY, bitmap_offset, campaign_id)
+    pipe.setbit(ALL_KEY, bitmap_offset, 1)
+    pipe.setbit(ACTIVE_KEY, bitmap_offset, int(bool(is_active)))
+    pipe.setbit(PREMIUM_KEY, bitmap_offset, int(bool(is_premium)))
+    if campaign_type:
+        pipe.sadd(TYPES_KEY, campaign_type)
+        pipe.setbit(type_key(campaign_type), bitmap_offset, 1)
+    for tag in tags:
+        pipe.setbit(tag_key(tag), bitmap_offset, 1)
+
+
+async def index_campaign(
+    redis: Redis,
+    bitmap_offset: int,
+    campaign_id: str,
+    campaign_type: Optional[str],
+    is_premium: bool,
+    is_active: bool,
+    tags: Iterable[PromptTagEnum],
+):
+    """
+    Set a campaign's bits in every bitmap it belongs to, with a single pipeline.
+    """
+    rebuilding = await redis.exists(REBUILD_LOCK_KEY)
+    pipe = redis.pipeline(transaction=True)
+    _queue_campaign_bits(pipe, bitmap_offset, campaign_id, campaign_type, is_premium, is_active, tags)
+    if rebuilding:
+        pipe.rpush(REBUILD_LOG_KEY, bitmap_offset)
+    await pipe.execute()
+
+
+def mark_campaigns_inactive(redis: SyncRedis, bitmap_offsets: Iterable[int]):
+    """
+    Clear the active bit of campaigns that have been marked inactive.
+    """
+    bitmap_offsets = list(bitmap_offsets)
+    if not bitmap_offsets:
+        return
+    rebuilding = redis.exists(REBUILD_LOCK_KEY)
+    pipe = redis.pipeline(transaction=True)
+    for bitmap_offset in bitmap_offsets:
+        pipe.setbit(ACTIVE_KEY, bitmap_offset, 0)
+    if rebuilding:
+        pipe.rpush(REBUILD_LOG_KEY, *bitmap_offsets)
+    pipe.execute()
+
+
+def _set_bits_descending(bitmap: bytes, before: Optional[int]) -> Iterator[int]:
+    """
+    Offsets of the set bits of a Redis bitmap (bit 0 is the high bit of byte 0), highest first,
+    starting below `before` when given.
+    """
+    last_byte = len(bitmap) - 1 if before is None else min(len(bitmap), (before + 7) // 8) - 1
+    for byte_index in range(last_byte, -1, -1):
+        byte = bitmap[byte_index]
+        if not byte:
+            continue
+        for bit in range(7, -1, -1):
+            offset = byte_index * 8 + bit
+            if byte & (0x80 >> bit) and (before is None or offset < before):
+                yield offset
+
+
+async def browse_campaigns(
+    redis: Redis,
+    tags: List[PromptTagEnum],
+    match: TagMatchEnum,
+    campaign_type: Optional[str],
+    premium: Optional[bool],
+    active: Optional[bool],
+    cursor: Optional[int],
+    limit: int,
+) -> Dict:
+    """
+    Campaigns matching every given filter and any (or all) of the given tags, newest first, with
+    the number of matches and facet counts of the matches per tag, campaign type, premium and active.
+    A page is a list of campaign ids; cursor is the bitmap offset to continue below.
+    """
+    campaign_types = sorted(member.decode() for member in await redis.smembers(TYPES_KEY))
+    query_id = uuid.uuid4().hex
+    result_key = f"{BITMAP_KEY_PREFIX}:query:{query_id}"
+    scratch_key = f"{BITMAP_KEY_PREFIX}:query:{query_id}:scratch"
+
+    pipe = redis.pipeline(transaction=True)
+    pipe.bitop("AND", result_key, ALL_KEY)
+    if tags:
+        tag_keys = [tag_key(tag) for tag in tags]
+        if match == TagMatchEnum.ALL:
+            pipe.bitop("AND", result_key, result_key, *tag_keys)
+        else:
+            pipe.bitop("OR", scratch_key, *tag_keys)
+            pipe.bitop("AND", result_key, result_key, scratch_key)
+    if campaign_type is not None:
+        pipe.bitop("AND", result_key, result_key, type_key(campaign_type))
+    for key, wanted in ((PREMIUM_KEY, premium), (ACTIVE_KEY, active)):
+        if wanted is None:
+            continue
+        if wanted:
+            pipe.bitop("AND", result_key, result_key, key)
+        else:
+            # result AND NOT key, written so bits past the end of key count as unset
+            pipe.bitop("AND", scratch_key, result_key, key)
+            pipe.bitop("XOR", result_key, result_key, scratch_key)
+    pipe.expire(result_key, QUERY_KEY_TTL_SECONDS)
+    pipe.get(result_key)
+    pipe.bitcount(result_key)
+
+    facet_keys = [
+        *(tag_key(tag) for tag in PromptTagEnum),
+        *(type_key(campaign_type) for campaign_type in campaign_types),
+        PREMIUM_KEY,
+        ACTIVE_KEY,
+    ]
+    for key in facet_keys:
+        pipe.bitop("AND", scratch_key, result_key, key)
+        pipe.bitcount(scratch_key)
+    pipe.delete(result_key, scratch_key)
+    responses = await pipe.execute()
+
+    facet_counts = responses[-1 - len(facet_keys) * 2:-1][1::2]
+    bitmap, total = responses[-3 - len(facet_keys) * 2:-1 - len(facet_keys) * 2]
+    tag_counts = facet_counts[:len(PromptTagEnum)]
+    type_counts = facet_counts[len(PromptTagEnum):-2]
+    premium_count, active_count = facet_counts[-2:]
+
+    offsets = []
+    for offset in _set_bits_descending(bitmap or b"", cursor):
+        offsets.append(offset)
+        if len(offsets) > limit:
+            break
+    has_more = len(offsets) > limit
+    offsets = offsets[:limit]
+    campaign_ids = await redis.hmget(IDS_KEY, offsets) if offsets else []
+
+    return {
+        "total": total,
+        "campaign_ids": [value.decode() for value in campaign_ids if value is not None],
+        "next_cursor": offsets[-1] if has_more else None,
+        "has_more": has_more,
+        "facets": {
+            "tags": {tag.value: count for tag, count in zip(PromptTagEnum, tag_counts)},
+            "campaign_type": {
+                campaign_type: count for campaign_type, count in zip(campaign_types, type_counts) if count
+            },
+            "is_premium": {"true": premium_count, "false": total - premium_count},
+            "is_active": {"true": active_count, "false": total - active_count},
+        },
+    }
+
+
+def _bitmap(offsets: List[int]) -> bytes:
+    bitmap = bytearray(max(offsets) // 8 + 1 if offsets else 0)
+    for offset in offsets:
+        bitmap[offset >> 3] |= 0x80 >> (offset & 7)
+    return bytes(bitmap)
+
+
+def _reindex_campaigns(redis: SyncRedis, db: Session, bitmap_offsets: List[int]):
+    """
+    Set the bits of the given campaigns from their current rows in Postgres.
+    """
+    tags = defaultdict(list)
+    for row in db.execute(
+        select(Campaign.bitmap_offset, CampaignTag.tag)
+        .join(CampaignTag, CampaignTag.campaign_id == Campaign.id)
+        .where(Campaign.bitmap_offset.in_(bitmap_offsets))
+    ):
+        tags[row.bitmap_offset].append(PromptTagEnum(row.tag))
+    pipe = redis.pipeline(transaction=True)
+    for row in db.execute(
+        select(
+            Campaign.bitmap_offset,
+            Campaign.id,
+            Campaign.campaign_type,
+            Campaign.is_premium,
+            Campaign.is_active,
+        ).where(Campaign.bitmap_offset.in_(bitmap_offsets))
+    ):
+        _queue_campaign_bits(
+            pipe, row.bitmap_offset, row.id, row.campaign_type, row.is_premium, row.is_active, tags[row.bitmap_offset]
+        )
+    pipe.execute()
+
+
+def rebuild_campaign_bitmaps(redis: SyncRedis, db: Session) -> Optional[int]:
+    """
+    Recompute every browse bitmap from the campaigns and campaign_tags tables and swap it into
+    place. Bitmaps of campaign types and tags that no longer have campaigns are removed.
+    Campaigns created or expired while the rebuild ran are then reapplied from Postgres.
+    Returns the number of campaigns indexed, or None if another rebuild is already running.
+    """
+    token = uuid.uuid4().hex
+    if not redis.set(REBUILD_LOCK_KEY, token, nx=True, ex=REBUILD_LOCK_TTL_SECONDS):
+        return None
+    try:
+        redis.delete(REBUILD_LOG_KEY)
+        indexed = _rebuild_from_snapshot(redis, db)
+        # Reapply what live updates touched since the snapshot, until no more arrive
+        while True:
+            pipe = redis.pipeline(transaction=True)
+            pipe.lrange(REBUILD_LOG_KEY, 0, -1)
+            pipe.delete(REBUILD_LOG_KEY)
+            logged, _ = pipe.execute()
+            if not logged:
+                return indexed
+            _reindex_campaigns(redis, db, sorted({int(offset) for offset in logged}))
+    finally:
+        if redis.get(REBUILD_LOCK_KEY) == token.encode():
+            redis.delete(REBUILD_LOCK_KEY)
+
+
+def _rebuild_from_snapshot(redis: SyncRedis, db: Session) -> int:
+    offsets = defaultdict(list)
+    ids = {}
+    campaign_types = set()
+    for row in db.execute(
+        select(
+            Campaign.bitmap_offset,
+            Campaign.id,
+            Campaign.campaign_type,
+            Campaign.is_premium,
+            Campaign.is_active,
+        )
+    ):
+        ids[row.bitmap_offset] = row.id
+        offsets[ALL_KEY].append(row.bitmap_offset)
+        if row.is_active:
+            offsets[ACTIVE_KEY].append(row.bitmap_offset)
+        if row.is_premium:
+            offsets[PREMIUM_KEY].append(row.bitmap_offset)
+        if row.campaign_type:
+            campaign_types.add(row.campaign_type)
+            offsets[type_key(row.campaign_type)].append(row.bitmap_offset)
+    for row in db.execute(
+        select(Campaign.bitmap_offset, CampaignTag.tag).join(CampaignTag, CampaignTag.campaign_id == Campaign.id)
+    ):
+        offsets[tag_key(PromptTagEnum(row.tag))].append(row.bitmap_offset)
+
+    bitmap_keys = {ALL_KEY, ACTIVE_KEY, PREMIUM_KEY, *offsets}
+    stale_keys = {
+        key.decode() for key in redis.scan_iter(match=f"{BITMAP_KEY_PREFIX}:*", count=REBUILD_CHUNK_SIZE)
+    } - bitmap_keys - {IDS_KEY, TYPES_KEY, REBUILD_LOCK_KEY, REBUILD_LOG_KEY}
+    for key in bitmap_keys:
+        pipe = redis.pipeline(transaction=False)
+        pipe.set(key + REBUILD_SUFFIX, _bitmap(offsets.get(key, [])))
+        pipe.rename(key + REBUILD_SUFFIX, key)
+        pipe.execute()
+
+    pipe = redis.pipeline(transaction=False)
+    pipe.delete(IDS_KEY + REBUILD_SUFFIX, TYPES_KEY + REBUILD_SUFFIX)
+    items = list(ids.items())
+    for i in range(0, len(items), REBUILD_CHUNK_SIZE):
+        pipe.hset(IDS_KEY + REBUILD_SUFFIX, mapping=dict(items[i:i + REBUILD_CHUNK_SIZE]))
+    if campaign_types:
+        pipe.sadd(TYPES_KEY + REBUILD_SUFFIX, *campaign_types)
+    pipe.execute()
+    for key, written in ((IDS_KEY, bool(ids)), (TYPES_KEY, bool(campaign_types))):
+        if written:
+            redis.rename(key + REBUILD_SUFFIX, key)
+        else:
+            redis.delete(key)
+    if stale_keys:
+        redis.delete(*stale_keys)
+    return len(ids)
@@ -4,13 +4,20 @@ import time
 
 from app.core.constants import BASE_URL, API_KEY, REDIS_URL
 from app.campaigns.models import Campaign
+from app.campaigns.services import find_campaign_stats_drift, rebuild_campaign_stats, refresh_trending_scores, campaign_cache_tag, CAMPAIGNS_CACHE_TAG, LEADERBOARDS_CACHE_TAG
+from app.campaigns.activity_stream import drain_activity_stream_once, consumer_name
+from app.campaigns.leaderboards import refresh_leaderboard_views
+from app.campaigns.realtime_leaderboards import rebuild_realtime_leaderboards
+from app.campaigns.tag_index import mark_campaigns_inactive, rebuild_campaign_bitmaps
+from app.core.cache import invalidate_tags
 from app.core.database import SessionLocal
+from app.core.redis import get_sync_redis
 
 # Create a Celery app
 celery_app = Celery('tasks', broker=REDIS_URL)  
 
 # Defining the task that will call the endpoint
-@celery_app.task
+@celery_app.task(name="tasks.mark_expired_campaigns_inactive")
 def mark_expired_campaigns_inactive():
     """
     Query active campaigns whose expiration timestamp has passed and mark them as inactive.
@@ -27,8 +34,18 @@ def mark_expired_campaigns_inactive():
         # Mark each campaign as inactive.
         for campaign in expired_campaigns:
             campaign.is_active = False
+        expired_offsets = [campaign.bitmap_offset for campaign in expired_campaigns]
 
         db.commit()
+        if expired_campaigns:
+            invalidate_tags(
+                CAMPAIGNS_CACHE_TAG,
+                *(campaign_cache_tag(campaign.onchain_campaign_id) for campaign in expired_campaigns)
+            )
+            try:
+                mark_campaigns_inactive(get_sync_redis(), expired_offsets)
+            except Exception as e:
+                print(f"Error clearing the browse index active bit of expired campaigns: {e}")
         print(f"Marked {len(expired_campaigns)} campaigns as inactive.")
     except Exception as e:
         db.rollback()
@@ -37,7 +54,125 @@ def mark_expired_campaigns_inactive():
         db.close()
 
 
-@celery_app.task
+@celery_app.task(name="tasks.reconcile_campaign_stats")
+def reconcile_campaign_stats(full_rebuild: bool = False):
+    """
+    Compare campaign_stats against the raw contributions table and rebuild drifted rows.
+    With full_rebuild=True, campaign_stats and campaign_contributors are rebuilt from scratch.
+    """
+    db = SessionLocal()
+    try:
+        if full_rebuild:
+            rebuild_campaign_stats(db)
+            db.commit()
+            print("Rebuilt campaign stats for all campaigns.")
+            return
+
+        drifted = find_campaign_stats_drift(db)
+        if drifted:
+            rebuild_campaign_stats(db, drifted)
+            db.commit()
+        print(f"Reconciled campaign stats for {len(drifted)} drifted campaigns.")
+    except Exception as e:
+        db.rollback()
+        print(f"Error reconciling campaign stats: {e}")
+    finally:
+        db.close()
+
+
+@celery_app.task(name="tasks.drain_activity_stream")
+def drain_activity_stream():
+    """
+    Bulk-insert activities queued on the Redis Stream by the write-behind submit path.
+    Entries are acknowledged only once their batch is committed; failed batches stay
+    pending and are re-claimed by a later run.
+    """
+    db = SessionLocal()
+    try:
+        written = drain_activity_stream_once(get_sync_redis(), db, consumer_name())
+        if written:
+            print(f"Wrote {written} activities from the activity stream.")
+    except Exception as e:
+        db.rollback()
+        print(f"Error draining activity stream: {e}")
+    finally:
+        db.close()
+
+
+@celery_app.task(name="tasks.refresh_leaderboards")
+def refresh_leaderboards():
+    """
+    Refresh the leaderboard materialized views without blocking readers and
+    invalidate the cached leaderboard responses.
+    """
+    db = SessionLocal()
+    try:
+        refresh_leaderboard_views(db)
+        db.commit()
+        invalidate_tags(LEADERBOARDS_CACHE_TAG)
+        print("Refreshed leaderboard views.")
+    except Exception as e:
+        db.rollback()
+        print(f"Error refreshing leaderboard views: {e}")
+    finally:
+        db.close()
+
+
+@celery_app.task(name="tasks.refresh_campaign_trending_scores")
+def refresh_campaign_trending_scores():
+    """
+    Recompute the time-decayed trending score of every campaign for the trending feed and
+    invalidate the cached campaign lists.
+    """
+    db = SessionLocal()
+    try:
+        scored = refresh_trending_scores(db)
+        db.commit()
+        invalidate_tags(CAMPAIGNS_CACHE_TAG)
+        print(f"Refreshed trending scores of {scored} campaigns.")
+    except Exception as e:
+        db.rollback()
+        print(f"Error refreshing trending scores: {e}")
+    finally:
+        db.close()
+
+
+@celery_app.task(name="tasks.rebuild_redis_leaderboards")
+def rebuild_redis_leaderboards():
+    """
+    Recovery command: recompute the real-time Redis leaderboards from the contributions table.
+    Not scheduled; run it when the sorted sets are lost or known to be wrong.
+    """
+    db = SessionLocal()
+    try:
+        rebuilt = rebuild_realtime_leaderboards(get_sync_redis(), db)
+        print(f"Rebuilt {rebuilt} real-time leaderboards.")
+    except Exception as e:
+        print(f"Error rebuilding real-time leaderboards: {e}")
+    finally:
+        db.close()
+
+
+@celery_app.task(name="tasks.rebuild_campaign_browse_index")
+def rebuild_campaign_browse_index():
+    """
+    Recompute the Redis tag/type/premium/active bitmaps behind /campaigns/browse from Postgres.
+    Scheduled daily as a safety net; creates and expiries keep the bitmaps current in between.
+    """
+    db = SessionLocal()
+    try:
+        indexed = rebuild_campaign_bitmaps(get_sync_redis(), db)
+        if indexed is None:
+            print("Skipped the browse index rebuild: another rebuild is running.")
+        else:
+            print(f"Rebuilt the browse index over {indexed} campaigns.")
+    except Exception as e:
+        print(f"Error rebuilding the browse index: {e}")
+    finally:
+        db.close()
+
+
+@celery_app.task(name="tasks.renew_subscriptions")
 def renew_subscriptions():
     try:
         headers = {
@@ -57,6 +192,26 @@ celery_app.conf.beat_schedule = {
         'task': 'tasks.mark_expired_campaigns_inactive',
         'schedule': 30 * 60,  # Every 30 minutes (in seconds)
     },
+    'reconcile-campaign-stats-daily': {
+        'task': 'tasks.reconcile_campaign_stats',
+        'schedule': 24 * 60 * 60,  # Every 24 hours (in seconds)
+    },
+    'drain-activity-stream-every-5-seconds': {
+        'task': 'tasks.drain_activity_stream',
+        'schedule': 5,  # Every 5 seconds; a no-op unless ACTIVITY_WRITE_BEHIND is enabled
+    },
+    'refresh-leaderboards-every-5-minutes': {
+        'task': 'tasks.refresh_leaderboards',
+        'schedule': 5 * 60,  # Every 5 minutes (in seconds)
+    },
+    'refresh-campaign-trending-scores-every-10-minutes': {
+        'task': 'tasks.refresh_campaign_trending_scores',
+        'schedule': 10 * 60,  # Every 10 minutes (in seconds)
+    },
+    'rebuild-campaign-browse-index-daily': {
+        'task': 'tasks.rebuild_campaign_browse_index',
+        'schedule': 24 * 60 * 60,  # Every 24 hours (in seconds)
+    },
     'renew-subscriptions-12-hours': {
         'task': 'tasks.renew_subscriptions',
         'schedule': 12 * 60 * 60,  # Every 12 hours (in seconds)
@@ -0,0 +1,366 @@
+"""
+Read-through Redis response cache for GET endpoints.
+
+Keys are versioned: every entry key embeds CACHE_KEY_VERSION plus the current version of each
+tag the response depends on, so invalidating a tag (invalidate_tags) simply moves readers to a
+new key and old entries age out on their own. Entries are fresh for `ttl` seconds and may be
+served stale for a further `stale_ttl` seconds while one request refreshes them in the background.
+A Redis lock gives single-flight recomputation on a miss: concurrent requests for the same key
+serve the last known payload, or wait briefly for the winner, instead of all hitting Postgres.
+Any Redis failure falls through to calling the endpoint directly. A payload served from an older
+tag version is flagged so conditional_response does not label it with the current validators.
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import date, datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from enum import Enum
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal
+from app.core.redis import get_redis_pool, get_sync_redis
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_VERSION = "v1"
+CACHE_PREFIX = f"cache:{CACHE_KEY_VERSION}"
+TAG_VERSION_PREFIX = "cache:tag"
+STATS_KEY = "cache:stats"
+LOCK_TTL_MS = 10_000
+LOCK_WAIT_SECONDS = 2.0
+LOCK_POLL_SECONDS = 0.05
+
+# Strong references to in-flight background refreshes, so they are not garbage collected mid-run
+_refresh_tasks = set()
+
+# Set by cached_response when the payload it returns was computed for older tag versions
+_served_outdated: ContextVar[bool] = ContextVar("cache_served_outdated", default=False)
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_VERSION_PREFIX}:{tag}"
+
+
+def _tag_modified_key(tag: str) -> str:
+    return f"{TAG_VERSION_PREFIX}:{tag}:modified"
+
+
+async def get_tag_state(redis: Redis, tags: List[str]) -> Tuple[List[str], float]:
+    """
+    Current version of each tag, plus the latest time (unix seconds) any of them was bumped.
+    Unknown tags are seeded with a time-based version so that a flushed Redis never hands out
+    versions (and therefore keys or ETags) that were used before.
+    """
+    if not tags:
+        return [], 0.0
+    keys = [_tag_key(tag) for tag in tags] + [_tag_modified_key(tag) for tag in tags]
+    values = await redis.mget(keys)
+    if any(value is None for value in values):
+        now = time.time()
+        pipe = redis.pipeline(transaction=False)
+        for tag in tags:
+            pipe.set(_tag_key(tag), int(now * 1e9), nx=True)
+            pipe.set(_tag_modified_key(tag), now, nx=True)
+        await pipe.execute()
+        values = await redis.mget(keys)
+    values = [value.decode() if isinstance(value, bytes) else str(value) for value in values]
+    return values[:len(tags)], max(float(value) for value in values[len(tags):])
+
+
+async def get_tag_versions(redis: Redis, tags: List[str]) -> List[str]:
+    return (await get_tag_state(redis, tags))[0]
+
+
+def _queue_invalidation(pipe, tags: Iterable[str]):
+    now = time.time()
+    for tag in tags:
+        pipe.set(_tag_key(tag), int(now * 1e9), nx=True)
+        pipe.incr(_tag_key(tag))
+        pipe.set(_tag_modified_key(tag), now)
+
+
+def invalidate_tags(*tags: str):
+    """
+    Bump the version of each tag, invalidating every cached response that depends on it.
+    Blocking variant for Celery tasks; routes use invalidate_tags_async.
+    Failures are logged rather than raised; cached entries then expire through their TTL.
+    """
+    if not tags:
+        return
+    try:
+        pipe = get_sync_redis().pipeline(transaction=False)
+        _queue_invalidation(pipe, tags)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Failed to invalidate cache tags {tags}: {e}")
+
+
+async def invalidate_tags_async(*tags: str):
+    """
+    Same as invalidate_tags, on the shared async Redis client.
+    """
+    if not tags:
+        return
+    try:
+        pipe = (await get_redis_pool()).pipeline(transaction=False)
+        _queue_invalidation(pipe, tags)
+        await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Failed to invalidate cache tags {tags}: {e}")
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """
+    Hit, stale and miss counters per cached namespace.
+    """
+    raw = get_sync_redis().hgetall(STATS_KEY)
+    return {field.decode(): int(value) for field, value in raw.items()}
+
+
+def _key_params(kwargs: dict) -> str:
+    params = {
+        name: value
+        for name, value in kwargs.items()
+        if value is None or isinstance(value, (str, int, float, bool, date, datetime, Enum))
+    }
+    encoded = json.dumps(jsonable_encoder(params), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode()).hexdigest()
+
+
+async def _count(redis: Redis, namespace: str, outcome: str):
+    try:
+        await redis.hincrby(STATS_KEY, f"{namespace}:{outcome}", 1)
+    except RedisError:
+        pass
+
+
+def cached_response(
+    namespace: str,
+    tags: Callable[..., Iterable[str]],
+    ttl: int = 30,
+    stale_ttl: int = 300,
+):
+    """
+    Cache the JSON-able return value of an async GET endpoint in Redis.
+
+    tags receives the endpoint's keyword arguments and returns the invalidation tags the
+    response depends on. Primitive keyword arguments (path and query parameters) form the key;
+    dependencies such as the DB session are ignored. HTTPExceptions are never cached.
+    """
+    def decorator(func):
+        async def compute(kwargs: dict):
+            return jsonable_encoder(await func(**kwargs))
+
+        async def store(redis: Redis, key: str, latest_key: str, versions: List[str], payload):
+            entry = json.dumps({"fresh_until": time.time() + ttl, "versions": versions, "payload": payload})
+            pipe = redis.pipeline(transaction=False)
+            pipe.set(key, entry, ex=ttl + stale_ttl)
+            pipe.set(latest_key, entry, ex=ttl + stale_ttl)
+            await pipe.execute()
+
+        def refresh_in_background(
+            redis: Redis, key: str, latest_key: str, versions: List[str], lock_key: str, token: str, kwargs: dict
+        ):
+            async def run():
+                try:
+                    # The request's session is closed once the response is sent, so use a fresh one
+                    async with AsyncSessionLocal() as session:
+                        fresh_kwargs = {
+                            name: session if isinstance(value, AsyncSession) else value
+                            for name, value in kwargs.items()
+                        }
+                        await store(redis, key, latest_key, versions, await compute(fresh_kwargs))
+                except Exception as e:
+                    logger.warning(f"Background refresh of {key} failed: {e}")
+                finally:
+                    await _release(redis, lock_key, token)
+
+            task = asyncio.create_task(run())
+            _refresh_tasks.add(task)
+            task.add_done_callback(_refresh_tasks.discard)
+
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            try:
+                redis = await get_redis_pool()
+                versions = await get_tag_versions(redis, list(tags(**kwargs)))
+                params = _key_params(kwargs)
+                latest_key = f"{CACHE_PREFIX}:{namespace}:{params}:latest"
+                key = f"{CACHE_PREFIX}:{namespace}:{params}:{':'.join(versions)}"
+                lock_key = f"{key}:lock"
+                raw = await redis.get(key)
+            except RedisError as e:
+                logger.warning(f"Cache unavailable for {namespace}: {e}")
+                return await func(**kwargs)
+
+            if raw is not None:
+                entry = json.loads(raw)
+                if entry["fresh_until"] >= time.time():
+                    await _count(redis, namespace, "hit")
+                    return entry["payload"]
+                # Stale: serve it, and let exactly one request refresh it
+                token = uuid.uuid4().hex
+                if await _acquire(redis, lock_key, token):
+                    refresh_in_background(redis, key, latest_key, versions, lock_key, token, kwargs)
+                await _count(redis, namespace, "stale")
+                return entry["payload"]
+
+            token = uuid.uuid4().hex
+            if not await _acquire(redis, lock_key, token):
+                # Another request is computing this key: serve the last known payload if there is one
+                try:
+                    entry = await _wait_for(redis, key, latest_key)
+                except RedisError as e:
+                    logger.warning(f"Cache unavailable for {namespace}: {e}")
+                    return await func(**kwargs)
+                if entry is not None:
+                    if entry.get("versions") != versions:
+                        _served_outdated.set(True)
+                    await _count(redis, namespace, "stale")
+                    return entry["payload"]
+
+            await _count(redis, namespace, "miss")
+            try:
+                payload = await compute(kwargs)
+                try:
+                    await store(redis, key, latest_key, versions, payload)
+                except RedisError as e:
+                    logger.warning(f"Failed to store cache entry {key}: {e}")
+                return payload
+            finally:
+                await _release(redis, lock_key, token)
+
+        return wrapper
+
+    return decorator
+
+
+async def _acquire(redis: Redis, lock_key: str, token: str) -> bool:
+    try:
+        return bool(await redis.set(lock_key, token, nx=True, px=LOCK_TTL_MS))
+    except RedisError:
+        return True
+
+
+async def _release(redis: Redis, lock_key: str, token: str):
+    try:
+        if await redis.get(lock_key) == token.encode():
+            await redis.delete(lock_key)
+    except RedisError:
+        pass
+
+
+async def _wait_for(redis: Redis, key: str, latest_key: str) -> Optional[dict]:
+    """
+    The cache entry for key, or failing that the last stored entry of any version, polling briefly.
+    """
+    deadline = time.monotonic() + LOCK_WAIT_SECONDS
+    while True:
+        raw = await redis.get(key) or await redis.get(latest_key)
+        if raw is not None:
+            return json.loads(raw)
+        if time.monotonic() >= deadline:
+            return None
+        await asyncio.sleep(LOCK_POLL_SECONDS)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    return "*" in candidates or any(
+        (candidate[2:] if candidate.startswith("W/") else candidate) == opaque for candidate in candidates
+    )
+
+
+def _not_modified_since(if_modified_since: str, last_modified: float) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return int(last_modified) <= since.timestamp()
+
+
+def conditional_response(
+    namespace: str,
+    tags: Callable[..., Iterable[str]],
+    max_age: int = 0,
+):
+    """
+    Add ETag, Last-Modified and Cache-Control to an async GET endpoint and answer conditional
+    requests with 304 Not Modified.
+
+    The validators are derived from the versions of the tags the response depends on (the same
+    per-campaign and global versions cached_response uses), so a matching If-None-Match or
+    If-Modified-Since is answered from Redis alone, without calling the endpoint or touching Postgres.
+    A body that cached_response served from older tag versions gets no validators, so a client
+    never revalidates the old body under the new ETag.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        injected = [
+            name for name, annotation in (("request", Request), ("response", Response))
+            if name not in signature.parameters
+        ]
+
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            request: Request = kwargs["request"] if "request" not in injected else kwargs.pop("request")
+            response: Response = kwargs["response"] if "response" not in injected else kwargs.pop("response")
+            try:
+                versions, last_modified = await get_tag_state(await get_redis_pool(), list(tags(**kwargs)))
+            except RedisError as e:
+                logger.warning(f"Conditional GET unavailable for {namespace}: {e}")
+                return await func(**kwargs)
+
+            digest = hashlib.sha1(f"{namespace}:{_key_params(kwargs)}:{':'.join(versions)}".encode()).hexdigest()
+            headers = {
+                "ETag": f'W/"{digest}"',
+                "Last-Modified": format_datetime(datetime.fromtimestamp(last_modified, tz=timezone.utc), usegmt=True),
+                "Cache-Control": f"public, max-age={max_age}, must-revalidate",
+            }
+
+            if_none_match = request.headers.get("if-none-match")
+            if_modified_since = request.headers.get("if-modified-since")
+            if (if_none_match and _etag_matches(if_none_match, headers["ETag"])) or (
+                not if_none_match and if_modified_since and _not_modified_since(if_modified_since, last_modified)
+            ):
+                return Response(status_code=304, headers=headers)
+
+            outdated = _served_outdated.set(False)
+            try:
+                result = await func(**kwargs)
+                if _served_outdated.get():
+                    headers = {"Cache-Control": "no-cache"}
+            finally:
+                _served_outdated.reset(outdated)
+            (result if isinstance(result, Response) else response).headers.update(headers)
+            return result
+
+        wrapper.__signature__ = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                *(
+                    inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=annotation)
+                    for name, annotation in (("request", Request), ("response", Response))
+                    if name in injected
+                ),
+            ]
+        )
+        return wrapper
+
+    return decorator
@@ -8,4 +8,7 @@ SQLALCHEMY_DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL")
 BASE_URL = os.getenv("BASE_URL")
 API_KEY= os.getenv("API_KEY")
 REDIS_URL = os.getenv("REDIS_URL")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
\ No newline at end of file
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# Opt-in: append Activity rows to a Redis Stream on submit and let Celery bulk-insert them
+ACTIVITY_WRITE_BEHIND = os.getenv("ACTIVITY_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
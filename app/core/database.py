@@ -4,6 +4,8 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import Session
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from contextlib import contextmanager
 
 from app.core.constants import SQLALCHEMY_DATABASE_URL
@@ -50,3 +52,35 @@ def get_session_with_ctx_manager():
         yield session
     finally:
         session.close()
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Point the configured (psycopg2) database URL at the asyncpg driver.
+    asyncpg takes `ssl` rather than libpq's `sslmode`.
+    """
+    async_url = make_url(url).set(drivername="postgresql+asyncpg")
+    if "sslmode" in async_url.query:
+        sslmode = async_url.query["sslmode"]
+        async_url = async_url.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    return async_url.render_as_string(hide_password=False)
+
+
+# Async engine for the API: requests wait on the event loop instead of holding a threadpool
+# worker, so concurrency is bounded by the pool below rather than by anyio's thread limit.
+async_engine = create_async_engine(
+    get_async_database_url(SQLALCHEMY_DATABASE_URL),
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_recycle=36000,
+    pool_pre_ping=True,
+)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_session():
+    async with AsyncSessionLocal() as session:
+        yield session
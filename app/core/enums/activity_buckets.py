@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ActivityBucketEnum(str, Enum):
+    HOUR = "1h"
+    SIX_HOURS = "6h"
+    DAY = "1d"
@@ -0,0 +1,18 @@
+from enum import Enum
+
+
+class ActiveContributorWindowEnum(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class AnalyticsGranularityEnum(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class ContributorBreakdownEnum(str, Enum):
+    CAMPAIGN = "campaign"
+    MONTH = "month"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class ContributionBatchStatusEnum(str, Enum):
+    CREATED = "created"
+    CAMPAIGN_NOT_FOUND = "campaign_not_found"
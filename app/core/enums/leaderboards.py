@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class RealtimeLeaderboardEnum(str, Enum):
+    SUBMISSIONS = "submissions"
+    EARNED = "earned"
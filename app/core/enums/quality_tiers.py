@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class QualityTierEnum(str, Enum):
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+
+# Category labels stored in contributions.quality_tier and returned as quality_score
+QUALITY_TIER_LABELS = {
+    QualityTierEnum.HIGH: "High Quality",
+    QualityTierEnum.MEDIUM: "Medium Quality",
+    QualityTierEnum.LOW: "Low Quality",
+}
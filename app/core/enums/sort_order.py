@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class SortOrderEnum(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
@@ -20,4 +20,9 @@ class PromptTagEnum(str, Enum):
 
 class PromptTypeEnum(str, Enum):
     PUBLIC = "public"
-    PREMIUM = "premium"
\ No newline at end of file
+    PREMIUM = "premium"
+
+
+class TagMatchEnum(str, Enum):
+    ANY = "any"
+    ALL = "all"
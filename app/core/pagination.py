@@ -0,0 +1,115 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """
+    Encode a (created_at, id) keyset position into an opaque, URL-safe cursor token.
+    """
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by encode_cursor. Raises a 400 for malformed tokens.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def keyset_paginate(
+    db: AsyncSession,
+    statement: Select,
+    created_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    cursor_of: Callable[[Any], Tuple[datetime, str]],
+    descending: bool = True,
+) -> Tuple[List[Any], Optional[str], bool]:
+    """
+    Keyset pagination ordered by (created_at, id), newest first unless descending is False.
+
+    Rows after the cursor are selected with a row-value comparison, so every page is an
+    index range scan no matter how deep it is. One extra row is fetched to determine has_more.
+    cursor_of extracts the (created_at, id) pair from a result row to build the next cursor.
+    Returns (rows, next_cursor, has_more).
+    """
+    position = tuple_(created_column, id_column)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        after = tuple_(created_at, row_id)
+        statement = statement.where(position < after if descending else position > after)
+
+    if descending:
+        statement = statement.order_by(created_column.desc(), id_column.desc())
+    else:
+        statement = statement.order_by(created_column.asc(), id_column.asc())
+    rows = (await db.execute(statement.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(*cursor_of(rows[-1])) if has_more else None
+    return rows, next_cursor, has_more
+
+
+def encode_rank_cursor(rank: float, row_id: str) -> str:
+    """
+    Encode a (rank, id) keyset position of a ranked result into an opaque, URL-safe cursor token.
+    """
+    payload = json.dumps([rank, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    Decode a cursor produced by encode_rank_cursor. The rank keeps its JSON type, so integer
+    ranks are compared as integers. Raises a 400 for malformed tokens.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if isinstance(rank, bool) or not isinstance(rank, (int, float)):
+            raise TypeError("rank must be a number")
+        return rank, str(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def rank_paginate(
+    db: AsyncSession,
+    statement: Select,
+    rank_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    cursor_of: Callable[[Any], Tuple[float, str]],
+) -> Tuple[List[Any], Optional[str], bool]:
+    """
+    Keyset pagination ordered by (rank, id), highest rank first, like keyset_paginate.
+    rank_column is the expression the statement ranks by; rows after the cursor are selected
+    with a row-value comparison on it. Returns (rows, next_cursor, has_more).
+    """
+    if cursor:
+        rank, row_id = decode_rank_cursor(cursor)
+        statement = statement.where(tuple_(rank_column, id_column) < tuple_(rank, row_id))
+
+    statement = statement.order_by(rank_column.desc(), id_column.desc())
+    rows = (await db.execute(statement.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_rank_cursor(*cursor_of(rows[-1])) if has_more else None
+    return rows, next_cursor, has_more
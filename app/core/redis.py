@@ -1,15 +1,31 @@
 from contextlib import asynccontextmanager
 
 # import aioredis
+from redis import Redis as SyncRedis
 from redis.asyncio import Redis
 
 from app.core.constants import REDIS_URL
 
+_redis_pool: Redis = None
+_sync_redis: SyncRedis = None
+
 
 async def get_redis_pool() -> Redis:
-    pool = Redis.from_url(REDIS_URL, max_connections=40)
-    print("connection redis: ", pool)
-    return pool
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = Redis.from_url(REDIS_URL, max_connections=40)
+        print("connection redis: ", _redis_pool)
+    return _redis_pool
+
+
+def get_sync_redis() -> SyncRedis:
+    """
+    Shared blocking client for code paths that run in the threadpool (sync routes, Celery tasks).
+    """
+    global _sync_redis
+    if _sync_redis is None:
+        _sync_redis = SyncRedis.from_url(REDIS_URL, max_connections=40)
+    return _sync_redis
 
 
 async def get_redis_connection():
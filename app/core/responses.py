@@ -0,0 +1,37 @@
+from typing import Any, Dict, List, Sequence
+
+import orjson
+from fastapi.responses import Response
+from sqlalchemy import Row
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def orjson_dumps(content: Any, option: int = 0) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS | option)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response encoded straight to bytes with orjson.
+
+    Returning a Response from a route makes FastAPI skip response_model validation and
+    serialization, so the route must hand over a payload that already matches its schema,
+    e.g. rows selected with exactly the response model's columns (see rows_to_dicts).
+    The response_model is still declared on the route for the OpenAPI document.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson_dumps(content)
+
+
+def rows_to_dicts(rows: Sequence[Row]) -> List[Dict[str, Any]]:
+    """
+    Turn result rows into plain dicts keyed by their column labels, without building
+    ORM instances or Pydantic models.
+    """
+    if not rows:
+        return []
+    fields = rows[0]._fields
+    return [dict(zip(fields, row)) for row in rows]
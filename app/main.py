@@ -5,6 +5,9 @@ from scalar_fastapi import get_scalar_api_reference
 
 from app.campaigns.routes import router as campaigns_router
 from app.ai_verification.routes import router as ai_verification_router
+from app.campaigns.activity_stream import get_activity_stream_lag
+from app.core.cache import get_cache_stats
+from app.core.redis import get_sync_redis
 
 
 
@@ -43,6 +46,22 @@ def read_root():
     return {"Hello": "Service is live"}
 
 
+@app.get("/metrics/cache", include_in_schema=False)
+def read_cache_metrics():
+    """
+    Response cache hit, stale and miss counters per cached endpoint.
+    """
+    return get_cache_stats()
+
+
+@app.get("/metrics/activity-stream", include_in_schema=False)
+def read_activity_stream_metrics():
+    """
+    Write-behind activity stream length, consumer lag and pending (unacknowledged) entries.
+    """
+    return get_activity_stream_lag(get_sync_redis())
+
+
 app.include_router(campaigns_router, prefix="/campaigns")
 app.include_router(ai_verification_router, prefix="/ai-verification")
 
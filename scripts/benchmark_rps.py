@@ -0,0 +1,72 @@
+"""
+Requests-per-second benchmark for a running API.
+
+Keeps `--concurrency` requests in flight against each path for `--duration` seconds and prints
+the throughput and latency percentiles. Run it against two builds (e.g. before and after a
+change to the database layer) on the same database to compare them:
+
+    uvicorn app.main:app --workers 1 --port 8000
+    python scripts/benchmark_rps.py --base-url http://localhost:8000 \
+        /campaigns/all?limit=20 /campaigns/get-contributions/<onchain_campaign_id>?limit=20
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def run_path(client: httpx.AsyncClient, path: str, concurrency: int, duration: float) -> dict:
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Paths to request, relative to --base-url")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=64, help="Requests kept in flight per path")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds to run each path")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of untimed requests per path")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        for path in args.paths:
+            if args.warmup:
+                await run_path(client, path, args.concurrency, args.warmup)
+            result = await run_path(client, path, args.concurrency, args.duration)
+            print(
+                f"{path}: {result['rps']:.0f} req/s, p50 {result['p50_ms']:.1f} ms, "
+                f"p99 {result['p99_ms']:.1f} ms ({result['requests']} requests, {result['errors']} errors)"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
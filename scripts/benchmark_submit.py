@@ -0,0 +1,61 @@
+"""
+Latency benchmark for POST /campaigns/submit-contributions against a running API.
+
+Submits `--count` unique contributions to one campaign, one at a time, and prints the latency
+percentiles. Each request writes rows, so run it against a scratch database; the contributions
+are tagged with a random run id so repeated runs do not collide. Compare two builds on the same
+database, e.g.:
+
+    uvicorn app.main:app --workers 1 --port 8000
+    python scripts/benchmark_submit.py --base-url http://localhost:8000 <onchain_campaign_id>
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+def submit(client: httpx.Client, campaign_id: str, run_id: str, i: int) -> float:
+    payload = {
+        "onchain_contribution_id": f"bench-{run_id}-{i}",
+        "campaign_id": campaign_id,
+        "contributor": f"bench-wallet-{i % 50}",
+        "data_url": f"ipfs://bench-{run_id}-{i}",
+        "transaction_hash": f"0xbench{run_id}{i}",
+        "quality_score": float(i % 100),
+        "ai_verification_score": (i % 100) / 100,
+        "reputation_score": (i % 10) / 10,
+    }
+    started = time.perf_counter()
+    response = client.post("/campaigns/submit-contributions", json=payload)
+    elapsed = time.perf_counter() - started
+    response.raise_for_status()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("campaign_id", help="onchain_campaign_id of an existing campaign")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--count", type=int, default=500, help="Timed submissions")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed submissions sent first")
+    args = parser.parse_args()
+
+    run_id = uuid.uuid4().hex[:8]
+    with httpx.Client(base_url=args.base_url, timeout=60) as client:
+        for i in range(args.warmup):
+            submit(client, args.campaign_id, run_id, -1 - i)
+        latencies = sorted(submit(client, args.campaign_id, run_id, i) for i in range(args.count))
+
+    print(
+        f"{args.count} submissions: mean {statistics.mean(latencies) * 1000:.1f} ms, "
+        f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
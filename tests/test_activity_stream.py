@@ -0,0 +1,81 @@
+"""
+Tests for the write-behind activity path: rows handed to write_behind_activities must reach the
+stream (or the activity table) even when Redis and Postgres are both failing at submit time.
+
+Uses fakeredis in place of Redis and an engine pointed at a closed port in place of the database.
+Importing app.campaigns.activity_stream creates the database engines, so the tests are skipped
+when SQLALCHEMY_DATABASE_URL is not set.
+"""
+import asyncio
+import os
+from datetime import datetime
+
+import pytest
+from redis.exceptions import ConnectionError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+fakeredis = pytest.importorskip("fakeredis")
+
+if not os.getenv("SQLALCHEMY_DATABASE_URL"):
+    pytest.skip("SQLALCHEMY_DATABASE_URL is not set", allow_module_level=True)
+
+import app.campaigns.activity_stream as activity_stream
+from app.campaigns.activity_stream import ACTIVITY_STREAM_KEY, write_behind_activities
+
+ACTIVITY_ROWS = [
+    {"campaign_id": "c1", "contribution_id": "k1", "timestamp": datetime(2025, 1, 1), "activity_level": 80.0},
+    {"campaign_id": "c1", "contribution_id": None, "timestamp": datetime(2025, 1, 1), "activity_level": 80.0},
+]
+
+
+class FlakyRedis(fakeredis.FakeAsyncRedis):
+    """Fails the first `failures` pipeline executions as if Redis were unreachable."""
+
+    def __init__(self, failures: int, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction=transaction, shard_hint=shard_hint)
+        if self.failures > 0:
+            self.failures -= 1
+
+            async def execute(raise_on_error=True):
+                raise ConnectionError("Connection refused")
+
+            pipe.execute = execute
+        return pipe
+
+
+@pytest.fixture
+def database_down(monkeypatch):
+    engine = create_async_engine("postgresql+asyncpg://postgres@127.0.0.1:1/hyvve")
+    monkeypatch.setattr(activity_stream, "AsyncSessionLocal", async_sessionmaker(engine))
+    monkeypatch.setattr(activity_stream, "RETRY_BASE_DELAY_SECONDS", 0)
+    yield
+    asyncio.run(engine.dispose())
+
+
+def test_rows_are_enqueued_once(database_down):
+    redis = FlakyRedis(failures=0)
+
+    async def run():
+        await write_behind_activities(redis, ACTIVITY_ROWS)
+        assert not activity_stream._retry_tasks
+        return await redis.xlen(ACTIVITY_STREAM_KEY)
+
+    assert asyncio.run(run()) == len(ACTIVITY_ROWS)
+
+
+def test_rows_are_retried_until_the_stream_recovers(database_down):
+    # The first enqueue and its direct-insert fallback fail, then the first retry fails too
+    redis = FlakyRedis(failures=2)
+
+    async def run():
+        await write_behind_activities(redis, ACTIVITY_ROWS)
+        assert activity_stream._retry_tasks
+        await asyncio.gather(*activity_stream._retry_tasks)
+        return await redis.xlen(ACTIVITY_STREAM_KEY)
+
+    assert asyncio.run(run()) == len(ACTIVITY_ROWS)
+    assert redis.failures == 0
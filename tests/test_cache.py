@@ -0,0 +1,63 @@
+"""
+Tests for the read-through response cache: a Redis failure anywhere on the cached path must fall
+through to the uncached endpoint rather than fail the request.
+
+Uses fakeredis in place of Redis. Importing app.core.cache creates the database engines, so the
+tests are skipped when SQLALCHEMY_DATABASE_URL is not set.
+"""
+import asyncio
+import os
+
+import pytest
+from redis.exceptions import ConnectionError
+
+fakeredis = pytest.importorskip("fakeredis")
+
+if not os.getenv("SQLALCHEMY_DATABASE_URL"):
+    pytest.skip("SQLALCHEMY_DATABASE_URL is not set", allow_module_level=True)
+
+import app.core.cache as cache
+
+
+class FailingGetRedis(fakeredis.FakeAsyncRedis):
+    """Answers the first `healthy_gets` GETs, then fails every GET as if Redis went away."""
+
+    def __init__(self, healthy_gets: int, **kwargs):
+        super().__init__(**kwargs)
+        self.healthy_gets = healthy_gets
+
+    async def get(self, name):
+        if self.healthy_gets <= 0:
+            raise ConnectionError("Connection reset by peer")
+        self.healthy_gets -= 1
+        return await super().get(name)
+
+
+def test_redis_failure_while_waiting_for_lock_holder_falls_through(monkeypatch):
+    redis = FailingGetRedis(healthy_gets=1)
+
+    async def get_redis_pool():
+        return redis
+
+    monkeypatch.setattr(cache, "get_redis_pool", get_redis_pool)
+    calls = []
+
+    @cache.cached_response("test", tags=lambda **kwargs: [])
+    async def endpoint(item_id: str):
+        calls.append(item_id)
+        return {"item_id": item_id}
+
+    async def run():
+        # Another request holds every lock, so this one waits for its result
+        original_set = redis.set
+
+        async def set_without_locks(name, value, *args, **kwargs):
+            if name.endswith(":lock"):
+                return None
+            return await original_set(name, value, *args, **kwargs)
+
+        redis.set = set_without_locks
+        return await endpoint(item_id="a")
+
+    assert asyncio.run(run()) == {"item_id": "a"}
+    assert calls == ["a"]
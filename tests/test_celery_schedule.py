@@ -0,0 +1,22 @@
+"""
+Checks that celery beat schedules tasks under the names the worker registers them by. A bare
+@celery_app.task registers the module path (app.celery.celery.<name>), so a 'tasks.<name>'
+schedule entry would be dropped by the worker as an unregistered task.
+
+Importing the Celery app creates the database engines, so the tests are skipped when
+SQLALCHEMY_DATABASE_URL is not set.
+"""
+import os
+
+import pytest
+
+if not os.getenv("SQLALCHEMY_DATABASE_URL"):
+    pytest.skip("SQLALCHEMY_DATABASE_URL is not set", allow_module_level=True)
+
+from app.celery.celery import celery_app
+
+
+@pytest.mark.parametrize("entry", sorted(celery_app.conf.beat_schedule))
+def test_scheduled_task_is_registered(entry):
+    task_name = celery_app.conf.beat_schedule[entry]["task"]
+    assert task_name in celery_app.tasks, f"{entry} schedules unregistered task {task_name}"
@@ -0,0 +1,230 @@
+"""
+Parity tests for the contributor analytics aggregate: get_contributor_analytics must return what
+the previous implementation computed in Python from every contribution row, overall and for each
+campaign and month of the breakdowns, including the 404 and "No Data" wallets.
+
+Runs against SQLALCHEMY_DATABASE_URL, inside a throwaway schema; skipped when no database is
+configured or reachable.
+"""
+import asyncio
+import inspect
+import math
+import os
+import random
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL")
+if not DATABASE_URL:
+    pytest.skip("SQLALCHEMY_DATABASE_URL is not set", allow_module_level=True)
+try:
+    with create_engine(DATABASE_URL).connect():
+        pass
+except OperationalError as e:
+    pytest.skip(f"Postgres is not reachable: {e}", allow_module_level=True)
+
+from app.campaigns.models import Campaign, Contribution
+from app.campaigns.routes import get_contributor_analytics
+from app.campaigns.services import get_quality_score_category, rebuild_campaign_stats
+from app.core.database import Base, get_async_database_url
+from app.core.enums.analytics_windows import ContributorBreakdownEnum
+
+CAMPAIGNS = 8
+WALLETS = [f"wallet{i}" for i in range(20)]
+# Contributions whose quality_score is never set
+NO_QUALITY_WALLET = "wallet-no-quality"
+UNKNOWN_WALLET = "wallet-unknown"
+
+
+def legacy_contributor_analytics(contributions) -> dict:
+    """The Python computation get_contributor_analytics used before the aggregate statement."""
+    total_contributions = len(contributions)
+    unique_contributions = len({c.campaign_id for c in contributions})
+
+    quality_scores = [c.quality_score for c in contributions if c.quality_score is not None]
+    average_quality = sum(quality_scores) / len(quality_scores) if quality_scores else 0
+    overall_quality_category = get_quality_score_category(average_quality) if quality_scores else "No Data"
+
+    ai_scores = [c.ai_verification_score for c in contributions if c.ai_verification_score is not None]
+    average_ai = sum(ai_scores) / len(ai_scores) if ai_scores else 0
+
+    rep_scores = [c.reputation_score for c in contributions if c.reputation_score is not None]
+    average_reputation = sum(rep_scores) / len(rep_scores) if rep_scores else 0
+
+    return {
+        "average_quality_category": overall_quality_category,
+        "average_ai_verification_score": average_ai,
+        "unique_contributions": unique_contributions,
+        "total_contributions": total_contributions,
+        "average_reputation_score": average_reputation,
+    }
+
+
+def legacy_breakdown(contributions, period_of, label: str) -> list:
+    groups = defaultdict(list)
+    for contribution in contributions:
+        groups[period_of(contribution)].append(contribution)
+    return [{label: period, **legacy_contributor_analytics(groups[period])} for period in sorted(groups)]
+
+
+@pytest.fixture(scope="module")
+def schema_engine():
+    schema = f"contributor_analytics_test_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(DATABASE_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+    try:
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            seed(db)
+        yield schema, engine
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        admin.dispose()
+
+
+def seed(db: Session):
+    rng = random.Random(22)
+    db.execute(insert(Campaign), [
+        {"id": f"c{i}", "onchain_campaign_id": f"oc{i}", "campaign_type": "image", "is_active": True}
+        for i in range(CAMPAIGNS)
+    ])
+
+    def score(value: float):
+        # About one score in ten is missing
+        return None if rng.random() < 0.1 else value
+
+    rows = []
+    for wallet in WALLETS:
+        for _ in range(rng.randint(1, 60)):
+            rows.append({
+                "contribution_id": uuid.uuid4().hex,
+                "campaign_id": f"c{rng.randrange(CAMPAIGNS)}",
+                "contributor": wallet,
+                "quality_score": score(rng.randint(50, 100)),
+                "ai_verification_score": score(rng.random()),
+                "reputation_score": score(rng.uniform(0, 5)),
+                "created_at": datetime(2025, 1, 1) + timedelta(minutes=rng.randrange(60 * 24 * 180)),
+            })
+    for i in range(5):
+        rows.append({
+            "contribution_id": uuid.uuid4().hex,
+            "campaign_id": f"c{i % 2}",
+            "contributor": NO_QUALITY_WALLET,
+            "quality_score": None,
+            "ai_verification_score": None if i % 2 else rng.random(),
+            "reputation_score": None,
+            "created_at": datetime(2025, 1 + i, 15),
+        })
+    rng.shuffle(rows)
+    db.execute(insert(Contribution), rows)
+    rebuild_campaign_stats(db)
+    db.commit()
+
+
+def legacy_contributions(engine, wallet_address: str) -> list:
+    with Session(engine) as db:
+        return db.scalars(select(Contribution).where(Contribution.contributor == wallet_address)).all()
+
+
+def onchain_campaign_ids(engine) -> dict:
+    with Session(engine) as db:
+        return dict(db.execute(select(Campaign.id, Campaign.onchain_campaign_id)).all())
+
+
+def assert_analytics_close(actual: dict, expected: dict):
+    """
+    Equal analytics, except that averages may differ in the last digits: the breakdown groups
+    sum their float scores in a different order than the Python loop did.
+    """
+    assert actual.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, float):
+            assert math.isclose(actual[key], value, rel_tol=1e-12), key
+        else:
+            assert actual[key] == value, key
+
+
+def assert_breakdown_matches(analytics: dict, contributions: list, period_of, label: str):
+    expected = legacy_breakdown(contributions, period_of, label)
+    assert len(analytics["breakdown"]) == len(expected)
+    for actual_row, expected_row in zip(analytics["breakdown"], expected):
+        assert_analytics_close(actual_row, expected_row)
+    assert_analytics_close(
+        {key: value for key, value in analytics.items() if key != "breakdown"},
+        legacy_contributor_analytics(contributions),
+    )
+
+
+def route_analytics(schema: str, wallet_address: str, breakdown=None) -> dict:
+    async def run():
+        engine = create_async_engine(
+            get_async_database_url(DATABASE_URL),
+            poolclass=NullPool,
+            connect_args={"server_settings": {"search_path": schema}},
+        )
+        try:
+            async with AsyncSession(engine) as db:
+                return await inspect.unwrap(get_contributor_analytics)(
+                    wallet_address=wallet_address, breakdown=breakdown, db=db
+                )
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("wallet_address", [*WALLETS, NO_QUALITY_WALLET])
+def test_matches_legacy_computation(schema_engine, wallet_address):
+    schema, engine = schema_engine
+    assert route_analytics(schema, wallet_address) == legacy_contributor_analytics(
+        legacy_contributions(engine, wallet_address)
+    )
+
+
+@pytest.mark.parametrize("wallet_address", [*WALLETS[:5], NO_QUALITY_WALLET])
+def test_campaign_breakdown_matches_legacy_computation(schema_engine, wallet_address):
+    schema, engine = schema_engine
+    onchain_ids = onchain_campaign_ids(engine)
+    assert_breakdown_matches(
+        route_analytics(schema, wallet_address, ContributorBreakdownEnum.CAMPAIGN),
+        legacy_contributions(engine, wallet_address),
+        lambda contribution: onchain_ids[contribution.campaign_id],
+        "onchain_campaign_id",
+    )
+
+
+@pytest.mark.parametrize("wallet_address", [*WALLETS[:5], NO_QUALITY_WALLET])
+def test_month_breakdown_matches_legacy_computation(schema_engine, wallet_address):
+    schema, engine = schema_engine
+    assert_breakdown_matches(
+        route_analytics(schema, wallet_address, ContributorBreakdownEnum.MONTH),
+        legacy_contributions(engine, wallet_address),
+        lambda contribution: contribution.created_at.strftime("%Y-%m"),
+        "month",
+    )
+
+
+def test_no_data_wallet_has_no_quality_category(schema_engine):
+    schema, _ = schema_engine
+    assert route_analytics(schema, NO_QUALITY_WALLET)["average_quality_category"] == "No Data"
+
+
+@pytest.mark.parametrize("breakdown", [None, *ContributorBreakdownEnum])
+def test_unknown_wallet_is_not_found(schema_engine, breakdown):
+    schema, _ = schema_engine
+    with pytest.raises(HTTPException) as raised:
+        route_analytics(schema, UNKNOWN_WALLET, breakdown)
+    assert raised.value.status_code == 404
@@ -0,0 +1,551 @@
+"""
+Query-plan regression tests for the routes. Each case calls the route function itself (with its
+cache decorators unwrapped) against seeded rows, records every statement it issues and EXPLAINs
+them: the plans must read through the indexes the route relies on (most of them from the index
+pack, alembic revision e2c4f7a81b69) and never sequentially scan a seeded table, so a later change
+to a route, service builder or model cannot quietly bring back a full scan. The Celery expiry
+sweep is checked the same way.
+
+Not covered: the routes served from Redis alone (real-time leaderboards and active contributors).
+
+Needs Postgres: the tests run against SQLALCHEMY_DATABASE_URL, inside a throwaway schema that is
+dropped afterwards, and are skipped when no database is configured or reachable.
+"""
+import asyncio
+import importlib.util
+import inspect
+import json
+import os
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import BindParameter, Insert, bindparam, create_engine, event, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.visitors import replacement_traverse
+
+DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL")
+if not DATABASE_URL:
+    pytest.skip("SQLALCHEMY_DATABASE_URL is not set", allow_module_level=True)
+try:
+    with create_engine(DATABASE_URL).connect():
+        pass
+except OperationalError as e:
+    pytest.skip(f"Postgres is not reachable: {e}", allow_module_level=True)
+
+import app.campaigns.routes as routes
+import app.campaigns.services as services
+import app.celery.celery as celery_tasks
+from app.campaigns.schemas import CampaignAnalyticsBatchRequest, CampaignCreate, ContributionBatchCreate, ContributionCreate
+from app.core.database import Base, get_async_database_url
+from app.core.enums.activity_buckets import ActivityBucketEnum
+from app.core.enums.analytics_windows import AnalyticsGranularityEnum, ContributorBreakdownEnum
+from app.core.enums.export_formats import ExportFormatEnum
+from app.core.enums.premium_filters import PremiumPromptFilterType
+from app.core.enums.quality_tiers import QualityTierEnum
+from app.core.enums.sort_order import SortOrderEnum
+from app.core.enums.tags import PromptTagEnum, TagMatchEnum
+from app.core.pagination import encode_cursor, encode_rank_cursor
+
+LEADERBOARD_MIGRATION = Path(__file__).parents[1] / "alembic/versions/c5a8f2e14d97_added_leaderboard_materialized_views.py"
+
+CAMPAIGNS = 20_000
+ACTIVE_EVERY = 2  # half the campaigns are still active
+EXPIRED = 1_000  # ...but only the oldest have passed their expiration
+CREATORS = 500
+CONTRIBUTIONS = 50_000
+CONTRIBUTION_CAMPAIGNS = 500  # 100 contributions per campaign
+CONTRIBUTORS = 997  # about one contribution per (campaign, contributor)
+HOURS = 24 * 7
+DAYS = 120
+SEARCH_WORDS = 2_000  # each campaign title ends in one of SEARCH_WORDS words
+TAGS = [tag.value for tag in PromptTagEnum]
+
+# Relations small enough that a sequential scan is the right plan
+TINY_RELATIONS = {"materialized_view_refreshes"}
+# Both composite indexes answer an equality on (campaign_id, contributor); which one wins is a
+# planner cost tie, so either is accepted.
+CONTRIBUTOR_PAIR_INDEXES = ("ix_contributions_campaign_id_contributor", "ix_contributions_contributor_campaign_id")
+# Reading a whole campaign's contributions (the export), any index leading with campaign_id will do
+CAMPAIGN_CONTRIBUTION_INDEXES = (
+    "ix_contributions_campaign_id_created_at",
+    "ix_contributions_campaign_id_quality_tier",
+    "ix_contributions_campaign_id_contributor",
+)
+
+
+def load_migration(path: Path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def plan_schema():
+    schema = f"plan_test_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(DATABASE_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+    try:
+        # The leaderboard migration creates materialized_view_refreshes along with the views
+        Base.metadata.create_all(
+            engine, tables=[table for table in Base.metadata.sorted_tables if table.name != "materialized_view_refreshes"]
+        )
+        with engine.begin() as conn:
+            seed(conn)
+            from alembic.migration import MigrationContext
+            from alembic.operations import Operations
+            with Operations.context(MigrationContext.configure(conn)):
+                load_migration(LEADERBOARD_MIGRATION).upgrade()
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM ANALYZE"))
+        yield schema, engine
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        admin.dispose()
+
+
+def seed(conn):
+    params = {
+        "campaigns": CAMPAIGNS,
+        "active_every": ACTIVE_EVERY,
+        "expired": EXPIRED,
+        "creators": CREATORS,
+        "contributions": CONTRIBUTIONS,
+        "contribution_campaigns": CONTRIBUTION_CAMPAIGNS,
+        "contributors": CONTRIBUTORS,
+        "hours": HOURS,
+        "days": DAYS,
+        "search_words": SEARCH_WORDS,
+        "tags": TAGS,
+    }
+    conn.execute(text("""
+        INSERT INTO campaigns (id, onchain_campaign_id, creator_wallet_address, title, description, campaign_type,
+                               total_budget, unit_price, expiration, is_premium, is_active, created_at)
+        SELECT 'c' || i, 'oc' || i, 'creator' || (i % :creators),
+               'Campaign ' || i || ' word' || (i % :search_words), 'Collect samples of kind ' || (i % 7),
+               'type' || (i % 5), 1000, 1, extract(epoch FROM now())::bigint + (i - :expired) * 3600, i % 7 = 0, i % :active_every = 0,
+               TIMESTAMP '2025-01-01' + i * INTERVAL '1 minute'
+        FROM generate_series(0, :campaigns - 1) AS i
+    """), params)
+    conn.execute(text("""
+        INSERT INTO campaign_stats (campaign_id, contributions_count, unique_contributors, trending_score)
+        SELECT 'c' || i, (i * 37) % 1000, (i * 37) % 500, ((i * 53) % 1000) / 10.0
+        FROM generate_series(0, :campaigns - 1) AS i
+    """), params)
+    conn.execute(text("""
+        INSERT INTO campaign_tags (campaign_id, tag)
+        SELECT 'c' || i, (:tags)[1 + i % cardinality(:tags)]
+        FROM generate_series(0, :campaigns - 1) AS i
+    """), params)
+    conn.execute(text("""
+        INSERT INTO contributions (contribution_id, campaign_id, contributor, data_url, transaction_hash,
+                                   ai_verification_score, reputation_score, quality_score,
+                                   is_verified, reward_claimed, created_at)
+        SELECT 'k' || i, 'c' || (i % :contribution_campaigns), 'w' || (i % :contributors),
+               'ipfs://' || i, '0x' || i, (i % 100) / 100.0, (i % 10) / 10.0, i % 100,
+               i % 3 = 0, false, TIMESTAMP '2025-01-01' + i * INTERVAL '10 minutes'
+        FROM generate_series(0, :contributions - 1) AS i
+    """), params)
+    conn.execute(text("""
+        UPDATE campaigns SET current_activity_level = 50, activity_decayed_sum = 500, activity_decayed_count = 10
+        WHERE id IN (SELECT DISTINCT campaign_id FROM contributions)
+    """))
+    conn.execute(text("""
+        INSERT INTO campaign_contributors (campaign_id, contributor, first_contributed_at)
+        SELECT campaign_id, contributor, min(created_at) FROM contributions GROUP BY campaign_id, contributor
+    """))
+    conn.execute(text("""
+        INSERT INTO activity (campaign_id, contribution_id, timestamp, activity_level)
+        SELECT campaign_id, contribution_id, created_at, quality_score FROM contributions
+    """))
+    conn.execute(text("""
+        INSERT INTO activity_hourly (campaign_id, hour_bucket, count, sum_level)
+        SELECT 'c' || c, TIMESTAMP '2025-01-01' + h * INTERVAL '1 hour', 1 + (c + h) % 5, 50 * (1 + (c + h) % 5)
+        FROM generate_series(0, :contribution_campaigns - 1) AS c, generate_series(0, :hours - 1) AS h
+    """), params)
+    conn.execute(text("""
+        INSERT INTO campaign_daily_stats (campaign_id, day, submissions, quality_sum, quality_count,
+                                          ai_sum, ai_count, unique_contributors)
+        SELECT 'c' || c, DATE '2025-01-01' + d, 3, 150, 3, 1.5, 3, 2
+        FROM generate_series(0, :contribution_campaigns - 1) AS c, generate_series(0, :days - 1) AS d
+    """), params)
+    conn.execute(text("""
+        INSERT INTO campaign_daily_contributors (campaign_id, day, contributor)
+        SELECT DISTINCT campaign_id, created_at::date, contributor FROM contributions
+    """))
+    conn.execute(text("""
+        INSERT INTO wallet_stats (wallet_address, submissions_count, campaigns_contributed_count, campaigns_created_count)
+        SELECT 'w' || i, 50, 50, 0 FROM generate_series(0, :contributors - 1) AS i
+        UNION ALL
+        SELECT 'creator' || i, 0, 0, :campaigns / :creators FROM generate_series(0, :creators - 1) AS i
+    """), params)
+
+
+def bind_values(statement, parameters: dict):
+    """Copy of statement with the execution parameters bound into its bind parameters."""
+    def replace(element):
+        if isinstance(element, BindParameter) and element.key in parameters:
+            return bindparam(element.key, parameters[element.key], type_=element.type)
+        return None
+
+    return replacement_traverse(statement, {}, replace)
+
+
+@contextmanager
+def recorded_statements():
+    """Collect the statements of the ORM executions (sync or async sessions) made inside the block."""
+    statements = []
+
+    def record(orm_execute_state):
+        statement = orm_execute_state.statement
+        # An INSERT ... VALUES scans nothing; only INSERT ... SELECT has a plan worth checking
+        if isinstance(statement, Insert) and statement.select is None:
+            return
+        # Session.get and executemany UPDATEs pass their values as execution parameters rather
+        # than binding them; plan the first row's
+        parameters = orm_execute_state.parameters
+        if isinstance(parameters, list):
+            parameters = parameters[0]
+        if parameters:
+            statement = bind_values(statement, parameters)
+        statements.append(statement)
+
+    event.listen(Session, "do_orm_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Session, "do_orm_execute", record)
+
+
+def route_statements(plan_schema, monkeypatch, route, **kwargs) -> list:
+    """
+    Run a route function with a session on the seeded schema and return the statements it issued.
+    The route's commits only release savepoints of a transaction that is rolled back afterwards, so
+    write routes leave the seeded rows as they were.
+    """
+    schema, _ = plan_schema
+
+    async def run():
+        engine = create_async_engine(
+            get_async_database_url(DATABASE_URL),
+            poolclass=NullPool,
+            connect_args={"server_settings": {"search_path": schema}},
+        )
+        try:
+            async with engine.connect() as conn:
+                transaction = await conn.begin()
+                session_factory = async_sessionmaker(
+                    bind=conn, expire_on_commit=False, join_transaction_mode="create_savepoint"
+                )
+                # The export stream opens its own session
+                monkeypatch.setattr(services, "AsyncSessionLocal", session_factory)
+                async with session_factory() as db:
+                    response = await inspect.unwrap(route)(**kwargs, db=db)
+                    body_iterator = getattr(response, "body_iterator", None)
+                    if body_iterator is not None:
+                        async for _ in body_iterator:
+                            pass
+                await transaction.rollback()
+        finally:
+            await engine.dispose()
+
+    with recorded_statements() as statements:
+        asyncio.run(run())
+    assert statements, f"{route.__name__} issued no statements"
+    return statements
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(engine, statement) -> list:
+    sql = str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    plan = (raw if isinstance(raw, list) else json.loads(raw))[0]["Plan"]
+    return list(plan_nodes(plan))
+
+
+def assert_plans(plan_schema, statements, *expected_indexes):
+    """
+    Assert that no statement sequentially scans a seeded relation and that, between them, the
+    statements use each expected index; an entry may be a tuple of interchangeable indexes.
+    """
+    _, engine = plan_schema
+    used = set()
+    for statement in statements:
+        nodes = explain(engine, statement)
+        used |= {node["Index Name"] for node in nodes if "Index Name" in node}
+        seq_scanned = {node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"} - TINY_RELATIONS
+        assert not seq_scanned, f"sequential scan on {seq_scanned} in:\n{statement}"
+    for expected in expected_indexes:
+        alternatives = (expected,) if isinstance(expected, str) else expected
+        assert used & set(alternatives), f"expected {' or '.join(alternatives)}, plans used {sorted(used)}"
+
+
+PAGE = {"cursor": None, "limit": 20}
+LEADERBOARD_PAGE = {"limit": 10, "offset": 40}
+# A cursor deep into the campaign list, to check later pages stay index range scans
+DEEP_CAMPAIGN_CURSOR = encode_cursor(datetime(2025, 1, 2), "c1440")
+
+ROUTE_CASES = {
+    "all_campaigns": (
+        routes.get_all_campaigns, PAGE, ["ix_campaigns_created_at_id", "campaign_stats_pkey"],
+    ),
+    "all_campaigns_deep_page": (
+        routes.get_all_campaigns, {**PAGE, "cursor": DEEP_CAMPAIGN_CURSOR}, ["ix_campaigns_created_at_id"],
+    ),
+    "campaigns_created_by_wallet": (
+        routes.get_campaigns_created_by_wallet,
+        {"creator_wallet_address": "creator7", **PAGE},
+        ["ix_campaigns_creator_wallet_address"],
+    ),
+    "active_campaigns": (
+        routes.get_active_campaigns, PAGE, [("ix_campaigns_created_at_id", "ix_campaigns_active_expiration")],
+    ),
+    "search": (
+        routes.search_campaigns,
+        {"q": "word17", "campaign_type": None, "is_premium": None, "is_active": None, **PAGE},
+        ["ix_campaigns_search_vector"],
+    ),
+    "feed_recent": (
+        routes.get_campaign_feed,
+        {"sort": PremiumPromptFilterType.RECENT, "premium": None, **PAGE},
+        [("ix_campaigns_created_at_id", "ix_campaigns_active_expiration")],
+    ),
+    "feed_popular": (
+        routes.get_campaign_feed,
+        {"sort": PremiumPromptFilterType.POPULAR, "premium": None, **PAGE},
+        ["ix_campaign_stats_contributions_count"],
+    ),
+    "feed_trending_deep_page": (
+        routes.get_campaign_feed,
+        {"sort": PremiumPromptFilterType.TRENDING, "premium": True, "cursor": encode_rank_cursor(50.0, "c100"), "limit": 20},
+        ["ix_campaign_stats_trending_score"],
+    ),
+    "campaign_detail": (
+        routes.get_campaign, {"onchain_campaign_id": "oc3"}, ["ix_campaigns_onchain_campaign_id", "campaign_tags_pkey"],
+    ),
+    "contributions": (
+        routes.get_contributions,
+        {
+            "onchain_campaign_id": "oc3", "contributor": None, "quality_tier": None, "is_verified": None,
+            "reward_claimed": None, "created_from": None, "created_to": None, "sort": SortOrderEnum.DESC, **PAGE,
+        },
+        ["ix_campaigns_onchain_campaign_id", "ix_contributions_campaign_id_created_at", "campaign_stats_pkey"],
+    ),
+    "contributions_oldest_first": (
+        routes.get_contributions,
+        {
+            "onchain_campaign_id": "oc3", "contributor": None, "quality_tier": None, "is_verified": None,
+            "reward_claimed": None, "created_from": None, "created_to": None, "sort": SortOrderEnum.ASC, **PAGE,
+        },
+        ["ix_contributions_campaign_id_created_at"],
+    ),
+    "contributions_by_quality_tier": (
+        routes.get_contributions,
+        {
+            "onchain_campaign_id": "oc3", "contributor": None, "quality_tier": QualityTierEnum.HIGH,
+            "is_verified": None, "reward_claimed": None, "created_from": None, "created_to": None,
+            "sort": SortOrderEnum.DESC, **PAGE,
+        },
+        ["ix_contributions_campaign_id_quality_tier"],
+    ),
+    "contributions_by_contributor": (
+        routes.get_contributions,
+        {
+            "onchain_campaign_id": "oc3", "contributor": "w53", "quality_tier": None, "is_verified": None,
+            "reward_claimed": None, "created_from": None, "created_to": None, "sort": SortOrderEnum.DESC, **PAGE,
+        },
+        [CONTRIBUTOR_PAIR_INDEXES],
+    ),
+    "contributions_export": (
+        routes.export_contributions,
+        {"onchain_campaign_id": "oc3", "format": ExportFormatEnum.NDJSON, "contributor": None},
+        [CAMPAIGN_CONTRIBUTION_INDEXES],
+    ),
+    "wallet_campaign_details": (
+        routes.get_wallet_campaigns_details,
+        {"wallet_address": "w53", "created_cursor": None, "contributed_cursor": None, "limit": 20},
+        ["ix_campaigns_creator_wallet_address", "ix_campaign_contributors_contributor_campaign_id"],
+    ),
+    "campaign_analytics": (
+        routes.get_campaign_analytics,
+        {"onchain_campaign_id": "oc3"},
+        ["ix_campaigns_onchain_campaign_id", CONTRIBUTOR_PAIR_INDEXES[:1], "activity_hourly_pkey"],
+    ),
+    "campaign_analytics_batch": (
+        routes.get_campaigns_analytics_batch,
+        {"request": CampaignAnalyticsBatchRequest(onchain_campaign_ids=["oc3", "oc4", "oc-missing"])},
+        ["ix_campaigns_onchain_campaign_id", CONTRIBUTOR_PAIR_INDEXES[:1], "activity_hourly_pkey"],
+    ),
+    "weekly_campaign_analytics": (
+        routes.get_weekly_campaign_analytics,
+        {
+            "onchain_campaign_id": "oc3", "start_date": date(2025, 3, 1), "end_date": date(2025, 5, 31),
+            "granularity": AnalyticsGranularityEnum.WEEK,
+        },
+        ["campaign_daily_stats_pkey", "campaign_daily_contributors_pkey"],
+    ),
+    "wallet_analytics": (
+        routes.get_wallet_analytics,
+        {"wallet_address": "w53", "created_cursor": None, "contributed_cursor": None, "limit": 20},
+        ["wallet_stats_pkey", "ix_campaigns_creator_wallet_address", "ix_campaign_contributors_contributor_campaign_id"],
+    ),
+    "global_leaderboard": (
+        routes.get_global_leaderboard, LEADERBOARD_PAGE, ["ix_contributor_leaderboard_position"],
+    ),
+    "global_contributors_leaderboard": (
+        routes.get_top_global_contributors, LEADERBOARD_PAGE, ["ix_contributor_leaderboard_position"],
+    ),
+    "global_creators_leaderboard": (
+        routes.get_top_campaign_creators, LEADERBOARD_PAGE, ["ix_creator_leaderboard_position"],
+    ),
+    "average_ai_verification": (
+        routes.get_average_ai_verification,
+        {"wallet_address": "w53", "onchain_campaign_id": "oc3"},
+        ["ix_campaigns_onchain_campaign_id", CONTRIBUTOR_PAIR_INDEXES],
+    ),
+    "campaign_peak_activity": (
+        routes.get_campaign_peak_activity,
+        {
+            "onchain_campaign_id": "oc3", "bucket": ActivityBucketEnum.SIX_HOURS,
+            "start": datetime(2025, 1, 3), "end": datetime(2025, 1, 10),
+        },
+        ["ix_campaigns_onchain_campaign_id", "activity_hourly_pkey"],
+    ),
+    "calculate_peak_activity": (
+        routes.calculate_peak_activity_hours, {"onchain_campaign_id": "oc3"}, ["activity_hourly_pkey"],
+    ),
+    "campaign_activity": (
+        routes.get_campaign_activity, {"onchain_campaign_id": "oc3"}, ["ix_campaigns_onchain_campaign_id"],
+    ),
+    "contribution_activity": (
+        routes.get_contribution_activity, {"contribution_id": "k4321"}, ["contributions_pkey", "ix_activity_contribution_id"],
+    ),
+    "contributor_analytics": (
+        routes.get_contributor_analytics,
+        {"wallet_address": "w53", "breakdown": None},
+        ["ix_contributions_contributor_campaign_id", "ix_campaign_contributors_contributor_campaign_id"],
+    ),
+    "contributor_analytics_by_campaign": (
+        routes.get_contributor_analytics,
+        {"wallet_address": "w53", "breakdown": ContributorBreakdownEnum.CAMPAIGN},
+        ["ix_contributions_contributor_campaign_id", "campaigns_pkey"],
+    ),
+    "contributor_analytics_by_month": (
+        routes.get_contributor_analytics,
+        {"wallet_address": "w53", "breakdown": ContributorBreakdownEnum.MONTH},
+        ["ix_contributions_contributor_campaign_id"],
+    ),
+}
+
+
+@pytest.mark.parametrize("case", list(ROUTE_CASES))
+def test_route_queries_use_indexes(plan_schema, monkeypatch, case):
+    route, kwargs, expected_indexes = ROUTE_CASES[case]
+    assert_plans(plan_schema, route_statements(plan_schema, monkeypatch, route, **kwargs), *expected_indexes)
+
+
+def new_contribution(onchain_campaign_id: str, index: int) -> ContributionCreate:
+    return ContributionCreate(
+        onchain_contribution_id=f"onchain-new-{index}",
+        campaign_id=onchain_campaign_id,
+        contributor="w53",
+        data_url=f"ipfs://new-{index}",
+        transaction_hash=f"0xnew{index}",
+        quality_score=97,
+        ai_verification_score=0.9,
+        reputation_score=0.5,
+    )
+
+
+WRITE_ROUTE_CASES = {
+    "create_campaign": (
+        routes.create_campaign,
+        {
+            "campaign": CampaignCreate(
+                onchain_campaign_id="oc-new", title="New campaign", description="Fresh samples",
+                data_requirements="PNG", creator_wallet_address="creator7", quality_criteria="Sharp",
+                unit_price=1, campaign_type="type1", total_budget=100, min_data_count=1, max_data_count=100,
+                expiration=2_000_000_000, metadata_uri="ipfs://meta", transaction_hash="0xcampaign",
+                platform_fee=0.1, tags=[PromptTagEnum.ANIME],
+            ),
+        },
+        ["campaigns_pkey"],
+    ),
+    "submit_contribution": (
+        routes.submit_contribution,
+        {"contribution": new_contribution("oc3", 0)},
+        ["ix_campaigns_onchain_campaign_id", "campaigns_pkey"],
+    ),
+    "submit_contributions_batch": (
+        routes.submit_contributions_batch,
+        {"batch": ContributionBatchCreate(contributions=[new_contribution(f"oc{i}", i) for i in (3, 4, 9999)])},
+        ["ix_campaigns_onchain_campaign_id", "campaigns_pkey"],
+    ),
+}
+
+
+@pytest.mark.parametrize("case", list(WRITE_ROUTE_CASES))
+def test_write_route_queries_use_indexes(plan_schema, monkeypatch, case):
+    fakeredis = pytest.importorskip("fakeredis")
+    redis = fakeredis.FakeAsyncRedis()
+
+    async def get_redis_pool():
+        return redis
+
+    async def invalidate_tags_async(*tags):
+        pass
+
+    monkeypatch.setattr(routes, "get_redis_pool", get_redis_pool)
+    monkeypatch.setattr(routes, "invalidate_tags_async", invalidate_tags_async)
+    route, kwargs, expected_indexes = WRITE_ROUTE_CASES[case]
+    if "redis" in inspect.signature(route).parameters:
+        kwargs = {**kwargs, "redis": redis}
+    assert_plans(plan_schema, route_statements(plan_schema, monkeypatch, route, **kwargs), *expected_indexes)
+
+
+def test_browse_page_uses_campaign_primary_key(plan_schema, monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    from app.campaigns.tag_index import rebuild_campaign_bitmaps
+
+    _, engine = plan_schema
+    server = fakeredis.FakeServer()
+    with Session(engine) as db:
+        rebuild_campaign_bitmaps(fakeredis.FakeRedis(server=server), db)
+    statements = route_statements(
+        plan_schema, monkeypatch, routes.browse_campaigns_by_tag,
+        tags=[PromptTagEnum.ANIME], match=TagMatchEnum.ANY, campaign_type=None, premium=None, active=None,
+        redis=fakeredis.FakeAsyncRedis(server=server), **PAGE,
+    )
+    assert_plans(plan_schema, statements, "campaigns_pkey")
+
+
+def test_expiry_sweep_uses_partial_active_index(plan_schema, monkeypatch):
+    _, engine = plan_schema
+    # Run the Celery task in a transaction that is rolled back, so the seeded campaigns stay active
+    with engine.connect() as conn, conn.begin() as transaction:
+        monkeypatch.setattr(
+            celery_tasks, "SessionLocal", lambda: Session(bind=conn, join_transaction_mode="create_savepoint")
+        )
+        monkeypatch.setattr(celery_tasks, "invalidate_tags", lambda *tags: None)
+        monkeypatch.setattr(celery_tasks, "mark_campaigns_inactive", lambda redis, offsets: None)
+        with recorded_statements() as statements:
+            celery_tasks.mark_expired_campaigns_inactive()
+        transaction.rollback()
+    assert_plans(plan_schema, statements, "ix_campaigns_active_expiration")
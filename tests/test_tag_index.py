@@ -0,0 +1,130 @@
+"""
+Tests for the browse index rebuild: updates made by index_campaign and mark_campaigns_inactive
+while rebuild_campaign_bitmaps runs must survive the swap.
+
+Runs against SQLALCHEMY_DATABASE_URL, inside a throwaway schema, with fakeredis standing in for
+Redis; skipped when either is unavailable.
+"""
+import asyncio
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+fakeredis = pytest.importorskip("fakeredis")
+
+DATABASE_URL = os.getenv("SQLALCHEMY_DATABASE_URL")
+if not DATABASE_URL:
+    pytest.skip("SQLALCHEMY_DATABASE_URL is not set", allow_module_level=True)
+try:
+    with create_engine(DATABASE_URL).connect():
+        pass
+except OperationalError as e:
+    pytest.skip(f"Postgres is not reachable: {e}", allow_module_level=True)
+
+from app.campaigns.models import Campaign, CampaignTag
+from app.campaigns.tag_index import (
+    ACTIVE_KEY,
+    ALL_KEY,
+    IDS_KEY,
+    REBUILD_LOCK_KEY,
+    REBUILD_LOG_KEY,
+    TYPES_KEY,
+    index_campaign,
+    mark_campaigns_inactive,
+    rebuild_campaign_bitmaps,
+    tag_key,
+    type_key,
+)
+from app.core.database import Base
+from app.core.enums.tags import PromptTagEnum
+
+TAG = next(iter(PromptTagEnum))
+
+
+@pytest.fixture
+def db():
+    schema = f"tag_index_test_{uuid.uuid4().hex[:8]}"
+    admin = create_engine(DATABASE_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+    engine = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={schema}"})
+    session = sessionmaker(bind=engine)()
+    try:
+        Base.metadata.create_all(engine)
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+        admin.dispose()
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def add_campaign(db, campaign_id: str, campaign_type: str, tags=()) -> Campaign:
+    campaign = Campaign(id=campaign_id, onchain_campaign_id=f"oc-{campaign_id}", campaign_type=campaign_type, is_active=True)
+    db.add(campaign)
+    db.flush()
+    for tag in tags:
+        db.add(CampaignTag(campaign_id=campaign.id, tag=tag.value))
+    db.commit()
+    return campaign
+
+
+def test_rebuild_keeps_updates_made_during_the_rebuild(db, server):
+    redis = fakeredis.FakeRedis(server=server)
+    async_redis = fakeredis.FakeAsyncRedis(server=server)
+    expiring = add_campaign(db, "expiring", "image")
+    add_campaign(db, "steady", "image", [TAG])
+    live_db = sessionmaker(bind=db.get_bind())()
+
+    # scan_iter runs after the snapshot is read and before the bitmaps are swapped in
+    scan_iter = redis.scan_iter
+
+    def scan_iter_with_live_updates(*args, **kwargs):
+        created = add_campaign(live_db, "created", "audio", [TAG])
+        asyncio.run(index_campaign(async_redis, created.bitmap_offset, created.id, "audio", False, True, [TAG]))
+        live_db.execute(text("UPDATE campaigns SET is_active = false WHERE id = 'expiring'"))
+        live_db.commit()
+        mark_campaigns_inactive(redis, [expiring.bitmap_offset])
+        return scan_iter(*args, **kwargs)
+
+    redis.scan_iter = scan_iter_with_live_updates
+    try:
+        assert rebuild_campaign_bitmaps(redis, db) == 2
+    finally:
+        live_db.close()
+
+    created = db.query(Campaign).filter_by(id="created").one()
+    assert redis.getbit(ALL_KEY, created.bitmap_offset) == 1
+    assert redis.getbit(ACTIVE_KEY, created.bitmap_offset) == 1
+    assert redis.getbit(type_key("audio"), created.bitmap_offset) == 1
+    assert redis.getbit(tag_key(TAG), created.bitmap_offset) == 1
+    assert redis.hget(IDS_KEY, created.bitmap_offset) == b"created"
+    assert redis.sismember(TYPES_KEY, "audio")
+    assert redis.getbit(ACTIVE_KEY, expiring.bitmap_offset) == 0
+    assert not redis.exists(REBUILD_LOCK_KEY, REBUILD_LOG_KEY)
+
+
+def test_live_updates_are_not_logged_outside_a_rebuild(db, server):
+    redis = fakeredis.FakeRedis(server=server)
+    campaign = add_campaign(db, "steady", "image")
+    mark_campaigns_inactive(redis, [campaign.bitmap_offset])
+    assert not redis.exists(REBUILD_LOG_KEY)
+
+
+def test_concurrent_rebuild_is_skipped(db, server):
+    redis = fakeredis.FakeRedis(server=server)
+    add_campaign(db, "steady", "image")
+    redis.set(REBUILD_LOCK_KEY, "other")
+    assert rebuild_campaign_bitmaps(redis, db) is None
+    assert not redis.exists(ALL_KEY)
+    assert redis.get(REBUILD_LOCK_KEY) == b"other"